@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""Helpers shared by the benchmark scripts."""
+
+from __future__ import unicode_literals, print_function
+import codecs
+import os
+import timeit
+import unicodedata
+
+import bogo
+
+
+TEST_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        os.pardir, 'bogo', 'test')
+
+ENGLISH_WORDS = """
+the of and to in is that for it with as was on be by this are from at
+or an have not but which all were they one can their has more will would
+other its there when also been some what into only time who could them
+system function string python install configuration build deploy commit
+branch server client network thread buffer cache memory print lint check
+""".split()
+
+
+def load_sequences(name='DauCu.sequences'):
+    """Return the (keys, expected) pairs of a test sequence file."""
+    pairs = []
+    with codecs.open(os.path.join(TEST_DIR, name), 'r', 'utf-8') as f:
+        for line in f:
+            line = line.rstrip('\n')
+            if ':' in line:
+                keys, expected = line.split(':', 1)
+                pairs.append((keys, expected))
+    return pairs
+
+
+# The VNI key of each combining mark, in NFD.
+_VNI_DIGITS = {
+    '\u0301': '1', '\u0300': '2', '\u0309': '3', '\u0303': '4',
+    '\u0323': '5', '\u0302': '6', '\u031b': '7', '\u0306': '8',
+}
+
+
+def vni_keys(word):
+    """VNI keys typing the Vietnamese `word`, digits last."""
+    decomposed = unicodedata.normalize('NFD', word)
+    digits = set(_VNI_DIGITS[char] for char in decomposed
+                 if char in _VNI_DIGITS)
+    if 'đ' in word.lower():
+        digits.add('9')
+    base = "".join(char for char in decomposed if char not in _VNI_DIGITS)
+    return base.replace('đ', 'd').replace('Đ', 'D') + "".join(sorted(digits))
+
+
+def mixed_text(english_ratio=0.5, words=4000, vni=False):
+    """
+    Interleave Telex (or VNI) words and English words,
+    deterministically.
+    """
+    if vni:
+        vietnamese = [vni_keys(expected) for _, expected in load_sequences()]
+    else:
+        vietnamese = [keys for keys, _ in load_sequences()]
+    result = []
+    for i in range(words):
+        if (i * english_ratio) % 1 < english_ratio:
+            result.append(ENGLISH_WORDS[i % len(ENGLISH_WORDS)])
+        else:
+            result.append(vietnamese[i % len(vietnamese)])
+    return ' '.join(result)
+
+
+def best_of(func, repeat=5, number=1):
+    """Best wall time of `func` in seconds."""
+    return min(timeit.repeat(func, repeat=repeat, number=number)) / number
+
+
+def key_by_key(sequence, rules=None):
+    """process_sequence() without any shortcut, as a baseline."""
+    rules = rules or bogo.get_telex_definition()
+    accepted = bogo.core._accepted_chars(rules)
+    parts, result, raw = [], '', ''
+    for key in sequence:
+        if key not in accepted:
+            parts += [result, key]
+            result, raw = '', ''
+        else:
+            result, raw = bogo.process_key(result, key, raw, rules)
+    return ''.join(parts) + result
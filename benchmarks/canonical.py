@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+Near-duplicate raw input with and without canonicalize_keys(): distinct
+words, TransitionCache hit rate and the cost of canonicalizing.
+"""
+
+from __future__ import unicode_literals, print_function
+import random
+import sys
+
+import bogo
+from bogo.canonical import canonicalize_keys
+from _common import best_of, load_sequences
+
+
+def _hit_rate(text, maxsize):
+    cache = bogo.TransitionCache(maxsize=maxsize)
+    result = cache.process_sequence(text)
+    return result, cache.hit_rate
+
+
+def main():
+    # Every word typed in every order the corpus knows, shuffled.
+    words = [keys for keys, _ in load_sequences()] * 4
+    random.Random(0).shuffle(words)
+    text = " ".join(words)
+    canonical = canonicalize_keys(text)
+
+    if bogo.process_sequence(canonical) != bogo.process_sequence(text):
+        print("canonicalization changed the output")
+        return 1
+
+    print("%-10s %10s %14s %14s" %
+          ("input", "distinct", "hits (1024)", "hits (4096)"))
+    for name, sequence in (("raw", text), ("canonical", canonical)):
+        distinct = len(set(sequence.split()))
+        rates = [_hit_rate(sequence, size)[1] for size in (1024, 4096)]
+        print("%-10s %10d %13.1f%% %13.1f%%" %
+              (name, distinct, rates[0] * 100, rates[1] * 100))
+
+    elapsed = best_of(lambda: canonicalize_keys(text), 3)
+    convert = best_of(lambda: bogo.process_sequence(text), 3)
+    print("canonicalize_keys: %.0f words/s, process_sequence: %.0f words/s" %
+          (len(words) / elapsed, len(words) / convert))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+Syllable codec throughput and the memory taken by a corpus stored as
+strings against the same corpus as 16-bit codes.
+"""
+
+from __future__ import unicode_literals, print_function
+import codecs
+import os
+import random
+import sys
+
+from bogo import codec
+from _common import TEST_DIR, best_of
+
+
+def main():
+    with codecs.open(os.path.join(TEST_DIR, 'sequences', 'vi.dic'), 'r',
+                     'utf-8') as f:
+        words = [line.strip() for line in f if line.strip()]
+    rng = random.Random(0)
+    corpus = [rng.choice(words) for _ in range(1000000)]
+
+    encode_time = best_of(lambda: codec.encode_many(corpus), 3)
+    folded_time = best_of(
+        lambda: codec.encode_many(corpus, keep_case=False), 3)
+    codes = codec.encode_many(corpus, keep_case=False)
+    decode_time = best_of(lambda: codec.decode_many(codes), 3)
+    if codec.decode_many(codec.encode_many(corpus)) != corpus:
+        print("round trip failed")
+        return 1
+
+    print("%d syllables" % len(corpus))
+    print("encode_many:               %7.1f ms" % (encode_time * 1e3))
+    print("encode_many, no case:      %7.1f ms" % (folded_time * 1e3))
+    print("decode_many:               %7.1f ms" % (decode_time * 1e3))
+
+    # Distinct string objects, as read from a file.
+    strings = [word.encode('utf-8').decode('utf-8') for word in corpus]
+    string_bytes = sys.getsizeof(strings) + \
+        sum(sys.getsizeof(word) for word in strings)
+    print("as a list of strings:      %7d KB" % (string_bytes // 1024))
+    print("as array('H'):             %7d KB" %
+          (codes.buffer_info()[1] * codes.itemsize // 1024))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
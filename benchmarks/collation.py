@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+Sorting Vietnamese names with collation keys against a per-character
+Python key function.
+"""
+
+from __future__ import unicode_literals, print_function
+import codecs
+import os
+import random
+import sys
+
+from bogo import accent
+from bogo.collation import ALPHABET, sort_keys, sorted_vi
+from _common import TEST_DIR, best_of
+
+
+SURNAMES = "Nguyễn Trần Lê Phạm Hoàng Huỳnh Phan Vũ Võ Đặng Bùi Đỗ " \
+    "Hồ Ngô Dương Lý".split()
+TONES = [0, 5, 3, 2, 4, 1]
+
+
+def _naive_key(text):
+    # What one would write without precomputed tables.
+    letters, tones, cases = [], [], []
+    for char in text:
+        lower = char.lower()
+        base = accent.remove_accent_char(lower)
+        if base in ALPHABET:
+            letters.append(ord('A') + ALPHABET.index(base))
+            if base in 'aăâeêioôơuưy':
+                tones.append(TONES.index(accent.get_accent_char(lower)))
+            cases.append(char != lower)
+        else:
+            letters.append(ord(char))
+    return letters, tones, cases
+
+
+def main():
+    with codecs.open(os.path.join(TEST_DIR, 'sequences', 'vi.dic'), 'r',
+                     'utf-8') as f:
+        words = [line.strip() for line in f if line.strip()]
+    rng = random.Random(0)
+    names = ["%s %s %s" % (rng.choice(SURNAMES),
+                           rng.choice(words).capitalize(),
+                           rng.choice(words).capitalize())
+             for _ in range(200000)]
+
+    expected = sorted(names, key=_naive_key)
+    if sorted_vi(names) != expected:
+        print("sorted_vi() and the naive key disagree")
+        return 1
+
+    naive_time = best_of(lambda: sorted(names, key=_naive_key), 1)
+    keys_time = best_of(lambda: sort_keys(names), 3)
+    sort_time = best_of(lambda: sorted_vi(names), 3)
+    keys = sort_keys(names)
+    key_bytes = sum(len(key) for key in keys)
+    text_bytes = sum(len(name.encode('utf-8')) for name in names)
+
+    print("%d names" % len(names))
+    print("sorted(key=naive):     %7.1f ms" % (naive_time * 1e3))
+    print("sort_keys():           %7.1f ms" % (keys_time * 1e3))
+    print("sorted_vi():           %7.1f ms" % (sort_time * 1e3))
+    print("key size:              %7.2f x the UTF-8 text" %
+          (float(key_bytes) / text_bytes))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
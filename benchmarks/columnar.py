@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""
+convert_column() on a column with heavy repetition against converting
+every cell, for a growing number of rows and a fixed set of values.
+"""
+
+from __future__ import unicode_literals, print_function
+import random
+import sys
+
+import bogo
+from _common import load_sequences, best_of
+
+
+def main():
+    distinct = [keys for keys, _ in load_sequences()][:2000]
+    rng = random.Random(0)
+
+    print("%10s %10s %16s %16s" %
+          ("rows", "distinct", "per cell", "convert_column"))
+    for rows in (10000, 100000, 1000000):
+        column = [rng.choice(distinct) for _ in range(rows)]
+        sample = column[:10000]
+        per_cell = best_of(
+            lambda: [bogo.process_sequence(value) for value in sample],
+            repeat=1) * rows / len(sample)
+        bulk = best_of(lambda: bogo.convert_column(column), repeat=1)
+        print("%10d %10d %14.2f s %14.2f s" %
+              (rows, len(set(column)), per_cell, bulk))
+
+    if bogo.convert_column(sample) != \
+            [bogo.process_sequence(value) for value in sample]:
+        print("convert_column output differs")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""
+score_text() throughput on growing documents, sampled and exact.
+"""
+
+from __future__ import unicode_literals, print_function
+import codecs
+import os
+import random
+import sys
+
+from bogo.detection import score_text, VIETNAMESE
+from _common import TEST_DIR, best_of
+
+
+def main():
+    with codecs.open(os.path.join(TEST_DIR, 'sequences', 'vi.dic'), 'r',
+                     'utf-8') as f:
+        words = [line.strip() for line in f if line.strip()]
+    rng = random.Random(0)
+    paragraph = " ".join(rng.choice(words) for _ in range(100000))
+    score_text("")
+
+    print("%10s %12s %12s" % ("size (MB)", "sampled", "exact"))
+    for copies in (1, 10, 100):
+        text = " ".join([paragraph] * copies)
+        megabytes = len(text.encode('utf-8')) / float(1 << 20)
+        if score_text(text).language != VIETNAMESE:
+            print("misdetected")
+            return 1
+        sampled = best_of(lambda: score_text(text), 5)
+        exact = best_of(lambda: score_text(text, exact=True), 1) \
+            if copies <= 10 else None
+        print("%10.1f %9.0f MB/s %s" %
+              (megabytes, megabytes / sampled,
+               "%7.1f MB/s" % (megabytes / exact) if exact else ""))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+Legacy encoding conversion throughput on multi-megabyte files, against
+a per-character loop for TCVN3.
+"""
+
+from __future__ import unicode_literals, print_function
+import codecs
+import os
+import random
+import shutil
+import sys
+import tempfile
+
+from bogo import legacy
+from _common import TEST_DIR, best_of
+
+
+def _naive_tcvn3_decode(data):
+    table = legacy._TCVN3_DECODING
+    return "".join([table[byte] for byte in bytearray(data)])
+
+
+def main():
+    with codecs.open(os.path.join(TEST_DIR, 'sequences', 'vi.dic'), 'r',
+                     'utf-8') as f:
+        words = [line.strip() for line in f if line.strip()]
+    rng = random.Random(0)
+    lines = []
+    size = 0
+    while size < 8 << 20:
+        line = " ".join(rng.choice(words) for _ in range(12)).capitalize()
+        line = line.replace(words[0], words[0].upper()) + ".\n"
+        lines.append(line)
+        size += len(line.encode('utf-8'))
+    text = "".join(lines)
+
+    directory = tempfile.mkdtemp()
+    try:
+        source = os.path.join(directory, 'text.txt')
+        with open(source, 'wb') as f:
+            f.write(text.encode('utf-8'))
+        megabytes = os.path.getsize(source) / float(1 << 20)
+        print("%.1f MB of UTF-8 text" % megabytes)
+
+        for encoding in legacy.ENCODINGS:
+            sample = text.lower() if encoding == 'tcvn3' else text
+            with open(source, 'wb') as f:
+                f.write(sample.encode('utf-8'))
+            encoded = os.path.join(directory, encoding)
+            decoded = os.path.join(directory, encoding + '.txt')
+
+            encode_time = best_of(
+                lambda: legacy.encode_file(source, encoded, encoding), 3)
+            decode_time = best_of(
+                lambda: legacy.decode_file(encoded, decoded, encoding), 3)
+            with open(decoded, 'rb') as f:
+                if f.read().decode('utf-8') != sample:
+                    print("%s: round trip failed" % encoding)
+                    return 1
+            print("%-6s encode_file: %6.1f MB/s   decode_file: %6.1f MB/s" %
+                  (encoding, megabytes / encode_time,
+                   megabytes / decode_time))
+
+        data = legacy.encode(text.lower(), 'tcvn3')
+        naive_time = best_of(lambda: _naive_tcvn3_decode(data), 1)
+        print("tcvn3  per-character loop:  %6.1f MB/s" %
+              (megabytes / naive_time))
+    finally:
+        shutil.rmtree(directory)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
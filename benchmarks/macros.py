@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+Cost of macro expansion as the macro table grows: process_sequence()
+and a Session typing key by key, with 10 to 100000 macros.
+"""
+
+from __future__ import unicode_literals, print_function
+import random
+import string
+import sys
+
+import bogo
+from bogo.macros import MacroTable
+from _common import best_of, mixed_text
+
+
+def _table(size, rng):
+    macros = {'ko': 'không', 'vn': 'Việt Nam'}
+    while len(macros) < size:
+        key = "".join(rng.choice(string.ascii_lowercase)
+                      for _ in range(rng.randint(2, 6)))
+        macros.setdefault(key, key.upper())
+    return MacroTable(macros)
+
+
+def _type(text, macros):
+    session = bogo.Session(macros=macros)
+    for key in text:
+        session.process_key(key)
+    return session.commit()
+
+
+def main():
+    text = mixed_text(0.3, 2000) + " ko vn"
+    rng = random.Random(0)
+
+    print("%8s %18s %14s" % ("macros", "process_sequence", "Session"))
+    base = best_of(lambda: bogo.process_sequence(text), 3)
+    typed = best_of(lambda: _type(text, None), 3)
+    print("%8s %15.1f ms %11.1f ms" % ("none", base * 1e3, typed * 1e3))
+    for size in (10, 1000, 100000):
+        macros = _table(size, rng)
+        result = bogo.process_sequence(text, macros=macros)
+        if not result.endswith("không Việt Nam") or \
+                _type(text, macros) != result:
+            print("wrong expansion")
+            return 1
+        sequence_time = best_of(
+            lambda: bogo.process_sequence(text, macros=macros), 3)
+        session_time = best_of(lambda: _type(text, macros), 3)
+        print("%8d %15.1f ms %11.1f ms" %
+              (size, sequence_time * 1e3, session_time * 1e3))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""
+normalize_tone_placement() throughput on a large document and
+normalize_tone_placement_many() on a repetitive list of strings.
+"""
+
+from __future__ import unicode_literals, print_function
+import codecs
+import os
+import random
+import sys
+
+from bogo.normalization import normalize_tone_placement, \
+    normalize_tone_placement_many
+from _common import TEST_DIR, best_of
+
+
+def main():
+    with codecs.open(os.path.join(TEST_DIR, 'sequences', 'vi-DauCu.dic'),
+                     'r', 'utf-8') as f:
+        words = [line.strip() for line in f if line.strip()]
+    rng = random.Random(0)
+    text = ' '.join(rng.choice(words) for _ in range(1000000))
+
+    elapsed = best_of(lambda: normalize_tone_placement(text, 'new'), 3)
+    print("document: %d chars in %.1f ms, %.1f MB/s" %
+          (len(text), elapsed * 1e3, len(text) / elapsed / 1e6))
+
+    if normalize_tone_placement(normalize_tone_placement(text, 'new'),
+                                'old') != text:
+        print("round trip failed")
+        return 1
+
+    titles = [' '.join(rng.choice(words) for _ in range(5))
+              for _ in range(5000)]
+    rows = [rng.choice(titles) for _ in range(500000)]
+    one_by_one = best_of(
+        lambda: [normalize_tone_placement(row) for row in rows], 3)
+    many = best_of(lambda: normalize_tone_placement_many(rows), 3)
+    print("%d rows: %.1f ms one by one, %.1f ms with _many" %
+          (len(rows), one_by_one * 1e3, many * 1e3))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+process_sequence() with and without copying words that have no rule key
+straight through, on mixed Telex and VNI text and on text made only of
+such pass-through words. Words that can no longer be Vietnamese stop
+reaching the engine either way.
+
+In Telex nearly every English word has a rule key (a, e, o, w, s...),
+so on mixed Telex text the difference is within noise. The shortcut
+pays off with VNI, whose rule keys are digits, and on the pass-through
+words themselves.
+"""
+
+from __future__ import unicode_literals, print_function
+import sys
+
+import bogo
+from bogo import core
+from _common import ENGLISH_WORDS, mixed_text, best_of, key_by_key
+
+
+def passthrough_text(compiled_rules, words=4000):
+    """English words without any rule key, deterministically."""
+    passthrough = [word for word in ENGLISH_WORDS
+                   if compiled_rules.passthrough_chars.issuperset(word)]
+    return ' '.join(passthrough[i % len(passthrough)]
+                    for i in range(words))
+
+
+def run(name, rules, vni):
+    status = 0
+    compiled = core._compile_rules(rules)
+    # The same rules with the shortcut turned off.
+    without = compiled._replace(passthrough_chars=frozenset())
+
+    def transition(string, key, fallback_sequence):
+        return core._process_key(string, key, fallback_sequence, rules,
+                                 True)
+
+    texts = [("english %3d%%" % (ratio * 100), mixed_text(ratio, vni=vni))
+             for ratio in (0.0, 0.5, 0.9)]
+    texts.append(("pass-through", passthrough_text(compiled)))
+    for label, text in texts:
+        if bogo.process_sequence(text, rules) != key_by_key(text, rules):
+            print("%s %s: output differs from the key-by-key loop" %
+                  (name, label))
+            status = 1
+
+        pieces = compiled.word_pattern.split(text)
+        words = pieces[1::2]
+        copied = sum(1 for word in words
+                     if compiled.passthrough_chars.issuperset(word))
+        baseline = best_of(
+            lambda: core._process_sequence(text, without, transition))
+        current = best_of(
+            lambda: core._process_sequence(text, compiled, transition))
+        print("%-5s %-12s: %5d words, %5d passed through, "
+              "%7.1f ms -> %7.1f ms (x%.2f)" %
+              (name, label, len(words), copied, baseline * 1e3,
+               current * 1e3, baseline / current))
+    return status
+
+
+def main():
+    status = run("telex", bogo.get_telex_definition(), vni=False)
+    status |= run("vni", bogo.get_vni_definition(), vni=True)
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
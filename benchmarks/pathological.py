@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+Adversarial input: long runs of keys that keep the engine busy (repeated
+undo, vowel clusters, no separators) at growing sizes, through every
+entry point. Unlike the other scripts this one also fails when the time
+per key of any input class grows with the input size, i.e. when some
+input is processed in superlinear time.
+"""
+
+from __future__ import unicode_literals, print_function
+import random
+import sys
+
+import bogo
+from _common import best_of
+
+
+SIZES = (1000, 2000, 4000, 8000)
+
+# Allowed growth of the time per key from the smallest to the largest
+# size. Linear processing stays close to 1; quadratic would reach 8.
+MAX_GROWTH = 2.5
+
+
+def _random_keys(keys, seed):
+    rng = random.Random(seed)
+    return lambda n: "".join(rng.choice(keys) for _ in range(n))
+
+
+CLASSES = [
+    ("a", lambda n: "a" * n),
+    ("w", lambda n: "w" * n),
+    ("aw", lambda n: "aw" * (n // 2)),
+    ("uo", lambda n: "uo" * (n // 2)),
+    ("dd", lambda n: "d" * n),
+    ("vowels", _random_keys("aeiouy", 0)),
+    ("telex keys", _random_keys("aeoiuywdsfrxj", 1)),
+    # Words just short enough to be converted, the most work per key.
+    ("longest words", lambda n: (("uo" * n)[:bogo.core.MAX_SYLLABLE_LENGTH] +
+                                 " ") * (n // bogo.core.MAX_SYLLABLE_LENGTH)),
+]
+
+
+def _chunks(text, size=4096):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def _type(text):
+    session = bogo.Session()
+    for key in text:
+        session.process_key_delta(key)
+    return session.commit()
+
+
+def _process_into(text):
+    parts = []
+    bogo.process_into(_chunks(text), parts.append)
+    return "".join(parts)
+
+
+def _cached(text):
+    return bogo.TransitionCache().process_sequence(text)
+
+
+ENTRY_POINTS = [
+    ("process_sequence", bogo.process_sequence),
+    ("process_into", _process_into),
+    ("TransitionCache", _cached),
+    ("Session", _type),
+]
+
+
+def main():
+    status = 0
+    print("%-14s %-17s %s %s" %
+          ("input", "entry point",
+           " ".join("%9s" % ("%dk" % (n // 1000)) for n in SIZES),
+           "  growth"))
+    for name, make in CLASSES:
+        texts = [make(n) for n in SIZES]
+        expected = [bogo.process_sequence(text) for text in texts]
+        for entry_name, func in ENTRY_POINTS:
+            per_key = []
+            for text, result in zip(texts, expected):
+                if func(text) != result:
+                    print("%s gives a different result on %r input" %
+                          (entry_name, name))
+                    return 1
+                per_key.append(best_of(lambda: func(text), 3) / len(text))
+            growth = per_key[-1] / per_key[0]
+            print("%-14s %-17s %s %7.2fx%s" %
+                  (name, entry_name,
+                   " ".join("%6.2f us" % (t * 1e6) for t in per_key),
+                   growth, "  SUPERLINEAR" if growth > MAX_GROWTH else ""))
+            if growth > MAX_GROWTH:
+                status = 1
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
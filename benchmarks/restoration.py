@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+Accent restoration throughput, accuracy and model memory.
+
+There is no Vietnamese corpus in the tree, so the text is generated: a
+random walk over vi.dic where every word has a handful of fixed
+successors. That gives the bigram model something to learn while
+keeping the run deterministic.
+"""
+
+from __future__ import unicode_literals, print_function
+import codecs
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+from bogo.restoration import AccentRestorer, fold
+from _common import TEST_DIR, best_of
+
+
+def _sentences(words, count, rng):
+    successors = dict((word, [rng.choice(words) for _ in range(4)])
+                      for word in words)
+    for _ in range(count):
+        word = rng.choice(words)
+        sentence = [word.capitalize()]
+        for _ in range(rng.randint(5, 15)):
+            word = rng.choice(successors[word])
+            sentence.append(word)
+        yield ' '.join(sentence) + '.'
+
+
+def main():
+    with codecs.open(os.path.join(TEST_DIR, 'sequences', 'vi.dic'), 'r',
+                     'utf-8') as f:
+        words = [line.strip() for line in f if line.strip()]
+    sentences = list(_sentences(words, 40000, random.Random(0)))
+    training, held_out = sentences[:-2000], sentences[-2000:]
+
+    tracemalloc.start()
+    start = time.time()
+    restorer = AccentRestorer()
+    restorer.train(training)
+    restorer.candidates('a')
+    build_time = time.time() - start
+    model_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    text = '\n'.join(held_out)
+    folded = fold(text)
+    restored = restorer.restore(folded)
+    if fold(restored) != folded:
+        print("restoration changed more than the diacritics")
+        return 1
+
+    expected = text.split()
+    actual = restored.split()
+    correct = sum(1 for a, b in zip(expected, actual) if a == b)
+    restore_time = best_of(lambda: restorer.restore(folded), 3)
+
+    print("training sentences:   %7d" % len(training))
+    print("build and train:      %7.2f s" % build_time)
+    print("model memory:         %7d KB" % (model_bytes // 1024))
+    print("syllable accuracy:    %7.1f %%" %
+          (100.0 * correct / len(expected)))
+    print("restore:              %7d words/s" %
+          (len(expected) / restore_time))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+Session.dump_state() and load_state(): size of the state and serialize
+and deserialize throughput for sessions stopped in the middle of a word,
+with a few finished words kept for backspacing.
+"""
+
+from __future__ import unicode_literals, print_function
+import pickle
+import random
+import sys
+
+import bogo
+from _common import best_of, mixed_text
+
+
+def _sessions(count, rng):
+    words = mixed_text(0.3, 2000).split()
+    sessions = []
+    for _ in range(count):
+        session = bogo.Session()
+        typed = " ".join(rng.choice(words) for _ in range(rng.randint(0, 3)))
+        word = rng.choice(words)
+        for key in typed + " " + word[:rng.randint(1, len(word))]:
+            session.process_key(key)
+        sessions.append(session)
+    return sessions
+
+
+def main():
+    sessions = _sessions(10000, random.Random(0))
+    states = [session.dump_state() for session in sessions]
+
+    target = bogo.Session()
+    for session, data in zip(sessions, states):
+        target.load_state(data)
+        if (target.text, target.raw) != (session.text, session.raw):
+            print("wrong state after load_state()")
+            return 1
+
+    def load():
+        for data in states:
+            target.load_state(data)
+
+    sizes = sorted(map(len, states))
+    pickled = sum(len(pickle.dumps((s.string, s.raw, s._done, s._dead), 2))
+                  for s in sessions)
+    print("state size: mean %.1f bytes, p99 %d bytes, max %d bytes "
+          "(pickled tuple: mean %.1f bytes)" %
+          (sum(sizes) / float(len(sizes)), sizes[len(sizes) * 99 // 100],
+           sizes[-1], pickled / float(len(sessions))))
+    dump_time = best_of(lambda: [s.dump_state() for s in sessions], 3)
+    load_time = best_of(load, 3)
+    print("dump_state: %.0f states/s" % (len(sessions) / dump_time))
+    print("load_state: %.0f states/s" % (len(sessions) / load_time))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
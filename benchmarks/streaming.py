@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+Peak memory of process_sequence() against process_into() for growing
+documents. The input is generated line by line and the output counted
+and dropped, so only the engine's own allocations show up.
+Needs tracemalloc (Python 3.4+).
+"""
+
+from __future__ import unicode_literals, print_function
+import sys
+import tracemalloc
+
+import bogo
+from _common import mixed_text, best_of
+
+
+LINE = mixed_text(0.3, words=200) + '\n'
+
+
+def lines(count):
+    for _ in range(count):
+        yield LINE
+
+
+def peak(func):
+    tracemalloc.start()
+    func()
+    result = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result
+
+
+def main():
+    written = [0]
+
+    def write(text):
+        written[0] += len(text)
+
+    print("%8s %12s %22s %20s" %
+          ("lines", "chars", "process_sequence peak", "process_into peak"))
+    for count in (10, 40, 160):
+        whole = peak(lambda: bogo.process_sequence(''.join(lines(count))))
+        streamed = peak(lambda: bogo.process_into(lines(count), write))
+        print("%8d %12d %19d KB %17d KB" %
+              (count, count * len(LINE), whole // 1024, streamed // 1024))
+
+    if bogo.process_sequence(LINE * 3) != \
+            ''.join(_collect(lines(3))):
+        print("process_into output differs")
+        return 1
+
+    sequence_time = best_of(lambda: bogo.process_sequence(LINE * 50), 3)
+    into_time = best_of(lambda: bogo.process_into(lines(50), write), 3)
+    print("time for 50 lines: %.1f ms process_sequence, %.1f ms process_into"
+          % (sequence_time * 1e3, into_time * 1e3))
+    return 0
+
+
+def _collect(chunks):
+    parts = []
+    bogo.process_into(chunks, parts.append)
+    return parts
+
+
+if __name__ == '__main__':
+    sys.exit(main())
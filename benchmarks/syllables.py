@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""
+iter_syllables() against splitting on whitespace and calling
+utils.separate() and accent.get_accent_string() on each word.
+"""
+
+from __future__ import unicode_literals, print_function
+import codecs
+import os
+import random
+import sys
+
+from bogo import accent, utils
+from bogo.syllables import iter_syllables, syllables_many
+from _common import TEST_DIR, best_of
+
+
+def main():
+    with codecs.open(os.path.join(TEST_DIR, 'sequences', 'vi.dic'), 'r',
+                     'utf-8') as f:
+        words = [line.strip() for line in f if line.strip()]
+    rng = random.Random(0)
+    text = ' '.join(rng.choice(words) for _ in range(200000))
+
+    def separate_each():
+        return [(utils.separate(word), accent.get_accent_string(word))
+                for word in text.split()]
+
+    baseline = best_of(separate_each, 3)
+    current = best_of(lambda: list(iter_syllables(text)), 3)
+    print("200000 syllables: %.1f ms with separate(), %.1f ms with "
+          "iter_syllables() (x%.1f), %.0f syllables/s" %
+          (baseline * 1e3, current * 1e3, baseline / current,
+           200000 / current))
+
+    lines = [' '.join(rng.choice(words) for _ in range(10))
+             for _ in range(20000)]
+    elapsed = best_of(lambda: syllables_many(lines), 3)
+    print("syllables_many: %d lines in %.1f ms" % (len(lines), elapsed * 1e3))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
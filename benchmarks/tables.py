@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+Per-worker startup cost of the foreign word filter: building it from a
+word list, unpickling it, and attaching to packed tables in shared
+memory. Memory is what tracemalloc sees each worker allocate.
+Needs Python 3.8+ for multiprocessing.shared_memory.
+"""
+
+from __future__ import unicode_literals, print_function
+import pickle
+import random
+import sys
+import tracemalloc
+from multiprocessing import shared_memory
+
+from bogo.tables import EngineTables, pack_tables
+from bogo.wordfilter import BloomFilter
+from _common import best_of
+
+
+def measure(func):
+    elapsed = best_of(func, repeat=3)
+    tracemalloc.start()
+    result = func()
+    allocated = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, allocated, result
+
+
+def main():
+    rng = random.Random(0)
+    words = ['w%08d' % rng.randint(0, 10 ** 8) for _ in range(500000)]
+    bloom = BloomFilter.from_words(words, 0.001)
+    pickled = pickle.dumps(bloom)
+    data = pack_tables(foreign_words=bloom)
+    shm = shared_memory.SharedMemory(create=True, size=len(data))
+    shm.buf[:len(data)] = data
+
+    try:
+        print("%d words, %d bytes of tables" % (len(words), len(data)))
+        cases = [
+            ("build from words", lambda: BloomFilter.from_words(words, 0.001)),
+            ("unpickle", lambda: pickle.loads(pickled)),
+            ("attach shared memory", lambda: EngineTables(shm.buf)),
+        ]
+        for name, func in cases:
+            elapsed, allocated, result = measure(func)
+            if isinstance(result, EngineTables):
+                ok = all(word in result.foreign_words for word in words[:100])
+                result.close()
+            else:
+                ok = all(word in result for word in words[:100])
+            if not ok:
+                print("lookup failed for", name)
+                return 1
+            print("%-22s %10.3f ms %10d KB" %
+                  (name, elapsed * 1e3, allocated // 1024))
+    finally:
+        shm.close()
+        shm.unlink()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+Validation profiles, and a dictionary profile built from vi.dic, against
+the original chain of has_valid_*() functions, on the sound tuples of
+every dictionary word and of every prefix typed on the way to it.
+"""
+
+from __future__ import unicode_literals, print_function
+import codecs
+import os
+import sys
+
+import bogo
+from bogo import utils
+from bogo.validation import is_valid_sound_tuple, PROFILES, \
+    DictionaryProfile
+from _common import TEST_DIR, load_sequences, best_of
+
+
+def main():
+    with codecs.open(os.path.join(TEST_DIR, 'sequences', 'vi.dic'), 'r',
+                     'utf-8') as f:
+        words = [line.strip() for line in f if line.strip()]
+    finals = [utils.separate(word) for word in words]
+    partials = [utils.separate(word[:i]) for word in words
+                for i in range(1, len(word))]
+
+    print("%-24s %14s %14s" % ("", "final ns/call", "partial ns/call"))
+    profiles = sorted(PROFILES.items()) + \
+        [('dictionary', DictionaryProfile(words))]
+    rows = [("function chain", is_valid_sound_tuple)] + \
+        [("profile " + name, profile.is_valid_combination)
+         for name, profile in profiles]
+    for name, check in rows:
+        final = best_of(lambda: [check(t, True) for t in finals], 3)
+        partial = best_of(lambda: [check(t, False) for t in partials], 3)
+        print("%-24s %14.0f %14.0f" %
+              (name, final * 1e9 / len(finals),
+               partial * 1e9 / len(partials)))
+
+    text = ' '.join(keys for keys, _ in load_sequences())
+    for name, profile in [('default', True)] + profiles:
+        elapsed = best_of(lambda: bogo.process_sequence(
+            text, skip_non_vietnamese=profile), 3)
+        print("process_sequence, %-14s %8.1f ms" % (name, elapsed * 1e3))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+BloomFilter memory and speed at several false positive rates, and the
+effect of a foreign word filter on process_sequence().
+"""
+
+from __future__ import unicode_literals, print_function
+import random
+import sys
+
+import bogo
+from bogo.wordfilter import BloomFilter
+from _common import ENGLISH_WORDS, mixed_text, best_of
+
+
+def main():
+    rng = random.Random(0)
+    words = ['w%08d' % rng.randint(0, 10 ** 8) for _ in range(100000)]
+    absent = ['x%08d' % i for i in range(100000)]
+
+    print("%-8s %10s %12s %8s %12s %10s" %
+          ("fp rate", "bytes", "bits/word", "hashes", "lookups/s",
+           "measured"))
+    for fp_rate in (0.1, 0.01, 0.001, 0.0001):
+        bloom = BloomFilter.from_words(words, fp_rate)
+        if not all(word in bloom for word in words[:1000]):
+            print("false negative")
+            return 1
+        measured = sum(word in bloom for word in absent) / float(len(absent))
+        elapsed = best_of(lambda: [word in bloom for word in absent[:20000]],
+                          repeat=3)
+        print("%-8g %10d %12.2f %8d %12d %10.5f" %
+              (fp_rate, bloom.nbytes, bloom.size_bits / float(len(words)),
+               bloom.num_hashes, 20000 / elapsed, measured))
+    print("a set of the same words takes about %d bytes" %
+          (sys.getsizeof(set(words)) +
+           sum(sys.getsizeof(word) for word in words)))
+
+    text = mixed_text(0.5)
+    foreign = BloomFilter.from_words(ENGLISH_WORDS, 0.001)
+    without = best_of(lambda: bogo.process_sequence(text))
+    with_filter = best_of(
+        lambda: bogo.process_sequence(text, foreign_words=foreign))
+    print("process_sequence, 50%% English: %.1f ms without filter, "
+          "%.1f ms with (x%.2f)" %
+          (without * 1e3, with_filter * 1e3, without / with_filter))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
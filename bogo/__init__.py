@@ -17,16 +17,75 @@ Usage
 Some functions from `bogo.core` are exported to package toplevel:
 
     - process_key()
+    - process_key_delta()
     - process_sequence()
+    - process_into()
     - get_telex_definition()
     - get_vni_definition()
 
+`bogo.profiling()` (from `bogo.instrumentation`) times the engine stages
+while it is active and `bogo.latency_tracking()` (from `bogo.latency`)
+records a latency histogram of every keystroke.
+
+`bogo.Session` (from `bogo.session`) keeps the typing state for input
+method frontends; Session.dump_state() and load_state() move that state
+to another process. `python -m bogo.replay` replays recorded sessions.
+`bogo.EditBuffer` (from `bogo.editing`) supports editing in the middle of
+already typed text. `bogo.TransitionCache` (from `bogo.cache`) memoizes
+keystroke transitions and `bogo.canonicalize_keys()` (from
+`bogo.canonical`) rewrites key sequences in one canonical key order so
+that such caches see fewer near-duplicates. `bogo.MacroTable` (from
+`bogo.macros`) expands shortcuts in process_sequence() and sessions.
+`bogo.BloomFilter` (from `bogo.wordfilter`) is a compact foreign word
+list for process_sequence()'s `foreign_words`.
+`bogo.convert_column()` (from `bogo.columnar`) converts lists, NumPy,
+pandas and Arrow columns, each distinct value once. `bogo.EngineTables`
+(from `bogo.tables`) reads rules and word filters from a flat buffer
+shared between worker processes.
+
+Validation can be made stricter or looser by passing a profile from
+`bogo.validation.PROFILES` as `skip_non_vietnamese`, or limited to the
+words of a dictionary with a `bogo.validation.DictionaryProfile`.
+
+`bogo.normalize_tone_placement()` (from `bogo.normalization`) rewrites
+text to the old (hòa, thủy) or new (hoà, thuỷ) tone mark placement.
+`bogo.iter_syllables()` (from `bogo.syllables`) splits text into
+syllables with their components and tone.
+`bogo.codec` encodes syllables as integers below 2 ** 16 (plus two case
+bits).
+`bogo.AccentRestorer` (from `bogo.restoration`) puts the diacritics back
+into text typed without them.
+`bogo.sort_key()` and `bogo.sorted_vi()` (from `bogo.collation`) sort
+text in Vietnamese alphabetical order.
+`bogo.legacy` converts TCVN3, VNI and VIQR text to Unicode and back.
+`bogo.score_text()` (from `bogo.detection`) tells cheaply whether text
+is Vietnamese, with or without diacritics.
+
 Read `help(bogo.core)` for more help.
 """
 
 from bogo.core import \
     process_key, \
+    process_key_delta, \
     process_sequence, \
+    process_into, \
     get_telex_definition, \
     get_vni_definition, \
     handle_backspace
+
+from bogo.instrumentation import profiling
+from bogo.latency import latency_tracking
+from bogo.session import Session
+from bogo.editing import EditBuffer
+from bogo.cache import TransitionCache
+from bogo.canonical import canonicalize_keys
+from bogo.wordfilter import BloomFilter
+from bogo.columnar import convert_column
+from bogo.tables import EngineTables
+from bogo.normalization import normalize_tone_placement, \
+    normalize_tone_placement_many
+from bogo.syllables import iter_syllables, syllables_many
+from bogo.restoration import AccentRestorer
+from bogo.collation import sort_key, sort_keys, sorted_vi
+from bogo.detection import score_text
+from bogo.macros import MacroTable
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of ibus-bogo project.
+#
+# Copyright (C) 2012 Long T. Dam <longdt90@gmail.com>
+# Copyright (C) 2012-2013 Trung Ngo <ndtrung4419@gmail.com>
+# Copyright (C) 2013 Duong H. Nguyen <cmpitg@gmail.com>
+#
+# ibus-bogo is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ibus-bogo is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ibus-bogo.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+"""
+Memoization of keystroke transitions.
+
+process_key() is a pure function of its arguments and the same states
+come up again and again ('th' + 'u', 'thu' + 'o'...), so a bounded LRU
+table in front of it saves most of the work on real text. The table is
+filled as keys arrive; nothing has to be compiled ahead of time.
+
+>>> cache = TransitionCache()
+>>> cache.process_sequence('con meof')
+'con mèo'
+>>> cache.info()
+CacheInfo(hits=0, misses=7, evictions=0, maxsize=4096, currsize=7)
+"""
+
+from __future__ import unicode_literals
+import collections
+from bogo import core
+
+
+CacheInfo = collections.namedtuple(
+    'CacheInfo', ['hits', 'misses', 'evictions', 'maxsize', 'currsize'])
+
+
+class TransitionCache(object):
+    """
+    A bounded LRU table of (string, key, fallback_sequence) ->
+    (string, fallback_sequence) transitions for one rule set.
+
+    The rules are part of the cache's identity, so do not modify the
+    rules dictionary after creating the cache. One cache can be shared by
+    any number of sessions using the same rules.
+
+    rules, skip_non_vietnamese and max_syllable_length are as in
+    process_sequence().
+    """
+
+    def __init__(self, rules=None, skip_non_vietnamese=True, maxsize=4096,
+                 max_syllable_length=core.MAX_SYLLABLE_LENGTH):
+        if rules is None:
+            rules = core.get_telex_definition()
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.rules = rules
+        self.skip_non_vietnamese = skip_non_vietnamese
+        self.max_syllable_length = max_syllable_length
+        self.maxsize = maxsize
+        self._compiled_rules = core._compile_rules(rules)
+        self.accepted_chars = self._compiled_rules.accepted_chars
+        self._table = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._table)
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / float(lookups) if lookups else 0.0
+
+    def info(self):
+        return CacheInfo(self.hits, self.misses, self.evictions,
+                         self.maxsize, len(self._table))
+
+    def clear(self):
+        """Drop all entries and reset the statistics."""
+        self._table.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def process_key(self, string, key, fallback_sequence=""):
+        """Same as process_key() with the cache's rules."""
+        return self._lookup(string, key, fallback_sequence)[:2]
+
+    def _lookup(self, string, key, fallback_sequence):
+        # Returns the first three items of core._process_key()'s result.
+        state = (string, key, fallback_sequence)
+        table = self._table
+        try:
+            # Re-insert to mark the entry as the most recently used.
+            result = table.pop(state)
+        except KeyError:
+            self.misses += 1
+            result = core._process_key(string, key, fallback_sequence,
+                                       self.rules,
+                                       self.skip_non_vietnamese)[:3]
+            if len(table) >= self.maxsize:
+                table.popitem(last=False)
+                self.evictions += 1
+        else:
+            self.hits += 1
+        table[state] = result
+        return result
+
+    def process_sequence(self, sequence, foreign_words=None, macros=None):
+        """Same as process_sequence() with the cache's rules."""
+        return core._process_sequence(sequence, self._compiled_rules,
+                                      self._lookup, foreign_words,
+                                      self.skip_non_vietnamese, macros,
+                                      self.max_syllable_length)
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of ibus-bogo project.
+#
+# Copyright (C) 2012 Long T. Dam <longdt90@gmail.com>
+# Copyright (C) 2012-2013 Trung Ngo <ndtrung4419@gmail.com>
+# Copyright (C) 2013 Duong H. Nguyen <cmpitg@gmail.com>
+#
+# ibus-bogo is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ibus-bogo is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ibus-bogo.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+"""
+A canonical order for the keys of a word.
+
+The same word can be typed in many orders: 'tuyeenr', 'tuyeern',
+'tuyener' and 'tuyenre' all give 'tuyển', so anything keyed on raw input
+stores near-duplicates. canonicalize_keys() rewrites every word into one
+of them, each mark key right after its letter and the tone key last:
+
+>>> canonicalize_keys('tuyener ddeemf')
+'tuyeenr ddeemf'
+
+The canonical keys are spelled out from the converted word and kept only
+if they convert back to the same text, so the output of
+process_sequence() never changes. Words that do not convert, or that use
+the rules in a way that cannot be spelled out again (undoing a mark with
+a doubled key for example), are left alone.
+"""
+
+from __future__ import unicode_literals
+from bogo import core, utils
+from bogo.accent import Accent, get_accent_char, remove_accent_char
+from bogo.mark import Mark, get_mark_char, add_mark_char
+
+
+def _modifier_keys(rules):
+    """
+    Return ({(letter, mark): key}, {accent: key}), the first key in
+    sorted order that adds each mark and tone under `rules`.
+    """
+    marks = {}
+    tones = {}
+    for key in sorted(rules):
+        transforms = rules[key]
+        if not isinstance(transforms, list):
+            transforms = [transforms]
+        for trans in transforms:
+            action, parameter = core._get_action(trans)
+            if action == core._Action.ADD_MARK:
+                marks.setdefault((trans[0], parameter), key)
+            elif action == core._Action.ADD_ACCENT:
+                tones.setdefault(parameter, key)
+    return marks, tones
+
+
+_letters = None
+
+
+def _letter_table():
+    # Every Vietnamese letter split into (base letter, mark, accent).
+    global _letters
+    if _letters is None:
+        _letters = {}
+        for char in utils.VOWELS + utils.VOWELS.upper() + "đĐ":
+            plain = remove_accent_char(char)
+            _letters[char] = (add_mark_char(plain, Mark.NONE),
+                              get_mark_char(plain), get_accent_char(char))
+    return _letters
+
+
+def _spelling_table(rules):
+    """
+    Map every Vietnamese letter to (keys, tone key): the base letter
+    followed by its mark key, and the key of its tone. Letters whose mark
+    or tone has no key are left out.
+    """
+    marks, tones = _modifier_keys(rules)
+    tones[Accent.NONE] = ""
+    table = {}
+    for char, (letter, mark, accent) in _letter_table().items():
+        if accent not in tones:
+            continue
+        keys = letter
+        if mark != Mark.NONE:
+            key = marks.get((letter.lower(), mark))
+            if key is None:
+                continue
+            keys += key.upper() if letter.isupper() else key
+        table[char] = (keys, tones[accent])
+    return table
+
+
+def _spell(word, table):
+    """Return the canonical keys of a converted word, or None."""
+    keys = []
+    tone = ""
+    for char in word:
+        if char in table:
+            char_keys, char_tone = table[char]
+            keys.append(char_keys)
+            if char_tone:
+                if tone:
+                    return None
+                tone = char_tone
+        else:
+            keys.append(char)
+    keys.append(tone)
+    return "".join(keys)
+
+
+def canonicalize_keys(raw, rules=None, skip_non_vietnamese=True):
+    """
+    Rewrite the words of the key sequence `raw` into their canonical key
+    order, leaving separators as they are.
+
+    Args:
+        rules, skip_non_vietnamese (optional): see process_sequence().
+            The result converts exactly like `raw` under the same
+            arguments.
+
+    Each distinct word is converted once and its spelling checked with a
+    second conversion, so the cost is linear in the length of `raw`.
+    """
+    if rules is None:
+        rules = core.get_telex_definition()
+    compiled_rules = core._compile_rules(rules)
+    table = _spelling_table(rules)
+
+    def transition(string, key, fallback_sequence):
+        return core._process_key(string, key, fallback_sequence, rules,
+                                 skip_non_vietnamese)
+
+    def convert(word):
+        parts = []
+        core._write_pieces(["", word], compiled_rules, transition, None,
+                           skip_non_vietnamese, parts.append)
+        return "".join(parts)
+
+    canonical = {}
+    pieces = compiled_rules.word_pattern.split(raw)
+    # Even items are separators, odd items are words.
+    for index in range(1, len(pieces), 2):
+        word = pieces[index]
+        if word not in canonical:
+            result = word
+            converted = convert(word)
+            if converted != word:
+                keys = _spell(converted, table)
+                if keys is not None and keys != word and \
+                        convert(keys) == converted:
+                    result = keys
+            canonical[word] = result
+        pieces[index] = canonical[word]
+    return "".join(pieces)
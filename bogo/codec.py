@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of ibus-bogo project.
+#
+# Copyright (C) 2012 Long T. Dam <longdt90@gmail.com>
+# Copyright (C) 2012-2013 Trung Ngo <ndtrung4419@gmail.com>
+# Copyright (C) 2013 Duong H. Nguyen <cmpitg@gmail.com>
+#
+# ibus-bogo is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ibus-bogo is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ibus-bogo.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+"""
+Syllables as small integers.
+
+Every syllable made of a first consonant, a vowel with its tone and a
+last consonant is numbered: the first consonant index times the number
+of rhymes plus the rhyme index, which stays below 2 ** 16. The letter
+case (lower, Capitalized or UPPER) goes in bits 16 and 17.
+
+>>> encode('Việt')
+100071
+>>> decode(encode('Việt'))
+'Việt'
+
+Both tone placements of open oa, oe and uy syllables (hòa and hoà) have
+their own code. Codes only change if the tables in bogo.validation do,
+see VERSION.
+
+encode_many() returns an array.array of fixed-width unsigned integers,
+which NumPy can use without copying: numpy.frombuffer(codes,
+dtype=numpy.uint32), or dtype=numpy.uint16 with keep_case=False.
+"""
+
+from __future__ import unicode_literals
+from array import array
+from bogo import accent
+from bogo.validation import CONSONANTS, TERMINAL_CONSONANTS, VOWELS, \
+    SoundTuple, has_valid_vowel
+Accent = accent.Accent
+
+
+VERSION = 1
+
+LOWER = 0
+CAPITALIZED = 1
+UPPER = 2
+
+CASE_SHIFT = 16
+SYLLABLE_MASK = (1 << CASE_SHIFT) - 1
+
+# The array typecode of 32-bit codes: 'L' is 64 bits wide on most 64-bit
+# platforms, 'I' is 32 bits wide on all common ones.
+CODE_TYPECODE = [typecode for typecode in 'IL'
+                 if array(typecode).itemsize == 4][0]
+
+_FIRST_CONSONANTS = [''] + sorted(CONSONANTS)
+
+_OPEN_ALTERNATIVES = ('oa', 'oe', 'uy')
+
+
+def _build_rhymes():
+    # (vowel with tone, last consonant) pairs, with the tone where
+    # accent.add_accent() puts it plus the other placement of open oa, oe
+    # and uy. The empty rhyme covers vowel-less abbreviations.
+    rhymes = set([('', '')])
+    for vowel in VOWELS:
+        for last in TERMINAL_CONSONANTS | set(['']):
+            if not has_valid_vowel(SoundTuple('', vowel, last)):
+                continue
+            for tone in range(Accent.GRAVE + 1):
+                toned = accent.add_accent(['', vowel, last], tone)[1]
+                rhymes.add((toned, last))
+                if tone and not last and vowel in _OPEN_ALTERNATIVES:
+                    rhymes.add((vowel[0] + accent.add_accent_char(
+                        vowel[1], tone), last))
+    return sorted(rhymes)
+
+
+_RHYMES = _build_rhymes()
+
+# Filled in by _load().
+_SYLLABLES = []
+_CODES = {}
+
+
+def _load():
+    global _SYLLABLES, _CODES
+    if _SYLLABLES:
+        return
+    syllables = []
+    codes = {}
+    for first in _FIRST_CONSONANTS:
+        for vowel, last in _RHYMES:
+            syllable = first + vowel + last
+            syllables.append(syllable)
+            # utils.separate() reads 'gia' as gi + a and 'gin' as g + i + n,
+            # the other readings only get decoded.
+            if first == 'g' and vowel[:1] == 'i' and len(vowel) > 1:
+                continue
+            if first == 'gi' and not vowel:
+                continue
+            if syllable and syllable not in codes:
+                codes[syllable] = len(syllables) - 1
+    # Publish the finished tables, _SYLLABLES last since other threads
+    # check it: they must never see them half filled.
+    _CODES = codes
+    _SYLLABLES = syllables
+
+
+def _case(syllable, lower):
+    if syllable == lower:
+        return LOWER
+    if syllable == lower[:1].upper() + lower[1:]:
+        return CAPITALIZED
+    if syllable == lower.upper():
+        return UPPER
+    raise ValueError("Mixed case syllable: %r" % syllable)
+
+
+def encode(syllable):
+    """
+    Return the code of `syllable`. Raises ValueError if it cannot be
+    encoded.
+    """
+    _load()
+    lower = syllable.lower()
+    try:
+        code = _CODES[lower]
+    except KeyError:
+        raise ValueError("Cannot encode %r" % syllable)
+    return code | (_case(syllable, lower) << CASE_SHIFT)
+
+
+def decode(code):
+    """Return the syllable encoded as `code`."""
+    _load()
+    try:
+        syllable = _SYLLABLES[code & SYLLABLE_MASK]
+    except IndexError:
+        raise ValueError("Invalid syllable code: %d" % code)
+    case = code >> CASE_SHIFT
+    if case == CAPITALIZED:
+        return syllable[:1].upper() + syllable[1:]
+    if case == UPPER:
+        return syllable.upper()
+    if case != LOWER:
+        raise ValueError("Invalid syllable code: %d" % code)
+    return syllable
+
+
+def encode_many(syllables, keep_case=True):
+    """
+    Encode an iterable of syllables into an array.array: of 32-bit
+    codes with the case bits (typecode CODE_TYPECODE, numpy.uint32), or
+    of 16-bit codes with the case dropped if `keep_case` is false
+    (typecode 'H', numpy.uint16).
+    """
+    _load()
+    codes = _CODES
+    if not keep_case:
+        try:
+            return array('H', [codes[syllable.lower()]
+                               for syllable in syllables])
+        except KeyError as e:
+            raise ValueError("Cannot encode %r" % e.args[0])
+    return array(CODE_TYPECODE, [encode(syllable)
+                                 for syllable in syllables])
+
+
+def decode_many(codes):
+    """
+    Decode an iterable of codes (an array.array, a NumPy array, a
+    list...) into a list of syllables.
+    """
+    _load()
+    if hasattr(codes, 'tolist'):
+        codes = codes.tolist()
+    else:
+        codes = list(codes)
+    syllables = _SYLLABLES
+    if codes and min(codes) >= 0 and max(codes) < len(syllables):
+        # All lowercase.
+        return [syllables[code] for code in codes]
+    return [decode(code) for code in codes]
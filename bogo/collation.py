@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of ibus-bogo project.
+#
+# Copyright (C) 2012 Long T. Dam <longdt90@gmail.com>
+# Copyright (C) 2012-2013 Trung Ngo <ndtrung4419@gmail.com>
+# Copyright (C) 2013 Duong H. Nguyen <cmpitg@gmail.com>
+#
+# ibus-bogo is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ibus-bogo is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ibus-bogo.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+"""
+Vietnamese collation keys.
+
+Vietnamese dictionaries sort letters as a ă â b c d đ e ê ... o ô ơ ...
+u ư ..., then by tone (none, grave, hook, tilde, acute, dot), then
+lowercase before uppercase. sort_key() turns a string into a bytes key
+that compares that way, so sorting needs nothing but bytes comparisons:
+
+>>> sorted_vi(['ơ', 'ô', 'Ô', 'ố', 'o'])
+['o', 'ô', 'Ô', 'ố', 'ơ']
+
+The key has three levels separated by a NUL byte, each built with a
+single str.translate() call:
+
+    primary     one byte per character: letters are replaced by their
+                rank in the alphabet, ASCII punctuation and digits keep
+                their relative order, anything else its code point
+    secondary   the tones of the vowels
+    tertiary    the case of the letters
+
+Trailing default tones and cases are dropped from the last two levels,
+so the key of lowercase text without tones is only two bytes longer
+than the text.
+"""
+
+from __future__ import unicode_literals
+import string
+from bogo import accent, mark, utils
+from bogo.accent import Accent
+from bogo.mark import Mark
+
+
+# From the first to the last letter of a family.
+_MARK_ORDER = [Mark.NONE, Mark.BREVE, Mark.HAT, Mark.HORN, Mark.BAR]
+_TONE_ORDER = [Accent.NONE, Accent.GRAVE, Accent.HOOK, Accent.TIDLE,
+               Accent.ACUTE, Accent.DOT]
+
+
+def _alphabet():
+    letters = []
+    for base in string.ascii_lowercase:
+        for mark_ in _MARK_ORDER:
+            letter = mark.add_mark_char(base, mark_)
+            if letter not in letters:
+                letters.append(letter)
+    return letters
+
+
+ALPHABET = "".join(_alphabet())
+
+# The 33 letters take the bytes of 'A'...'a'. The punctuation in
+# between moves to where the lowercase letters were.
+_FIRST_LETTER = ord('A')
+_PUNCTUATION = "[\\]^_`"
+
+
+def _build_tables():
+    primary = {}
+    secondary = {}
+    tertiary = {}
+    letters = [(char, accent.remove_accent_char(char), Accent.NONE)
+               for char in ALPHABET]
+    letters += [(char, accent.remove_accent_char(char),
+                 accent.get_accent_char(char))
+                for char in utils.VOWELS]
+    for char, letter, tone in letters:
+        weight = "%c" % (_FIRST_LETTER + ALPHABET.index(letter))
+        for case, cased in enumerate((char, char.upper())):
+            primary[ord(cased)] = weight
+            # Consonants carry no tone, vowels one weight each.
+            secondary[ord(cased)] = \
+                "%c" % (1 + _TONE_ORDER.index(tone)) \
+                if letter in utils.VOWELS else None
+            tertiary[ord(cased)] = "%c" % (1 + case)
+    for index, char in enumerate(_PUNCTUATION):
+        primary[ord(char)] = "%c" % (_FIRST_LETTER + len(ALPHABET) + index)
+    return utils.dense_table(primary), utils.dense_table(secondary), \
+        utils.dense_table(tertiary)
+
+
+_PRIMARY, _SECONDARY, _TERTIARY = _build_tables()
+
+
+def sort_key(text):
+    """
+    Return a bytes key for `text`. Keys of two strings compare like the
+    strings do in Vietnamese. `text` must not contain NUL characters.
+    """
+    return (text.translate(_PRIMARY) + "\0" +
+            text.translate(_SECONDARY).rstrip("\1") + "\0" +
+            text.translate(_TERTIARY).rstrip("\1")).encode('utf-8')
+
+
+def sort_keys(texts):
+    """
+    Return the sort_key() of each of `texts`. Faster than calling
+    sort_key() on each when the texts are short, e.g. names.
+    """
+    texts = list(texts)
+    joined = "\0".join(texts)
+    if joined.count("\0") != len(texts) - 1:
+        return [sort_key(text) for text in texts]
+    levels = zip(joined.translate(_PRIMARY).split("\0"),
+                 joined.translate(_SECONDARY).split("\0"),
+                 joined.translate(_TERTIARY).split("\0"))
+    return [(primary + "\0" + secondary.rstrip("\1") + "\0" +
+             tertiary.rstrip("\1")).encode('utf-8')
+            for primary, secondary, tertiary in levels]
+
+
+def sorted_vi(iterable, key=None, reverse=False):
+    """
+    Like sorted() but in Vietnamese order. `key`, if given, extracts the
+    string to sort by from each item.
+    """
+    items = list(iterable)
+    texts = items if key is None else [key(item) for item in items]
+    keys = sort_keys(texts)
+    order = sorted(range(len(items)), key=keys.__getitem__,
+                   reverse=reverse)
+    return [items[index] for index in order]
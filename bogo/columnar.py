@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of ibus-bogo project.
+#
+# Copyright (C) 2012 Long T. Dam <longdt90@gmail.com>
+# Copyright (C) 2012-2013 Trung Ngo <ndtrung4419@gmail.com>
+# Copyright (C) 2013 Duong H. Nguyen <cmpitg@gmail.com>
+#
+# ibus-bogo is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ibus-bogo is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ibus-bogo.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+"""
+Conversion of whole columns of raw key sequences.
+
+Tables tend to repeat the same values over and over, so convert_column()
+dictionary-encodes its input first and runs process_sequence() once per
+distinct value:
+
+>>> convert_column(['meof', 'meo2', 'meof', None])
+['mèo', 'meo2', 'mèo', None]
+
+NumPy arrays, pandas Series and Arrow arrays are handled natively when
+those libraries are in use; none of them is required.
+"""
+
+from __future__ import unicode_literals
+import collections
+import sys
+from bogo import core
+
+
+def convert_column(values, rules=None, skip_non_vietnamese=True,
+                   foreign_words=None):
+    """
+    Convert every string in `values` with process_sequence() and return
+    the results in the same kind of container:
+
+        - a pandas Series: a Series with the same index, name and dtype.
+          A categorical Series gets its categories converted.
+        - a pyarrow Array or ChunkedArray: an array of the same type.
+        - a NumPy array: an object array of the same shape.
+        - any other iterable: a list.
+
+    Missing values (None, NaN, nulls) and non-string values are kept as
+    they are. Each distinct value is converted only once.
+
+    Args:
+        rules, skip_non_vietnamese, foreign_words (optional): see
+            docstring for process_sequence().
+    """
+    if rules is None:
+        rules = core.get_telex_definition()
+
+    def convert(value):
+        if isinstance(value, type("")):
+            return core.process_sequence(value, rules, skip_non_vietnamese,
+                                         foreign_words)
+        return value
+
+    pandas = sys.modules.get('pandas')
+    if pandas is not None and isinstance(values, pandas.Series):
+        return _convert_series(values, convert, pandas)
+
+    pyarrow = sys.modules.get('pyarrow')
+    if pyarrow is not None and \
+            isinstance(values, (pyarrow.Array, pyarrow.ChunkedArray)):
+        return _convert_arrow(values, convert, pyarrow)
+
+    numpy = sys.modules.get('numpy')
+    if numpy is not None and isinstance(values, numpy.ndarray):
+        converted = _convert_values(values.ravel().tolist(), convert)
+        return numpy.array(converted, dtype=object).reshape(values.shape)
+
+    return _convert_values(values, convert)
+
+
+def _convert_values(values, convert):
+    results = {}
+    converted = []
+    for value in values:
+        try:
+            result = results[value]
+        except KeyError:
+            result = results[value] = convert(value)
+        except TypeError:
+            # Unhashable, leave it alone.
+            result = value
+        converted.append(result)
+    return converted
+
+
+def _convert_series(series, convert, pandas):
+    import numpy
+
+    if isinstance(series.dtype, pandas.CategoricalDtype):
+        return _convert_categorical(series, convert, pandas, numpy)
+
+    codes, uniques = pandas.factorize(series)
+    converted = numpy.array([convert(value) for value in uniques] + [None],
+                            dtype=object).take(codes)
+    # Missing values get the code -1, put the original ones back.
+    missing = codes < 0
+    converted[missing] = series.to_numpy(dtype=object)[missing]
+    return pandas.Series(converted, index=series.index,
+                         name=series.name, dtype=series.dtype)
+
+
+def _convert_categorical(series, convert, pandas, numpy):
+    # Only the categories need converting, the codes stay the same.
+    categories = [convert(value) for value in series.cat.categories]
+    if len(set(categories)) == len(categories):
+        return series.cat.rename_categories(categories)
+
+    # Some categories became the same string and have to be merged.
+    values = numpy.array(categories + [None], dtype=object).take(
+        series.cat.codes.to_numpy())
+    merged = list(collections.OrderedDict.fromkeys(categories))
+    return pandas.Series(
+        pandas.Categorical(values, categories=merged,
+                           ordered=series.cat.ordered),
+        index=series.index, name=series.name)
+
+
+def _convert_arrow(array, convert, pyarrow):
+    chunked = isinstance(array, pyarrow.ChunkedArray)
+    if chunked:
+        array = array.combine_chunks()
+
+    is_dictionary = pyarrow.types.is_dictionary(array.type)
+    encoded = array if is_dictionary else array.dictionary_encode()
+    dictionary = pyarrow.array(
+        [convert(value) for value in encoded.dictionary.to_pylist()],
+        type=encoded.dictionary.type)
+
+    if is_dictionary:
+        result = pyarrow.DictionaryArray.from_arrays(encoded.indices,
+                                                     dictionary)
+    else:
+        result = dictionary.take(encoded.indices)
+    return pyarrow.chunked_array([result]) if chunked else result
@@ -25,9 +25,12 @@ Read the docstring for process_sequence() and process_key() first.
 """
 
 from __future__ import unicode_literals
-from bogo.validation import is_valid_combination
+from bogo.validation import is_valid_combination, ValidationProfile, \
+    DEFAULT_PROFILE
 from bogo import utils, accent, mark
+import collections
 import logging
+import re
 import sys
 import string
 
@@ -36,6 +39,23 @@ Mark = mark.Mark
 Accent = accent.Accent
 
 
+_ASCII_LETTERS = frozenset(string.ascii_letters)
+
+# Words of more keys than this are passed through unconverted. No
+# Vietnamese syllable comes close and the engine's work per key grows
+# with the length of the word, so this bounds the cost of hostile input
+# like 'aaaa...' to a constant per key.
+MAX_SYLLABLE_LENGTH = 32
+
+# Every beginning of a first consonant, including the empty one.
+_CONSONANT_PREFIXES = DEFAULT_PROFILE.consonant_prefixes
+
+
+KeyDelta = collections.namedtuple(
+    'KeyDelta',
+    ['backspaces', 'insert', 'string', 'fallback_sequence'])
+
+
 class _Action:
     UNDO = 3
     ADD_MARK = 2
@@ -43,6 +63,18 @@ class _Action:
     ADD_CHAR = 0
 
 
+class _Branch:
+    """
+    Which path _process_key() took for a keystroke. Used to label
+    instrumentation samples.
+    """
+    APPEND = 'append'
+    MARK = 'mark'
+    ACCENT = 'accent'
+    UNDO = 'undo'
+    FALLBACK = 'fallback'
+
+
 def get_telex_definition(w_shorthand=True, brackets_shorthand=True):
     """Create a definition dictionary for the TELEX input method
 
@@ -113,43 +145,261 @@ def _accepted_chars(rules):
 
 def process_sequence(sequence,
                      rules=None,
-                     skip_non_vietnamese=True):
+                     skip_non_vietnamese=True,
+                     foreign_words=None,
+                     macros=None,
+                     max_syllable_length=MAX_SYLLABLE_LENGTH):
     """\
     Convert a key sequence into a Vietnamese string with diacritical marks.
 
     Args:
         rules (optional): see docstring for process_key().
         skip_non_vietnamese (optional): see docstring for process_key().
+        foreign_words (optional): a set or bogo.wordfilter.BloomFilter of
+            lowercased words to leave unconverted.
+        macros (optional): a bogo.macros.MacroTable of words to replace
+            with their expansion instead of converting them.
+        max_syllable_length (optional): words of more keys than this are
+            left unconverted. None for no limit.
 
     It even supports continous key sequences connected by separators.
     i.e. process_sequence('con meof.ddieen') should work.
     """
-    result = ""
-    raw = result
-    result_parts = []
     if rules is None:
         rules = get_telex_definition()
 
-    accepted_chars = _accepted_chars(rules)
+    def transition(string, key, fallback_sequence):
+        return _process_key(string, key, fallback_sequence, rules,
+                            skip_non_vietnamese)
+
+    return _process_sequence(sequence, _compile_rules(rules), transition,
+                             foreign_words, skip_non_vietnamese, macros,
+                             max_syllable_length)
+
+
+def process_into(sequence,
+                 write,
+                 rules=None,
+                 skip_non_vietnamese=True,
+                 foreign_words=None,
+                 chunk_size=65536,
+                 macros=None,
+                 max_syllable_length=MAX_SYLLABLE_LENGTH):
+    """\
+    Like process_sequence() but pass the converted text to `write` piece
+    by piece instead of returning it.
+
+    Args:
+        sequence: a string, an iterable of strings (lines, network
+            reads...) or a file-like object with a read() method. Words
+            may span several strings.
+        write: a callable taking a string, e.g. the write method of a
+            file or io.StringIO.
+        rules, skip_non_vietnamese, foreign_words, macros,
+        max_syllable_length (optional): see docstring for
+            process_sequence().
+        chunk_size (optional): how many characters to read at a time
+            from a file-like `sequence`.
+
+    Only the word being typed at the end of a chunk is kept in memory
+    between chunks, so converting a file does not load it whole.
+    """
+    if rules is None:
+        rules = get_telex_definition()
 
-    for key in sequence:
-        if key not in accepted_chars:
-            result_parts.append(result)
-            result_parts.append(key)
-            result = ""
-            raw = ""
+    def transition(string, key, fallback_sequence):
+        return _process_key(string, key, fallback_sequence, rules,
+                            skip_non_vietnamese)
+
+    compiled_rules = _compile_rules(rules)
+
+    if isinstance(sequence, type("")):
+        chunks = [sequence]
+    elif hasattr(sequence, 'read'):
+        chunks = _read_chunks(sequence, chunk_size)
+    else:
+        chunks = sequence
+
+    pending = ""
+    # Whether the last chunk ended in the middle of a word too long to be
+    # converted, that has been written out already.
+    overlong = False
+    for chunk in chunks:
+        pieces = compiled_rules.word_pattern.split(pending + chunk)
+        # A word touching the end of the chunk may go on in the next one.
+        if len(pieces) > 1 and not pieces[-1]:
+            pending = pieces[-2]
+            del pieces[-2:]
         else:
-            result, raw = process_key(
-                string=result,
-                key=key,
-                fallback_sequence=raw,
-                rules=rules,
-                skip_non_vietnamese=skip_non_vietnamese)
-
-    result_parts.append(result)
+            pending = ""
+        if overlong:
+            if pieces == [""]:
+                # The whole chunk goes on with the overlong word.
+                write(pending)
+                pending = ""
+                continue
+            if not pieces[0]:
+                write(pieces[1])
+                pieces[1] = ""
+            overlong = False
+        _write_pieces(pieces, compiled_rules, transition, foreign_words,
+                      skip_non_vietnamese, write, macros, max_syllable_length)
+        if max_syllable_length is not None and \
+                len(pending) > max_syllable_length:
+            # Do not keep growing an unbroken run of letters in memory.
+            write(pending)
+            pending = ""
+            overlong = True
+
+    if pending:
+        _write_pieces(["", pending], compiled_rules, transition,
+                      foreign_words, skip_non_vietnamese, write, macros,
+                      max_syllable_length)
+
+
+def _read_chunks(stream, chunk_size):
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+_CompiledRules = collections.namedtuple(
+    '_CompiledRules', ['accepted_chars', 'passthrough_chars', 'word_pattern'])
+
+
+def _compile_rules(rules):
+    """
+    Precompute what process_sequence() needs to know about `rules`: the
+    accepted characters, the ASCII letters that no rule reacts to and a
+    pattern splitting a sequence into words and separators.
+
+    A word made only of pass-through letters is never changed by the
+    engine, each key just gets appended.
+    """
+    accepted_chars = _accepted_chars(rules)
+    passthrough_chars = frozenset(char for char in _ASCII_LETTERS
+                                  if char.lower() not in rules)
+    word_pattern = re.compile(
+        "([%s]+)" % "".join(map(re.escape, sorted(accepted_chars))))
+    return _CompiledRules(accepted_chars, passthrough_chars, word_pattern)
+
+
+def _process_sequence(sequence, compiled_rules, transition,
+                      foreign_words=None, skip_non_vietnamese=True,
+                      macros=None, max_syllable_length=MAX_SYLLABLE_LENGTH):
+    """
+    The loop behind process_sequence(). `transition(string, key,
+    fallback_sequence)` processes one key and returns the first three
+    items of _process_key()'s result.
+    """
+    result_parts = []
+    _write_pieces(compiled_rules.word_pattern.split(sequence),
+                  compiled_rules, transition, foreign_words,
+                  skip_non_vietnamese, result_parts.append, macros,
+                  max_syllable_length)
     return ''.join(result_parts)
 
 
+def _write_pieces(pieces, compiled_rules, transition, foreign_words,
+                  skip_non_vietnamese, write, macros=None,
+                  max_syllable_length=MAX_SYLLABLE_LENGTH):
+    """
+    Convert the words among `pieces`, the result of splitting a sequence
+    with compiled_rules.word_pattern, and pass every piece to `write`.
+    """
+    is_passthrough = compiled_rules.passthrough_chars.issuperset
+    consonant_prefixes = _consonant_prefixes(skip_non_vietnamese)
+    final_profile = _final_form_profile(skip_non_vietnamese)
+
+    # Even items are separators, odd items are words.
+    for index, piece in enumerate(pieces):
+        if macros is not None and index % 2 and \
+                (max_syllable_length is None or
+                 len(piece) <= max_syllable_length):
+            expansion = macros.expand(piece)
+            if expansion is not None:
+                write(expansion)
+                continue
+        if index % 2 == 0 or is_passthrough(piece) or \
+                (max_syllable_length is not None and
+                 len(piece) > max_syllable_length) or \
+                (foreign_words is not None and
+                 piece.lower() in foreign_words):
+            if piece:
+                write(piece)
+        else:
+            word = _process_word(piece, transition, consonant_prefixes)
+            if final_profile is not None and word != piece and \
+                    not final_profile.is_valid_string(word):
+                word = piece
+            write(word)
+
+
+def _process_word(word, transition, consonant_prefixes=_CONSONANT_PREFIXES):
+    """
+    Run the keys of a word through `transition`. Once the word can no
+    longer become Vietnamese (see _is_dead_end()), the following letters
+    are copied through without calling `transition`.
+    """
+    result = raw = ""
+    index = 0
+    length = len(word)
+
+    while index < length:
+        key = word[index]
+        index += 1
+        result, raw, branch = transition(result, key, raw)[:3]
+
+        if branch == _Branch.FALLBACK and \
+                _is_dead_end(raw, consonant_prefixes):
+            start = index
+            while index < length and word[index] in _ASCII_LETTERS:
+                index += 1
+            # Anything else, e.g. a VNI digit, goes back to the engine
+            # from the raw state.
+            result = raw = result + word[start:index]
+
+    return result
+
+
+def _is_dead_end(fallback_sequence, consonant_prefixes=_CONSONANT_PREFIXES):
+    """
+    Return True if no key can turn `fallback_sequence`, the raw keys of a
+    word that has just failed validation, into a valid word again when
+    followed by more ASCII letters.
+
+    This is the case when the word has a vowel and its first consonant is
+    not in `consonant_prefixes`, the beginnings of valid first consonants
+    ('str' in 'stra', 'syst' in 'syste'). ASCII letters only ever grow
+    that consonant cluster, and marks and accents cannot turn a vowel
+    into a consonant or the other way around. Non-ASCII characters are
+    excluded because undoing a ư or ơ removes a character.
+    """
+    for char in fallback_sequence:
+        if char not in _ASCII_LETTERS:
+            return False
+    comps = utils.separate(fallback_sequence)
+    return comps[1] != "" and \
+        comps[0].lower() not in consonant_prefixes
+
+
+def _consonant_prefixes(skip_non_vietnamese):
+    # Those of the validation profile in use, for _is_dead_end().
+    if isinstance(skip_non_vietnamese, ValidationProfile):
+        return skip_non_vietnamese.consonant_prefixes
+    return _CONSONANT_PREFIXES
+
+
+def _final_form_profile(skip_non_vietnamese):
+    # The validation profile finished words must pass, if any.
+    if isinstance(skip_non_vietnamese, ValidationProfile) and \
+            skip_non_vietnamese.check_final_form:
+        return skip_non_vietnamese
+    return None
+
+
 def process_key(string, key,
                 fallback_sequence="", rules=None,
                 skip_non_vietnamese=True):
@@ -162,7 +412,10 @@ def process_key(string, key,
         rules (optional): A dictionary listing
             transformation rules. Defaults to get_telex_definition().
         skip_non_vietnamese (optional): Whether to skip results that
-            doesn't seem like Vietnamese. Defaults to True.
+            doesn't seem like Vietnamese. Defaults to True. Can also be
+            a bogo.validation.ValidationProfile to validate with, e.g.
+            validation.get_profile('strict') or a
+            validation.DictionaryProfile.
 
     Returns a tuple. The first item of which is the processed
     Vietnamese string, the second item is the next fallback sequence.
@@ -202,6 +455,22 @@ def process_key(string, key,
     effect strings. Although you should try to avoid this if
     you are defining a custom input method rule.
     """
+    return _process_key(string, key, fallback_sequence, rules,
+                        skip_non_vietnamese)[:2]
+
+
+def _process_key(string, key, fallback_sequence, rules,
+                 skip_non_vietnamese):
+    """
+    The actual implementation of process_key(). Every keystroke processed
+    by the engine goes through here, which makes it the single place to
+    hook for instrumentation (see bogo.instrumentation).
+
+    Returns a tuple (string, fallback_sequence, branch, comps, new_comps)
+    where branch is one of the _Branch values, comps are the components
+    of the input string and new_comps those of the output string, or None
+    if the output is the fallback sequence.
+    """
     # TODO Figure out a way to remove the `string` argument. Perhaps only the
     #      key sequence is needed?
     def default_return():
@@ -247,7 +516,7 @@ def process_key(string, key,
             #
             # So we have to clean it up a bit.
             def is_telex_like():
-                return '<ư' in rules["w"]
+                return '<ư' in rules.get("w", ())
 
             def undone_vowel_ends_with_u():
                 return new_comps[1] and new_comps[1][-1].lower() == "u"
@@ -273,19 +542,86 @@ def process_key(string, key,
 
         if tmp == new_comps:
             fallback_sequence += key
+            branch = _Branch.APPEND
+        else:
+            branch = _Branch.UNDO
         new_comps = utils.append_comps(new_comps, key)
     else:
         fallback_sequence += key
+        branch = _get_branch(trans_list[0])
+
+    if skip_non_vietnamese is True:
+        is_valid = is_valid_combination
+    elif isinstance(skip_non_vietnamese, ValidationProfile):
+        is_valid = skip_non_vietnamese.is_valid_combination
+    else:
+        is_valid = None
 
-    if skip_non_vietnamese is True and key.isalpha() and \
-            not is_valid_combination(new_comps, final_form=False):
-        result = fallback_sequence, fallback_sequence
+    if is_valid is not None and key.isalpha() and \
+            not is_valid(new_comps, final_form=False):
+        result = fallback_sequence, fallback_sequence, _Branch.FALLBACK, \
+            comps, None
     else:
-        result = utils.join(new_comps), fallback_sequence
+        result = utils.join(new_comps), fallback_sequence, branch, \
+            comps, new_comps
 
     return result
 
 
+def process_key_delta(string, key,
+                      fallback_sequence="", rules=None,
+                      skip_non_vietnamese=True):
+    """Process a keystroke and return the smallest edit to apply.
+
+    Takes the same arguments as process_key() and returns a KeyDelta
+    (backspaces, insert, string, fallback_sequence): a frontend that
+    deletes `backspaces` characters from the end of `string` and then
+    types `insert` ends up with the new string. The last two items are
+    the same as the return value of process_key().
+
+    >>> process_key_delta('tuyen', 'e', 'tuyen')
+    KeyDelta(backspaces=2, insert='ên', string='tuyên', fallback_sequence='tuyene')
+    """
+    if rules is None:
+        rules = get_telex_definition()
+
+    return _make_delta(_process_key(string, key, fallback_sequence, rules,
+                                    skip_non_vietnamese))
+
+
+def _make_delta(result):
+    """Build the KeyDelta of a _process_key() result."""
+    new_string, fallback_sequence, _, comps, new_comps = result
+
+    if new_comps is None:
+        new_comps = utils.separate(new_string)
+
+    backspaces, insert = _comps_delta(comps, new_comps)
+    return KeyDelta(backspaces, insert, new_string, fallback_sequence)
+
+
+def _comps_delta(comps, new_comps):
+    """
+    Return (backspaces, insert) turning the string of `comps` into the
+    string of `new_comps`. Leading components that did not change are
+    skipped as a whole, the rest is compared character by character.
+    """
+    kept = 0
+    i = 0
+    while i < 3 and comps[i] == new_comps[i]:
+        kept += len(comps[i])
+        i += 1
+
+    old_tail = utils.join(comps[i:])
+    new_tail = utils.join(new_comps[i:])
+    common = 0
+    limit = min(len(old_tail), len(new_tail))
+    while common < limit and old_tail[common] == new_tail[common]:
+        common += 1
+
+    return len(old_tail) - common, new_tail[common:]
+
+
 def _get_transformation_list(key, im, fallback_sequence):
     """
     Return the list of transformations inferred from the entered key. The
@@ -329,6 +665,20 @@ def _get_transformation_list(key, im, fallback_sequence):
         return ['+' + key]
 
 
+def _get_branch(trans):
+    """
+    Return the _Branch of a keystroke whose first transformation `trans`
+    changed the string. The ư/ơ shorthands count as marks.
+    """
+    if trans[0] == '+':
+        return _Branch.APPEND
+    if trans[0] == '_':
+        return _Branch.UNDO
+    if trans[0] == '<' or len(trans) == 2:
+        return _Branch.MARK
+    return _Branch.ACCENT
+
+
 def _get_action(trans):
     """
     Return the action inferred from the transformation `trans`.
@@ -483,8 +833,8 @@ def _can_undo(comps, trans_list):
         """
         return (action[0] == _Action.ADD_ACCENT and action[1] in accent_list) \
                 or (action[0] == _Action.ADD_MARK and action[1] in mark_list) \
-                or (action[0] == _Action.ADD_CHAR and action[1] == \
-                    accent.remove_accent_char(comps[1][-1]))  # ơ, ư
+                or (action[0] == _Action.ADD_CHAR and comps[1] and \
+                    action[1] == accent.remove_accent_char(comps[1][-1]))  # ơ, ư
 
     return any(map(atomic_check, action_list))
 
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of ibus-bogo project.
+#
+# Copyright (C) 2012 Long T. Dam <longdt90@gmail.com>
+# Copyright (C) 2012-2013 Trung Ngo <ndtrung4419@gmail.com>
+# Copyright (C) 2013 Duong H. Nguyen <cmpitg@gmail.com>
+#
+# ibus-bogo is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ibus-bogo is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ibus-bogo.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+"""
+Cheap detection of Vietnamese text, for routing documents.
+
+score_text() looks at a bounded sample of words spread over the text,
+so its cost does not grow with the text's length:
+
+>>> score_text('Tiếng Việt là ngôn ngữ của người Việt.')
+TextScore(language='vietnamese', confidence=1.0, syllables=1.0,
+          accents=0.2..., words=8)
+>>> score_text('Tieng Viet la ngon ngu cua nguoi Viet.').language
+'vietnamese-unaccented'
+>>> score_text('The quick brown fox jumps over the lazy dog.').language
+'other'
+
+Two measures are taken on the sample: the share of words that are
+Vietnamese syllables, with or without their diacritics, and the share
+of letters that only Vietnamese uses (ă, ơ, ư, đ, ĩ, ũ and the letters
+with a hook or dot below...). The first one decides whether the text is
+Vietnamese, the second one whether it carries diacritics.
+"""
+
+from __future__ import unicode_literals
+import collections
+import re
+from bogo import utils
+from bogo.restoration import fold, _default_vocabulary
+
+
+VIETNAMESE = 'vietnamese'
+UNACCENTED = 'vietnamese-unaccented'
+OTHER = 'other'
+
+TextScore = collections.namedtuple(
+    'TextScore', ['language', 'confidence', 'syllables', 'accents', 'words'])
+
+_WORD = re.compile(r"[^\W\d_]+", re.UNICODE)
+
+# Share of syllables from which the text counts as Vietnamese, and the
+# range over which the confidence goes from 0 to 1.
+_SYLLABLE_FLOOR = 0.3
+_SYLLABLE_CEILING = 0.9
+# Share of Vietnamese-only letters from which the text counts as having
+# diacritics. Text with diacritics has about 20%.
+_ACCENT_THRESHOLD = 0.02
+
+_WINDOWS = 16
+_CHARS_PER_WORD = 8
+
+_syllables = None
+
+
+def _syllable_table():
+    # Every syllable of the strict validation profile, lowercase, with
+    # and without its diacritics.
+    global _syllables
+    if _syllables is None:
+        syllables = set(_default_vocabulary())
+        syllables.update([fold(syllable) for syllable in syllables])
+        _syllables = frozenset(syllables)
+    return _syllables
+
+
+# Deletes the letters that are not in Latin-1, i.e. that French, Spanish
+# and the like do not use.
+_SPECIFIC = dict((ord(char), None) for char in
+                 set(utils.VOWELS + utils.VOWELS.upper() + 'đĐ')
+                 if ord(char) > 0xFF)
+
+
+def _sample(text, sample):
+    # Words from _WINDOWS windows spread evenly over the text, leaving
+    # out the words cut by the edges of a window.
+    length = len(text)
+    window = max(sample // _WINDOWS, 1) * _CHARS_PER_WORD
+    words = []
+    for index in range(_WINDOWS):
+        start = index * (length - window) // (_WINDOWS - 1)
+        end = start + window
+        found = _WORD.findall(text, start, end)
+        if start > 0 and found and text[start].isalpha():
+            del found[0]
+        if end < length and found and text[end - 1].isalpha():
+            del found[-1]
+        words.extend(found)
+    return words[:sample]
+
+
+def score_text(text, sample=1000, exact=False):
+    """
+    Tell whether `text` is Vietnamese, Vietnamese without diacritics or
+    something else. Returns a TextScore:
+
+        language    VIETNAMESE, UNACCENTED or OTHER
+        confidence  from 0 to 1, how sure the guess is
+        syllables   the share of words that are Vietnamese syllables
+        accents     the share of letters that only Vietnamese uses
+        words       the number of words looked at
+
+    At most about `sample` words are looked at, unless `exact` is true
+    or the text is short, in which case every word is.
+    """
+    if exact or len(text) <= sample * _CHARS_PER_WORD * 2:
+        words = _WORD.findall(text.lower())
+    else:
+        words = [word.lower() for word in _sample(text, sample)]
+    if not words:
+        return TextScore(OTHER, 0.0, 0.0, 0.0, 0)
+
+    valid = sum(map(_syllable_table().__contains__, words))
+    syllables = valid / float(len(words))
+
+    letters = "".join(words)
+    accents = (len(letters) - len(letters.translate(_SPECIFIC))) / \
+        float(len(letters))
+
+    score = (syllables - _SYLLABLE_FLOOR) / \
+        (_SYLLABLE_CEILING - _SYLLABLE_FLOOR)
+    score = min(max(score, 0.0), 1.0)
+    if score < 0.5:
+        return TextScore(OTHER, 1.0 - score, syllables, accents, len(words))
+    language = VIETNAMESE if accents >= _ACCENT_THRESHOLD else UNACCENTED
+    return TextScore(language, score, syllables, accents, len(words))
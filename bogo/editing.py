@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of ibus-bogo project.
+#
+# Copyright (C) 2012 Long T. Dam <longdt90@gmail.com>
+# Copyright (C) 2012-2013 Trung Ngo <ndtrung4419@gmail.com>
+# Copyright (C) 2013 Duong H. Nguyen <cmpitg@gmail.com>
+#
+# ibus-bogo is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ibus-bogo is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ibus-bogo.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+"""
+Cursor-aware editing of a raw key buffer.
+
+handle_backspace() only knows how to delete the last character. An
+EditBuffer instead accepts an insertion or deletion anywhere in the raw
+keys and reconverts only the words touched by it:
+
+>>> buf = EditBuffer('con meo ddieen')
+>>> buf.edit(7, 7, 'f')
+'con mèo điên'
+>>> buf.raw
+'con meof ddieen'
+"""
+
+from __future__ import unicode_literals
+from bogo import core
+
+
+class EditBuffer(object):
+    """
+    A raw key sequence split into words and separators, each word kept
+    together with its converted form.
+
+    Positions given to edit() and edit_many() are offsets into `raw`.
+    """
+
+    def __init__(self, raw="", rules=None, skip_non_vietnamese=True):
+        if rules is None:
+            rules = core.get_telex_definition()
+        self.rules = rules
+        self.skip_non_vietnamese = skip_non_vietnamese
+        self.accepted_chars = core._accepted_chars(rules)
+        self._raw = []
+        self._converted = []
+        self._replace(0, 0, raw)
+
+    @property
+    def raw(self):
+        return "".join(self._raw)
+
+    @property
+    def text(self):
+        return "".join(self._converted)
+
+    def _tokenize(self, raw):
+        tokens = []
+        word = []
+        for key in raw:
+            if key in self.accepted_chars:
+                word.append(key)
+            else:
+                if word:
+                    tokens.append("".join(word))
+                    word = []
+                tokens.append(key)
+        if word:
+            tokens.append("".join(word))
+        return tokens
+
+    def _convert(self, token):
+        if token[0] in self.accepted_chars:
+            return core.process_sequence(token, self.rules,
+                                         self.skip_non_vietnamese)
+        return token
+
+    def _replace(self, first, last, raw):
+        # Replace the tokens first..last - 1 with the tokens of `raw`.
+        tokens = self._tokenize(raw)
+        self._raw[first:last] = tokens
+        self._converted[first:last] = [self._convert(t) for t in tokens]
+
+    def _span(self, start, end):
+        """
+        Return (first, last, offset): the tokens first..last - 1 cover the
+        raw range [start, end] and any word touching it, offset is the
+        raw position of token `first`.
+        """
+        first = last = None
+        offset = position = 0
+        for index, token in enumerate(self._raw):
+            token_end = position + len(token)
+            if first is None and token_end >= start:
+                first, offset = index, position
+            if position > end:
+                break
+            last = index + 1
+            position = token_end
+        if first is None:
+            first, offset = len(self._raw), position
+        return first, max(first, last or 0), offset
+
+    def edit(self, start, end, insert=""):
+        """
+        Replace raw[start:end] with the keys in `insert` and return the
+        new converted text. Use start == end to insert and an empty
+        `insert` to delete.
+        """
+        return self.edit_many([(start, end, insert)])
+
+    def edit_many(self, edits):
+        """
+        Apply several (start, end, insert) edits at once, e.g. deleting a
+        selection and typing over it, and reconvert the affected words
+        only once. Positions refer to the buffer before any of the edits
+        and ranges must not overlap. Insertions at the same position are
+        made in the given order.
+        """
+        # A stable sort on the positions only keeps that order.
+        edits = sorted(edits, key=lambda edit: edit[:2])
+        length = sum(map(len, self._raw))
+        for i, (start, end, _) in enumerate(edits):
+            if not 0 <= start <= end <= length:
+                raise ValueError("Edit range out of bounds: %d-%d" %
+                                 (start, end))
+            if i and start < edits[i - 1][1]:
+                raise ValueError("Overlapping edits")
+
+        # Group the edits by the tokens they touch so that words between
+        # two distant edits are left alone, then rebuild each group from
+        # right to left to keep the token indices of the others valid.
+        # Groups that merely touch are merged too: two insertions into an
+        # empty span would otherwise make two words of what is one.
+        groups = []
+        for start, end, insert in edits:
+            first, last, offset = self._span(start, end)
+            if groups and first <= groups[-1][1]:
+                group = groups[-1]
+                group[1] = max(group[1], last)
+                group[3].append((start, end, insert))
+            else:
+                groups.append([first, last, offset, [(start, end, insert)]])
+
+        for first, last, offset, group_edits in reversed(groups):
+            region = "".join(self._raw[first:last])
+            for start, end, insert in reversed(group_edits):
+                region = region[:start - offset] + insert + \
+                    region[end - offset:]
+            self._replace(first, last, region)
+
+        return self.text
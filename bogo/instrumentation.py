@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of ibus-bogo project.
+#
+# Copyright (C) 2012 Long T. Dam <longdt90@gmail.com>
+# Copyright (C) 2012-2013 Trung Ngo <ndtrung4419@gmail.com>
+# Copyright (C) 2013 Duong H. Nguyen <cmpitg@gmail.com>
+#
+# ibus-bogo is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ibus-bogo is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ibus-bogo.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+"""
+In-process profiling of the conversion engine.
+
+>>> with bogo.profiling() as stats:
+...     bogo.process_sequence('con meof ddieen')
+>>> print(stats.report())
+
+Probes are installed by temporarily replacing the engine's module-level
+functions with timed wrappers and are removed again when the `with`
+block exits. When profiling is off the engine runs its original
+functions, so there is no overhead at all.
+
+The probes are process-wide, so do not profile from several threads
+at once.
+"""
+
+from __future__ import unicode_literals
+import contextlib
+import time
+from bogo import core, utils
+
+
+try:
+    _now = time.perf_counter_ns
+except AttributeError:
+    def _now():
+        return int(time.time() * 1e9)
+
+
+# (module, attribute, stage name). process_key is the keystroke boundary,
+# the other stages are called from inside it.
+_PROBES = [
+    (core, '_process_key', 'process_key'),
+    (utils, 'separate', 'separate'),
+    (core, '_get_transformation_list', '_get_transformation_list'),
+    (core, '_transform', '_transform'),
+    (core, '_can_undo', '_can_undo'),
+    (core, 'is_valid_combination', 'is_valid_combination'),
+]
+
+STAGES = [stage for _, _, stage in _PROBES]
+
+
+class ProfileStats(object):
+    """
+    Call counts and accumulated wall time (in nanoseconds) for each
+    engine stage, as collected by profiling().
+    """
+
+    def __init__(self):
+        self.calls = dict.fromkeys(STAGES, 0)
+        self.total_ns = dict.fromkeys(STAGES, 0)
+
+    @property
+    def keystrokes(self):
+        return self.calls['process_key']
+
+    def mean_ns(self, stage):
+        """Return the mean time of one call to `stage`, or 0."""
+        if not self.calls[stage]:
+            return 0
+        return self.total_ns[stage] / float(self.calls[stage])
+
+    def per_keystroke_ns(self, stage='process_key'):
+        """
+        Return the time spent in `stage` divided by the number of
+        keystrokes processed, or 0.
+        """
+        if not self.keystrokes:
+            return 0
+        return self.total_ns[stage] / float(self.keystrokes)
+
+    def report(self):
+        """Return a human readable table of the collected numbers."""
+        lines = ["%-26s %10s %14s %12s %14s" %
+                 ("stage", "calls", "total (ns)", "mean (ns)",
+                  "per key (ns)")]
+        for stage in STAGES:
+            lines.append("%-26s %10d %14d %12.0f %14.0f" %
+                         (stage, self.calls[stage], self.total_ns[stage],
+                          self.mean_ns(stage), self.per_keystroke_ns(stage)))
+        return "\n".join(lines)
+
+    def __str__(self):
+        return self.report()
+
+
+def _probe(func, calls, totals, stage):
+    # Recursive calls (e.g. _get_transformation_list() resolving an undo
+    # rule) are only counted once so that their time is not added twice.
+    depth = [0]
+
+    def wrapper(*args, **kwargs):
+        if depth[0]:
+            return func(*args, **kwargs)
+        depth[0] += 1
+        start = _now()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            totals[stage] += _now() - start
+            calls[stage] += 1
+            depth[0] -= 1
+
+    wrapper.__wrapped__ = func
+    return wrapper
+
+
+@contextlib.contextmanager
+def _patched(replacements):
+    """
+    Set each (module, attribute, value) in `replacements` for the
+    duration of the `with` block, restoring the original values after.
+    """
+    originals = []
+    try:
+        for module, name, value in replacements:
+            originals.append((module, name, getattr(module, name)))
+            setattr(module, name, value)
+        yield
+    finally:
+        for module, name, value in reversed(originals):
+            setattr(module, name, value)
+
+
+@contextlib.contextmanager
+def profiling():
+    """
+    Context manager that counts and times every engine stage while
+    active. Yields a ProfileStats object that is filled in as the
+    engine runs.
+
+    >>> with profiling() as stats:
+    ...     process_sequence('meof')
+    >>> stats.keystrokes
+    4
+    """
+    stats = ProfileStats()
+    probes = [(module, name,
+               _probe(getattr(module, name), stats.calls, stats.total_ns,
+                      stage))
+              for module, name, stage in _PROBES]
+
+    with _patched(probes):
+        yield stats
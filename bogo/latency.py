@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of ibus-bogo project.
+#
+# Copyright (C) 2012 Long T. Dam <longdt90@gmail.com>
+# Copyright (C) 2012-2013 Trung Ngo <ndtrung4419@gmail.com>
+# Copyright (C) 2013 Duong H. Nguyen <cmpitg@gmail.com>
+#
+# ibus-bogo is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ibus-bogo is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ibus-bogo.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+"""
+Per-keystroke latency recording for interactive use.
+
+For an input method the worst keystroke matters more than the average
+one, so latencies are kept in a fixed-size log-linear histogram (in
+the spirit of HdrHistogram) from which percentiles can be read:
+
+>>> with bogo.latency_tracking() as tracker:
+...     bogo.process_sequence('con meof ddieen')
+>>> tracker.histogram.p99
+>>> tracker.by_branch['accent'].max
+>>> tracker.slowest[0]
+
+Like bogo.profiling(), tracking hooks the engine only while active.
+"""
+
+from __future__ import unicode_literals
+import collections
+import contextlib
+import heapq
+from array import array
+from bogo import core
+from bogo.instrumentation import _now, _patched
+
+
+class LatencyHistogram(object):
+    """
+    Histogram of non-negative integer values (nanoseconds) with bounded
+    relative error and constant memory.
+
+    Values below 2 ** significant_bits are recorded exactly. Above that,
+    each power of two is split into 2 ** (significant_bits - 1) equal
+    buckets, so a reported value is never more than
+    1 / 2 ** (significant_bits - 1) above the real one. Values of
+    2 ** max_bits and more are clamped into the last bucket, though
+    `max` is always exact.
+    """
+
+    def __init__(self, significant_bits=6, max_bits=36):
+        self.significant_bits = significant_bits
+        self.max_bits = max_bits
+        self._half = 1 << (significant_bits - 1)
+        self._limit = (1 << max_bits) - 1
+        self._counts = array('L', [0]) * self._index(self._limit) + \
+            array('L', [0])
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def _index(self, value):
+        magnitude = value.bit_length() - self.significant_bits
+        if magnitude <= 0:
+            return value
+        return magnitude * self._half + (value >> magnitude)
+
+    def _highest_equivalent(self, index):
+        if index < 2 * self._half:
+            return index
+        magnitude = (index >> (self.significant_bits - 1)) - 1
+        sub_bucket = index - magnitude * self._half
+        return ((sub_bucket + 1) << magnitude) - 1
+
+    def record(self, value):
+        self._counts[self._index(min(value, self._limit))] += 1
+        self.count += 1
+        self.total += value
+        if self.max is None or value > self.max:
+            self.max = value
+        if self.min is None or value < self.min:
+            self.min = value
+
+    def merge(self, other):
+        """Add all values recorded by `other`, a histogram of same shape."""
+        if (other.significant_bits, other.max_bits) != \
+                (self.significant_bits, self.max_bits):
+            raise ValueError("Cannot merge histograms of different shapes")
+        for index, n in enumerate(other._counts):
+            if n:
+                self._counts[index] += n
+        self.count += other.count
+        self.total += other.total
+        for value in (other.min, other.max):
+            if value is not None:
+                self.max = value if self.max is None else max(self.max, value)
+                self.min = value if self.min is None else min(self.min, value)
+
+    def percentile(self, percent):
+        """
+        Return the value below or at which `percent` percent of the
+        recorded values fall, or 0 if nothing was recorded.
+        """
+        if not self.count:
+            return 0
+        rank = max(1, int(round(self.count * percent / 100.0)))
+        seen = 0
+        last = len(self._counts) - 1
+        for index, n in enumerate(self._counts):
+            seen += n
+            if seen >= rank:
+                if index == last:
+                    return self.max
+                return min(self._highest_equivalent(index), self.max)
+        return self.max
+
+    @property
+    def mean(self):
+        return self.total / float(self.count) if self.count else 0
+
+    @property
+    def p50(self):
+        return self.percentile(50)
+
+    @property
+    def p90(self):
+        return self.percentile(90)
+
+    @property
+    def p99(self):
+        return self.percentile(99)
+
+    def summary(self):
+        """Return a dict of the usual numbers."""
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            'p50': self.p50,
+            'p90': self.p90,
+            'p99': self.p99,
+            'max': self.max or 0,
+        }
+
+
+KeystrokeSample = collections.namedtuple(
+    'KeystrokeSample',
+    ['latency_ns', 'branch', 'string', 'key', 'fallback_sequence'])
+
+
+class LatencyTracker(object):
+    """
+    Per-keystroke latencies collected by latency_tracking().
+
+    Attributes:
+        histogram: LatencyHistogram of all keystrokes.
+        by_branch: a LatencyHistogram for each core._Branch value.
+        slowest: the `keep_slowest` slowest KeystrokeSamples, slowest
+            first.
+    """
+
+    def __init__(self, keep_slowest=10, **histogram_args):
+        self.histogram = LatencyHistogram(**histogram_args)
+        self.by_branch = collections.defaultdict(
+            lambda: LatencyHistogram(**histogram_args))
+        self.keep_slowest = keep_slowest
+        self._slowest = []
+
+    def record(self, latency, branch, string="", key="",
+               fallback_sequence=""):
+        self.histogram.record(latency)
+        self.by_branch[branch].record(latency)
+        if self.keep_slowest:
+            sample = KeystrokeSample(latency, branch, string, key,
+                                     fallback_sequence)
+            if len(self._slowest) < self.keep_slowest:
+                heapq.heappush(self._slowest, sample)
+            elif latency > self._slowest[0].latency_ns:
+                heapq.heapreplace(self._slowest, sample)
+
+    @property
+    def slowest(self):
+        return sorted(self._slowest, reverse=True)
+
+    def report(self):
+        """Return a human readable table of latencies per branch."""
+        lines = ["%-10s %8s %10s %10s %10s %10s" %
+                 ("branch", "count", "p50 (ns)", "p90 (ns)", "p99 (ns)",
+                  "max (ns)")]
+        rows = [("all", self.histogram)] + sorted(self.by_branch.items())
+        for name, histogram in rows:
+            s = histogram.summary()
+            lines.append("%-10s %8d %10d %10d %10d %10d" %
+                         (name, s['count'], s['p50'], s['p90'], s['p99'],
+                          s['max']))
+        return "\n".join(lines)
+
+
+def _timed_process_key(func, tracker):
+    def wrapper(string, key, fallback_sequence, rules, skip_non_vietnamese):
+        start = _now()
+        result = func(string, key, fallback_sequence, rules,
+                      skip_non_vietnamese)
+        tracker.record(_now() - start, result[2], string, key,
+                       fallback_sequence)
+        return result
+
+    wrapper.__wrapped__ = func
+    return wrapper
+
+
+@contextlib.contextmanager
+def latency_tracking(tracker=None):
+    """
+    Context manager that records the latency and branch of every
+    keystroke processed while active. Yields a LatencyTracker, or
+    fills in `tracker` if given, so that one tracker can accumulate
+    over several sessions.
+    """
+    if tracker is None:
+        tracker = LatencyTracker()
+
+    with _patched([(core, '_process_key',
+                    _timed_process_key(core._process_key, tracker))]):
+        yield tracker
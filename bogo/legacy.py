@@ -0,0 +1,387 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of ibus-bogo project.
+#
+# Copyright (C) 2012 Long T. Dam <longdt90@gmail.com>
+# Copyright (C) 2012-2013 Trung Ngo <ndtrung4419@gmail.com>
+# Copyright (C) 2013 Duong H. Nguyen <cmpitg@gmail.com>
+#
+# ibus-bogo is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ibus-bogo is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ibus-bogo.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+"""
+Conversion between Unicode and the legacy Vietnamese encodings:
+
+    tcvn3   TCVN 5712:1993 VN3, the "ABC" fonts (.VnTime...). One byte
+            per letter. Toned capitals do not exist, they were typed
+            with a separate capitals-only font.
+    vni     VNI-Windows. A base letter followed by a byte for its mark
+            and tone, both taken from Latin-1 ('Vieät' for 'Việt').
+    viqr    RFC 1456, plain ASCII with the diacritics spelled out after
+            the letter ('Vie^.t', 'ddi'). A backslash keeps the next
+            character literal ('So^\\.', 'a\\dd').
+
+>>> legacy.decode(b'Vi\\xd6t Nam', 'tcvn3')
+'Việt Nam'
+>>> legacy.encode('Việt Nam', 'vni')
+b'Vie\\xe4t Nam'
+
+Every conversion is a handful of table-driven calls into C (charmap
+codecs, str.translate(), Unicode normalization, one regular expression
+for VIQR), applied to large chunks at a time. iter_decode() and
+iter_encode() convert streams chunk by chunk, decode_file() and
+encode_file() whole files, reading legacy files through mmap.
+
+Or from the command line:
+
+    python -m bogo.legacy [--encode] ENCODING INPUT OUTPUT
+"""
+
+from __future__ import unicode_literals, print_function
+import codecs
+import io
+import mmap
+import re
+import sys
+import unicodedata
+from bogo import accent, mark, utils
+from bogo.accent import Accent
+from bogo.mark import Mark
+
+
+ENCODINGS = ('tcvn3', 'vni', 'viqr')
+
+_LETTERS = utils.VOWELS + utils.VOWELS.upper() + 'đĐ'
+
+_COMBINING_TONES = {
+    Accent.GRAVE: '̀',
+    Accent.ACUTE: '́',
+    Accent.TIDLE: '̃',
+    Accent.HOOK: '̉',
+    Accent.DOT: '̣',
+}
+_COMBINING_MARKS = {
+    Mark.HAT: '̂',
+    Mark.BREVE: '̆',
+}
+
+
+def _nfc(text):
+    return unicodedata.normalize('NFC', text)
+
+
+def _components(char):
+    # 'Ấ' -> ('A', Mark.HAT, Accent.ACUTE)
+    return (mark.strip(char), mark.get_mark_char(char),
+            accent.get_accent_char(char))
+
+
+# TCVN3
+
+_TCVN3_LETTERS = {
+    0xA1: 'Ă', 0xA2: 'Â', 0xA3: 'Ê', 0xA4: 'Ô', 0xA5: 'Ơ', 0xA6: 'Ư',
+    0xA7: 'Đ', 0xA8: 'ă', 0xA9: 'â', 0xAA: 'ê', 0xAB: 'ô', 0xAC: 'ơ',
+    0xAD: 'ư', 0xAE: 'đ',
+}
+_TCVN3_LETTERS.update(zip(
+    [0xB5, 0xB6, 0xB7, 0xB8, 0xB9,
+     0xBB, 0xBC, 0xBD, 0xBE, 0xC6,
+     0xC7, 0xC8, 0xC9, 0xCA, 0xCB,
+     0xCC, 0xCE, 0xCF, 0xD0, 0xD1,
+     0xD2, 0xD3, 0xD4, 0xD5, 0xD6,
+     0xD7, 0xD8, 0xDC, 0xDD, 0xDE,
+     0xDF, 0xE1, 0xE2, 0xE3, 0xE4,
+     0xE5, 0xE6, 0xE7, 0xE8, 0xE9,
+     0xEA, 0xEB, 0xEC, 0xED, 0xEE,
+     0xEF, 0xF1, 0xF2, 0xF3, 0xF4,
+     0xF5, 0xF6, 0xF7, 0xF8, 0xF9,
+     0xFA, 0xFB, 0xFC, 0xFD, 0xFE],
+    'àảãáạ' 'ằẳẵắặ' 'ầẩẫấậ' 'èẻẽéẹ' 'ềểễếệ' 'ìỉĩíị' 'òỏõóọ' 'ồổỗốộ'
+    'ờởỡớợ' 'ùủũúụ' 'ừửữứự' 'ỳỷỹýỵ'))
+
+
+def _tcvn3_table():
+    # Bytes that are not letters keep their Latin-1 meaning, unless that
+    # would be a Vietnamese letter TCVN3 puts elsewhere or cannot encode.
+    table = []
+    for byte in range(256):
+        char = _TCVN3_LETTERS.get(byte, "%c" % byte)
+        if byte >= 0x80 and byte not in _TCVN3_LETTERS and \
+                char in _LETTERS:
+            char = '\ufffe'
+        table.append(char)
+    return "".join(table)
+
+
+_TCVN3_DECODING = _tcvn3_table()
+_TCVN3_ENCODING = codecs.charmap_build(_TCVN3_DECODING)
+
+
+# VNI
+
+# Bytes (as Latin-1 characters) that stand for a letter on their own.
+_VNI_LETTERS = {
+    'ô': 'ơ', 'ö': 'ư', 'ñ': 'đ', 'í': 'í', 'ì': 'ì', 'æ': 'ỉ', 'ó': 'ĩ',
+    'ò': 'ị', 'î': 'ỵ',
+}
+# Bytes following a base letter, by (mark, tone).
+_VNI_MODIFIERS = {
+    (Mark.NONE, Accent.ACUTE): 'ù',
+    (Mark.NONE, Accent.GRAVE): 'ø',
+    (Mark.NONE, Accent.HOOK): 'û',
+    (Mark.NONE, Accent.TIDLE): 'õ',
+    (Mark.NONE, Accent.DOT): 'ï',
+    (Mark.HAT, Accent.NONE): 'â',
+    (Mark.HAT, Accent.ACUTE): 'á',
+    (Mark.HAT, Accent.GRAVE): 'à',
+    (Mark.HAT, Accent.HOOK): 'å',
+    (Mark.HAT, Accent.TIDLE): 'ã',
+    (Mark.HAT, Accent.DOT): 'ä',
+    (Mark.BREVE, Accent.NONE): 'ê',
+    (Mark.BREVE, Accent.ACUTE): 'é',
+    (Mark.BREVE, Accent.GRAVE): 'è',
+    (Mark.BREVE, Accent.HOOK): 'ú',
+    (Mark.BREVE, Accent.TIDLE): 'ü',
+    (Mark.BREVE, Accent.DOT): 'ë',
+}
+
+
+def _vni_tables():
+    # Decoding turns modifiers into combining characters and lets NFC
+    # put the letters together.
+    decoding = {}
+    for letter, char in _VNI_LETTERS.items():
+        decoding[ord(letter)] = char
+        decoding[ord(letter.upper())] = char.upper()
+    for (mark_, tone), modifier in _VNI_MODIFIERS.items():
+        combining = _COMBINING_MARKS.get(mark_, '') + \
+            _COMBINING_TONES.get(tone, '')
+        decoding[ord(modifier)] = decoding[ord(modifier.upper())] = \
+            combining
+
+    encoding = {}
+    standalone = dict((char, letter)
+                      for letter, char in _VNI_LETTERS.items())
+    for char in _LETTERS:
+        lower = char.lower()
+        if lower in standalone:
+            vni = standalone[lower]
+        else:
+            base, mark_, tone = _components(lower)
+            if mark_ == Mark.HORN:
+                base, mark_ = mark.add_mark_char(base, Mark.HORN), Mark.NONE
+                base = standalone[base]
+            vni = base + _VNI_MODIFIERS.get((mark_, tone), '')
+        if vni != lower:
+            encoding[ord(char)] = vni.upper() if char != lower else vni
+    return utils.dense_table(decoding), utils.dense_table(encoding)
+
+
+_VNI_DECODING, _VNI_ENCODING = _vni_tables()
+_VNI_MODIFIER_BYTES = frozenset(
+    (modifier + modifier.upper()).encode('latin-1')[i:i + 1]
+    for modifier in _VNI_MODIFIERS.values() for i in (0, 1))
+
+
+# VIQR
+
+_VIQR_MARKS = {Mark.BREVE: '(', Mark.HAT: '^', Mark.HORN: '+'}
+_VIQR_TONES = {
+    Accent.ACUTE: "'", Accent.GRAVE: '`', Accent.HOOK: '?',
+    Accent.TIDLE: '~', Accent.DOT: '.',
+}
+_VIQR_SPECIAL = "(^+'`?~.dD\\"
+
+
+def _viqr_tables():
+    encoding = {}
+    for char in _LETTERS:
+        base, mark_, tone = _components(char)
+        if mark_ == Mark.BAR:
+            viqr = base + base
+        else:
+            viqr = base + _VIQR_MARKS.get(mark_, '') + \
+                _VIQR_TONES.get(tone, '')
+        if viqr != char:
+            encoding[ord(char)] = viqr
+
+    decoding = dict((viqr, "%c" % code) for code, viqr in encoding.items())
+    decoding['Dd'] = 'Đ'
+    decoding['dD'] = 'đ'
+    for char in _VIQR_SPECIAL:
+        decoding['\\' + char] = char
+
+    tones = "[%s]" % re.escape("".join(_VIQR_TONES.values()))
+    pattern = "(?:[aA][(^]|[eE]\\^|[oO][+^]|[uU]\\+)%s?|" \
+        "[aAeEiIoOuUyY]%s|[dD][dD]|\\\\[%s]" % \
+        (tones, tones, re.escape(_VIQR_SPECIAL))
+    return decoding, re.compile(pattern), utils.dense_table(encoding)
+
+
+_VIQR_DECODING, _VIQR_PATTERN, _VIQR_ENCODING = _viqr_tables()
+
+# Where a backslash goes to keep the next character literal: before
+# diacritics following a vowel, before a 'd' that would start 'dd' and
+# before backslashes that would escape something.
+_VIQR_ESCAPE = re.compile(
+    "(?<=[%s])(?=[(^+'`?~.])|(?=[dD][dDđĐ])|(?=\\\\[%s])" %
+    (re.escape(utils.VOWELS + utils.VOWELS.upper()),
+     re.escape(_VIQR_SPECIAL)))
+# Whatever follows the last of these cannot complete a VIQR sequence.
+_VIQR_TAIL = re.compile("[%s%s]*\\Z" % (
+    re.escape(_VIQR_SPECIAL), re.escape('aAeEiIoOuUyY')))
+
+
+def _check_encoding(encoding):
+    if encoding not in ENCODINGS:
+        raise ValueError("Unknown encoding: %r (expected one of %s)" %
+                         (encoding, ", ".join(ENCODINGS)))
+
+
+def decode(data, encoding, errors='strict'):
+    """
+    Convert `data`, bytes in a legacy `encoding`, to Unicode text. VIQR
+    may also be given as text.
+    """
+    _check_encoding(encoding)
+    if encoding == 'tcvn3':
+        return codecs.charmap_decode(data, errors, _TCVN3_DECODING)[0]
+    if encoding == 'vni':
+        return _nfc(codecs.latin_1_decode(data)[0].translate(_VNI_DECODING))
+    if not isinstance(data, type("")):
+        data = codecs.latin_1_decode(data)[0]
+    return _VIQR_PATTERN.sub(lambda m: _VIQR_DECODING[m.group()], data)
+
+
+def encode(text, encoding, errors='strict'):
+    """
+    Convert Unicode `text` to bytes in a legacy `encoding`. `errors` is
+    used as in str.encode() for characters the encoding does not have,
+    e.g. toned capitals in TCVN3.
+    """
+    _check_encoding(encoding)
+    text = _nfc(text)
+    if encoding == 'tcvn3':
+        return codecs.charmap_encode(text, errors, _TCVN3_ENCODING)[0]
+    if encoding == 'vni':
+        return text.translate(_VNI_ENCODING).encode('latin-1', errors)
+    return _VIQR_ESCAPE.sub('\\\\', text).translate(_VIQR_ENCODING) \
+        .encode('ascii', errors)
+
+
+def _held_back_bytes(data, encoding):
+    # How many bytes at the end of a chunk may combine with the next one.
+    if encoding == 'tcvn3':
+        return 0
+    if encoding == 'vni':
+        # Only a letter and one modifier go together.
+        return 0 if data[-1:] in _VNI_MODIFIER_BYTES else 1
+    return len(_VIQR_TAIL.search(codecs.latin_1_decode(data)[0]).group())
+
+
+def iter_decode(chunks, encoding, errors='strict'):
+    """
+    Decode an iterable of byte chunks, yielding text chunks. Letters
+    split between two chunks are put back together.
+    """
+    _check_encoding(encoding)
+    pending = b""
+    for chunk in chunks:
+        data = pending + bytes(chunk)
+        held = _held_back_bytes(data, encoding)
+        if held == len(data):
+            pending = data
+            continue
+        pending = data[len(data) - held:]
+        yield decode(data[:len(data) - held], encoding, errors)
+    if pending:
+        yield decode(pending, encoding, errors)
+
+
+def iter_encode(chunks, encoding, errors='strict'):
+    """Encode an iterable of text chunks, yielding byte chunks."""
+    _check_encoding(encoding)
+    # The last character may still take combining marks or decide
+    # whether the one before it needs escaping in VIQR.
+    pending = ""
+    for chunk in chunks:
+        text = _nfc(pending + chunk)
+        if not text:
+            continue
+        pending = text[-1]
+        if encoding == 'viqr':
+            escaped = _VIQR_ESCAPE.sub('\\\\', text)[:-1]
+            yield escaped.translate(_VIQR_ENCODING).encode('ascii', errors)
+        else:
+            yield encode(text[:-1], encoding, errors)
+    if pending:
+        yield encode(pending, encoding, errors)
+
+
+def _mapped_chunks(path, chunk_size):
+    with open(path, 'rb') as f:
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped.
+            return
+        try:
+            for start in range(0, len(data), chunk_size):
+                yield data[start:start + chunk_size]
+        finally:
+            data.close()
+
+
+def decode_file(input_path, output_path, encoding, errors='strict',
+                chunk_size=1 << 20):
+    """Convert a file in a legacy `encoding` to UTF-8."""
+    with io.open(output_path, 'w', encoding='utf-8', newline='') as out:
+        for text in iter_decode(_mapped_chunks(input_path, chunk_size),
+                                encoding, errors):
+            out.write(text)
+
+
+def encode_file(input_path, output_path, encoding, errors='strict',
+                chunk_size=1 << 20):
+    """Convert a UTF-8 file to a legacy `encoding`."""
+    with io.open(input_path, 'r', encoding='utf-8', newline='') as f:
+        with open(output_path, 'wb') as out:
+            chunks = iter(lambda: f.read(chunk_size), '')
+            for data in iter_encode(chunks, encoding, errors):
+                out.write(data)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="python -m bogo.legacy",
+        description="Convert between legacy Vietnamese encodings and UTF-8.")
+    parser.add_argument('encoding', choices=ENCODINGS)
+    parser.add_argument('input')
+    parser.add_argument('output')
+    parser.add_argument('--encode', action='store_true',
+                        help="convert from UTF-8 to the legacy encoding")
+    parser.add_argument('--errors', default='strict',
+                        help="'strict' (default), 'replace' or 'ignore'")
+    args = parser.parse_args(argv)
+
+    convert = encode_file if args.encode else decode_file
+    convert(args.input, args.output, args.encoding, args.errors)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
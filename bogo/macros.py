@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of ibus-bogo project.
+#
+# Copyright (C) 2012 Long T. Dam <longdt90@gmail.com>
+# Copyright (C) 2012-2013 Trung Ngo <ndtrung4419@gmail.com>
+# Copyright (C) 2013 Duong H. Nguyen <cmpitg@gmail.com>
+#
+# ibus-bogo is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ibus-bogo is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ibus-bogo.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+"""
+Shortcut expansion (gõ tắt): words typed as a macro key are replaced by
+the macro's text when the word ends.
+
+>>> macros = MacroTable({'ko': 'không', 'vn': 'Việt Nam'})
+>>> bogo.process_sequence('ko phari vn', macros=macros)
+'không phải Việt Nam'
+
+Keys are matched against the keys typed for a word, ignoring case, and
+the expansion follows the case they were typed in ('Ko' -> 'Không', 'KO'
+-> 'KHÔNG'). Matching a whole word is one dict lookup. Sessions instead
+walk a trie key by key, so they know in constant time, at each key and
+at the end of the word, whether a macro is being typed.
+
+A table is never modified by its users, so one table can serve any
+number of sessions. Macro files have one "key : expansion" per line:
+
+    # comments and blank lines are ignored
+    ko : không
+    vn : Việt Nam
+"""
+
+from __future__ import unicode_literals
+import codecs
+from bogo import utils
+
+
+class MacroTable(object):
+    """
+    Macro keys and their expansions, with a trie of the keys.
+
+    Args:
+        macros (optional): a dict or an iterable of (key, expansion)
+            pairs.
+    """
+
+    # The trie state before any key.
+    ROOT = 0
+
+    def __init__(self, macros=()):
+        self._expansions = {}
+        # (state, key) -> state, and accepting state -> expansion.
+        self._edges = {}
+        self._accepting = {}
+        self._states = 1
+        if hasattr(macros, 'items'):
+            macros = macros.items()
+        for key, expansion in macros:
+            self.add(key, expansion)
+
+    def __len__(self):
+        return len(self._expansions)
+
+    def __contains__(self, key):
+        return key.lower() in self._expansions
+
+    def add(self, key, expansion):
+        key = key.lower()
+        if not key:
+            raise ValueError("Empty macro key")
+        state = self.ROOT
+        for char in key:
+            next_state = self._edges.get((state, char))
+            if next_state is None:
+                next_state = self._states
+                self._states += 1
+                self._edges[(state, char)] = next_state
+            state = next_state
+        self._accepting[state] = expansion
+        self._expansions[key] = expansion
+
+    def expand(self, word):
+        """
+        Return the expansion of `word`, in `word`'s case, or None if it
+        is not a macro key.
+        """
+        expansion = self._expansions.get(word.lower())
+        if expansion is None:
+            return None
+        return utils.apply_case(word, expansion)
+
+    def step(self, state, key):
+        """
+        Return the trie state after typing `key` in `state`, or None if
+        no macro key starts with the keys typed so far.
+        """
+        return self._edges.get((state, key.lower()))
+
+    def walk(self, keys, state=ROOT):
+        """Same as step() for each of `keys` in turn."""
+        for key in keys:
+            if state is None:
+                break
+            state = self.step(state, key)
+        return state
+
+    def expansion_at(self, state, word):
+        """
+        Return the expansion of the key ending at `state`, in the case of
+        `word`, the keys that led there. None if no key ends there.
+        """
+        expansion = self._accepting.get(state)
+        if expansion is None:
+            return None
+        return utils.apply_case(word, expansion)
+
+    @classmethod
+    def loads(cls, text):
+        """Parse the lines of a macro file."""
+        macros = []
+        for number, line in enumerate(text.splitlines(), 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            key, colon, expansion = line.partition(':')
+            if not colon or not key.strip():
+                raise ValueError("Bad macro on line %d: %r" %
+                                 (number, line))
+            macros.append((key.strip(), expansion.strip()))
+        return cls(macros)
+
+    @classmethod
+    def load(cls, path):
+        with codecs.open(path, 'r', 'utf-8') as f:
+            return cls.loads(f.read())
+
+    def dumps(self):
+        return "".join("%s : %s\n" % item
+                       for item in sorted(self._expansions.items()))
+
+    def save(self, path):
+        with codecs.open(path, 'w', 'utf-8') as f:
+            f.write(self.dumps())
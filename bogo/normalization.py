@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of ibus-bogo project.
+#
+# Copyright (C) 2012 Long T. Dam <longdt90@gmail.com>
+# Copyright (C) 2012-2013 Trung Ngo <ndtrung4419@gmail.com>
+# Copyright (C) 2013 Duong H. Nguyen <cmpitg@gmail.com>
+#
+# ibus-bogo is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ibus-bogo is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ibus-bogo.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+"""
+Normalization of the tone mark position in the open syllables ending in
+oa, oe and uy, which is written two ways:
+
+    old style: hòa, hòe, thủy
+    new style: hoà, hoè, thuỷ
+
+Syllables with a last consonant (hoàng, thuyền) and 'qu' syllables
+(quý) are written the same in both styles and left alone.
+
+>>> normalize_tone_placement('Hòa bình, thủy thủ', style='new')
+'Hoà bình, thuỷ thủ'
+
+Text is expected to be in NFC form.
+"""
+
+from __future__ import unicode_literals
+import itertools
+import re
+from bogo import accent, utils
+Accent = accent.Accent
+
+
+OLD = 'old'
+NEW = 'new'
+
+_PAIRS = [('o', 'a'), ('o', 'e'), ('u', 'y')]
+_ACCENTS = [Accent.GRAVE, Accent.ACUTE, Accent.HOOK, Accent.TIDLE,
+            Accent.DOT]
+
+
+def _case_variants(string):
+    return [''.join(chars) for chars in
+            itertools.product(*[(char, char.upper()) for char in string])]
+
+
+def _build_tables():
+    # Every spelling of every affected rhyme in the old style, mapped to
+    # the new style.
+    to_new = {}
+    for first, second in _PAIRS:
+        for akzent in _ACCENTS:
+            old = accent.add_accent_char(first, akzent) + second
+            new = first + accent.add_accent_char(second, akzent)
+            for old_variant, new_variant in zip(_case_variants(old),
+                                                _case_variants(new)):
+                to_new[old_variant] = new_variant
+    to_old = dict((new, old) for old, new in to_new.items())
+    return to_new, to_old
+
+
+def _compile(table):
+    # One pair of character classes per rhyme, e.g. [òóỏõọÒÓỎÕỌ][aA].
+    groups = {}
+    for key in table:
+        rhyme = accent.remove_accent_string(key.lower())
+        firsts, seconds = groups.setdefault(rhyme, (set(), set()))
+        firsts.add(key[0])
+        seconds.add(key[1])
+    alternatives = "|".join(
+        "[%s][%s]" % ("".join(sorted(firsts)), "".join(sorted(seconds)))
+        for _, (firsts, seconds) in sorted(groups.items()))
+
+    vowels = utils.VOWELS + utils.VOWELS.upper()
+    # Not after another vowel or a q, not before a letter.
+    return re.compile("(?<![%sqQ])(?:%s)(?!\\w)" % (vowels, alternatives),
+                      re.UNICODE)
+
+
+_TO_NEW, _TO_OLD = _build_tables()
+_TABLES = {
+    NEW: (_compile(_TO_NEW), _TO_NEW),
+    OLD: (_compile(_TO_OLD), _TO_OLD),
+}
+
+
+def _get_table(style):
+    try:
+        return _TABLES[style]
+    except KeyError:
+        raise ValueError("Unknown tone placement style: %r" % style)
+
+
+def normalize_tone_placement(text, style=NEW):
+    """
+    Return `text` with the tone marks of open oa, oe and uy syllables
+    placed in `style`, either 'old' (hòa) or 'new' (hoà).
+    """
+    pattern, table = _get_table(style)
+    return pattern.sub(lambda match: table[match.group()], text)
+
+
+def normalize_tone_placement_many(texts, style=NEW):
+    """
+    normalize_tone_placement() on each string of `texts`, returned as a
+    list. Strings that occur several times are only normalized once.
+    """
+    pattern, table = _get_table(style)
+
+    def replace(match):
+        return table[match.group()]
+
+    cache = {}
+    results = []
+    for text in texts:
+        try:
+            result = cache[text]
+        except KeyError:
+            result = cache[text] = pattern.sub(replace, text)
+        results.append(result)
+    return results
@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of ibus-bogo project.
+#
+# Copyright (C) 2012 Long T. Dam <longdt90@gmail.com>
+# Copyright (C) 2012-2013 Trung Ngo <ndtrung4419@gmail.com>
+# Copyright (C) 2013 Duong H. Nguyen <cmpitg@gmail.com>
+#
+# ibus-bogo is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ibus-bogo is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ibus-bogo.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+"""
+Record keystroke sessions and replay them as benchmarks.
+
+A recording is a text file with one event per line, fields separated
+by tabs:
+
+    k   <delay>   <key>       a keystroke
+    b   <delay>               a backspace
+    c   <delay>   <text>      a commit and the text that was committed
+
+<delay> is the number of microseconds since the previous event. Tabs,
+newlines, carriage returns and backslashes in <key> and <text> are
+backslash-escaped.
+Lines starting with # are comments.
+
+Record with SessionRecorder, then replay with:
+
+    python -m bogo.replay [--vni] recording.txt...
+"""
+
+from __future__ import unicode_literals, print_function
+import codecs
+import collections
+import sys
+import time
+from bogo import core
+from bogo.instrumentation import _now
+from bogo.latency import LatencyHistogram
+from bogo.session import Session
+
+
+KEY = 'k'
+BACKSPACE = 'b'
+COMMIT = 'c'
+
+Event = collections.namedtuple('Event', ['op', 'delay', 'arg'])
+
+_ESCAPES = [('\\', '\\\\'), ('\t', '\\t'), ('\n', '\\n'),
+            ('\r', '\\r')]
+
+
+def _escape(text):
+    for char, escaped in _ESCAPES:
+        text = text.replace(char, escaped)
+    return text
+
+
+def _unescape(text):
+    result = []
+    chars = iter(text)
+    for char in chars:
+        if char == '\\':
+            char = next(chars, '')
+            char = {'t': '\t', 'n': '\n', 'r': '\r'}.get(char, char)
+        result.append(char)
+    return ''.join(result)
+
+
+def dumps(events):
+    """Serialize a list of Events into the recording format."""
+    lines = []
+    for event in events:
+        if event.op == BACKSPACE:
+            lines.append("%s\t%d\n" % (event.op, event.delay))
+        else:
+            lines.append("%s\t%d\t%s\n" %
+                         (event.op, event.delay, _escape(event.arg)))
+    return ''.join(lines)
+
+
+def loads(text):
+    """Parse a recording into a list of Events."""
+    events = []
+    # Split on newlines only: splitlines() would also split on keys like
+    # '\x0b' or '\u2028'. A trailing '\r' can only come from a CRLF file
+    # since carriage returns in events are escaped.
+    for number, line in enumerate(text.split('\n'), 1):
+        line = line.rstrip('\r')
+        if not line or line.startswith('#'):
+            continue
+        fields = line.split('\t', 2)
+        if fields[0] not in (KEY, BACKSPACE, COMMIT) or len(fields) < 2:
+            raise ValueError("Bad recording event on line %d: %r" %
+                             (number, line))
+        arg = _unescape(fields[2]) if len(fields) > 2 else ""
+        if fields[0] == KEY and not arg:
+            raise ValueError("Bad recording event on line %d: %r" %
+                             (number, line))
+        events.append(Event(fields[0], int(fields[1]), arg))
+    return events
+
+
+def load(path):
+    with codecs.open(path, 'r', 'utf-8') as f:
+        return loads(f.read())
+
+
+def dump(events, path):
+    with codecs.open(path, 'w', 'utf-8') as f:
+        f.write(dumps(events))
+
+
+class SessionRecorder(object):
+    """
+    Wraps a Session and records every call made to it.
+
+    >>> recorder = SessionRecorder()
+    >>> for key in 'meof ':
+    ...     recorder.process_key(key)
+    >>> recorder.commit()
+    'mèo '
+    >>> dump(recorder.events, 'session.txt')
+    """
+
+    def __init__(self, session=None, clock=time.time):
+        self.session = session or Session()
+        self.events = []
+        self._clock = clock
+        self._last = None
+
+    def _record(self, op, arg=""):
+        now = self._clock()
+        delay = 0 if self._last is None else \
+            int(round((now - self._last) * 1e6))
+        self._last = now
+        self.events.append(Event(op, delay, arg))
+
+    def process_key(self, key):
+        self._record(KEY, key)
+        return self.session.process_key(key)
+
+    def backspace(self):
+        self._record(BACKSPACE)
+        return self.session.backspace()
+
+    def commit(self):
+        text = self.session.commit()
+        self._record(COMMIT, text)
+        return text
+
+
+Mismatch = collections.namedtuple('Mismatch',
+                                  ['event_index', 'expected', 'actual'])
+
+
+class ReplayResult(object):
+    """
+    Outcome of replay().
+
+    Attributes:
+        total_ns: time spent inside the engine for all events.
+        histogram: LatencyHistogram of key and backspace events.
+        commits: number of commit events checked.
+        mismatches: a Mismatch for every commit whose text differed
+            from the recorded one.
+    """
+
+    def __init__(self):
+        self.total_ns = 0
+        self.histogram = LatencyHistogram()
+        self.commits = 0
+        self.mismatches = []
+
+    @property
+    def ok(self):
+        return not self.mismatches
+
+    def report(self):
+        s = self.histogram.summary()
+        lines = [
+            "events:     %d" % s['count'],
+            "total:      %.3f ms" % (self.total_ns / 1e6),
+            "latency:    p50 %d ns, p90 %d ns, p99 %d ns, max %d ns" %
+            (s['p50'], s['p90'], s['p99'], s['max']),
+            "commits:    %d checked, %d mismatched" %
+            (self.commits, len(self.mismatches)),
+        ]
+        for m in self.mismatches:
+            lines.append("  event %d: expected %r, got %r" %
+                         (m.event_index, m.expected, m.actual))
+        return "\n".join(lines)
+
+
+def replay(events, rules=None, skip_non_vietnamese=True, result=None):
+    """
+    Run recorded events through a fresh Session as fast as possible.
+    Returns a ReplayResult, or adds to `result` if one is given.
+    """
+    session = Session(rules, skip_non_vietnamese)
+    if result is None:
+        result = ReplayResult()
+
+    for index, event in enumerate(events):
+        if event.op == COMMIT:
+            result.commits += 1
+            actual = session.commit()
+            if actual != event.arg:
+                result.mismatches.append(Mismatch(index, event.arg, actual))
+            continue
+
+        start = _now()
+        if event.op == KEY:
+            session.process_key(event.arg)
+        else:
+            session.backspace()
+        elapsed = _now() - start
+
+        result.total_ns += elapsed
+        result.histogram.record(elapsed)
+
+    return result
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="python -m bogo.replay",
+        description="Replay keystroke recordings and report timings.")
+    parser.add_argument('recordings', nargs='+')
+    parser.add_argument('--vni', action='store_true',
+                        help="use the VNI input method instead of TELEX")
+    parser.add_argument('--no-skip', action='store_true',
+                        help="do not skip non-Vietnamese words")
+    args = parser.parse_args(argv)
+
+    rules = core.get_vni_definition() if args.vni else None
+    result = ReplayResult()
+    for path in args.recordings:
+        replay(load(path), rules, not args.no_skip, result)
+
+    print(result.report())
+    return 0 if result.ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
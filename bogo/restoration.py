@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of ibus-bogo project.
+#
+# Copyright (C) 2012 Long T. Dam <longdt90@gmail.com>
+# Copyright (C) 2012-2013 Trung Ngo <ndtrung4419@gmail.com>
+# Copyright (C) 2013 Duong H. Nguyen <cmpitg@gmail.com>
+#
+# ibus-bogo is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ibus-bogo is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ibus-bogo.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+"""
+Restoration of the diacritics of text typed without them.
+
+Every syllable of the vocabulary is indexed under its folded form
+('viet' for 'việt', 'viết', 'viêt'...). A bigram model trained on
+accented text then picks the most likely sequence of candidates with a
+beam-pruned Viterbi search:
+
+>>> restorer = AccentRestorer()
+>>> restorer.train(corpus)
+>>> restorer.restore('Tieng Viet la ngon ngu cua nguoi Viet.')
+'Tiếng Việt là ngôn ngữ của người Việt.'
+
+Syllables are stored as bogo.codec codes, which keeps the model small.
+Words that already carry diacritics or cannot be Vietnamese syllables are
+kept as they are and start a new context, as does punctuation.
+"""
+
+from __future__ import unicode_literals
+import collections
+import heapq
+import math
+import re
+from bogo import codec, mark, utils
+from bogo.validation import PROFILES
+
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+_SPACES = re.compile(r"\s*$", re.UNICODE)
+
+# Context of the first syllable of a sentence, out of the codes' range.
+_START = codec.SYLLABLE_MASK
+
+# Stupid backoff, as in Brants et al., 2007.
+_BACKOFF = math.log(0.4)
+
+
+_FOLD = utils.char_table(mark.strip,
+                         utils.VOWELS + utils.VOWELS.upper() + 'đĐ')
+
+
+def fold(text):
+    """Remove all tones and marks from `text` ('Việt' -> 'Viet')."""
+    return text.translate(_FOLD)
+
+
+def _chains(text):
+    # Split the words of `text` into runs separated by spaces only.
+    chain = []
+    end = 0
+    for match in _WORD.finditer(text):
+        if chain and not _SPACES.match(text, end, match.start()):
+            yield chain
+            chain = []
+        chain.append(match)
+        end = match.end()
+    if chain:
+        yield chain
+
+
+def _default_vocabulary():
+    codec._load()
+    strict = PROFILES['strict']
+    return [syllable for syllable in codec._CODES
+            if strict.is_valid_string(syllable)]
+
+
+class AccentRestorer(object):
+    """
+    A syllable bigram model of accented text.
+
+    Args:
+        vocabulary (optional): the accented syllables to choose from.
+            Defaults to every syllable the 'strict' validation profile
+            accepts. Syllables seen by train() are added to it.
+        beam_width (optional): how many hypotheses to keep per syllable.
+    """
+
+    def __init__(self, vocabulary=None, beam_width=8):
+        if vocabulary is None:
+            vocabulary = _default_vocabulary()
+        self.beam_width = beam_width
+        self._index = collections.defaultdict(set)
+        self._unigrams = collections.Counter()
+        self._bigrams = collections.Counter()
+        self._candidates = None
+        self.add_vocabulary(vocabulary)
+
+    def add_vocabulary(self, syllables):
+        """Make `syllables` candidates for their folded forms."""
+        for syllable in syllables:
+            syllable = syllable.lower()
+            try:
+                code = codec.encode(syllable)
+            except ValueError:
+                continue
+            self._index[fold(syllable)].add(code)
+        self._candidates = None
+
+    def train(self, texts):
+        """
+        Count the syllables and syllable pairs of accented `texts`, a
+        string or an iterable of strings.
+        """
+        if isinstance(texts, type("")):
+            texts = [texts]
+        new_words = set()
+        for text in texts:
+            for chain in _chains(text):
+                previous = _START
+                for match in chain:
+                    word = match.group()
+                    try:
+                        code = codec.encode(word.lower())
+                    except ValueError:
+                        previous = _START
+                        continue
+                    new_words.add(word.lower())
+                    self._unigrams[code] += 1
+                    self._bigrams[previous << 16 | code] += 1
+                    previous = code
+        self.add_vocabulary(new_words)
+
+    def _prepare(self):
+        # Turn the counts into log probabilities.
+        unigrams = self._unigrams
+        total = sum(unigrams.values())
+        contexts = collections.Counter()
+        for key, count in self._bigrams.items():
+            contexts[key >> 16] += count
+        size = len(set(code for codes in self._index.values()
+                       for code in codes))
+
+        self._bigram_logp = dict(
+            (key, math.log(float(count) / contexts[key >> 16]))
+            for key, count in self._bigrams.items())
+
+        # Add-one smoothed unigrams, most likely first.
+        self._candidates = {}
+        for folded, codes in self._index.items():
+            self._candidates[folded] = sorted(
+                ((code, _BACKOFF + math.log(float(unigrams[code] + 1) /
+                                            (total + size)))
+                 for code in codes),
+                key=lambda candidate: (-candidate[1], candidate[0]))
+
+    def candidates(self, word):
+        """
+        Return the accented syllables `word` may stand for, the most
+        frequent first.
+        """
+        if self._candidates is None:
+            self._prepare()
+        return codec.decode_many(
+            code for code, _ in self._candidates.get(fold(word.lower()), []))
+
+    def restore(self, text):
+        """Return `text` with the diacritics of its syllables restored."""
+        if self._candidates is None:
+            self._prepare()
+
+        # (start, end, replacement) for every restored word, in order.
+        parts = []
+        for chain in _chains(text):
+            self._restore_chain(chain, parts)
+
+        result = []
+        position = 0
+        for start, stop, replacement in parts:
+            result.append(text[position:start])
+            result.append(replacement)
+            position = stop
+        result.append(text[position:])
+        return "".join(result)
+
+    def restore_many(self, texts):
+        return [self.restore(text) for text in texts]
+
+    def _restore_chain(self, chain, parts):
+        # Cut the chain at words that are not folded syllables of the
+        # vocabulary, and decode the runs in between.
+        run = []
+        for match in chain:
+            word = match.group()
+            if word == fold(word) and word.lower() in self._candidates:
+                run.append(match)
+            else:
+                self._decode(run, parts)
+                run = []
+        self._decode(run, parts)
+
+    def _decode(self, run, parts):
+        if not run:
+            return
+        candidates = self._candidates
+        bigram_logp = self._bigram_logp
+        beam_width = self.beam_width
+
+        # Each hypothesis is (score, code, history), history being a
+        # linked list of (code, previous history).
+        beam = [(0.0, _START, None)]
+        for match in run:
+            options = candidates[match.group().lower()]
+            best = {}
+            for score, previous, history in beam:
+                context = previous << 16
+                for code, unigram_logp in options:
+                    logp = bigram_logp.get(context | code)
+                    total = score + (unigram_logp if logp is None else logp)
+                    current = best.get(code)
+                    if current is None or total > current[0]:
+                        best[code] = (total, code, (code, history))
+            beam = heapq.nlargest(beam_width, best.values())
+
+        history = beam[0][2]
+        codes = []
+        while history is not None:
+            codes.append(history[0])
+            history = history[1]
+        codes.reverse()
+
+        for match, syllable in zip(run, codec.decode_many(codes)):
+            parts.append((match.start(), match.end(),
+                          utils.apply_case(match.group(), syllable)))
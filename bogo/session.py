@@ -0,0 +1,408 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of ibus-bogo project.
+#
+# Copyright (C) 2012 Long T. Dam <longdt90@gmail.com>
+# Copyright (C) 2012-2013 Trung Ngo <ndtrung4419@gmail.com>
+# Copyright (C) 2013 Duong H. Nguyen <cmpitg@gmail.com>
+#
+# ibus-bogo is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ibus-bogo is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ibus-bogo.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+"""
+A thin stateful wrapper around process_key() and handle_backspace() for
+input method frontends that would otherwise have to carry the converted
+string and the fallback sequence around themselves.
+
+>>> s = Session()
+>>> for key in 'con meof':
+...     s.process_key(key)
+>>> s.text
+'con mèo'
+>>> s.commit()
+'con mèo'
+
+The typing state can be moved to another process with dump_state() and
+load_state(), e.g. when a user is routed to another server mid-word:
+
+>>> data = s.dump_state()
+>>> other = Session()
+>>> other.load_state(data)
+"""
+
+from __future__ import unicode_literals
+from bogo import core, utils
+
+
+# dump_state() format: the magic byte, the version, then unsigned LEB128
+# varints and UTF-8 strings prefixed with their byte length as a varint.
+#
+#   flags               _STATE_* bits
+#   raw
+#   string              if _STATE_STRING, otherwise equal to raw
+#   keys                if _STATE_KEYS, otherwise equal to raw
+#   (no macro can match the keys if _STATE_NO_MACRO)
+#   number of finished words, then for each of them:
+#     flags             _STATE_STRING or 0
+#     raw, string (if _STATE_STRING), separator
+_STATE_MAGIC = 0xb6
+_STATE_VERSION = 1
+_STATE_DEAD = 1
+_STATE_STRING = 2
+_STATE_KEYS = 4
+_STATE_NO_MACRO = 8
+
+
+def _write_varint(out, value):
+    while value > 0x7f:
+        out.append(value & 0x7f | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _write_text(out, text):
+    data = text.encode('utf-8')
+    _write_varint(out, len(data))
+    out.extend(data)
+
+
+class _StateReader(object):
+
+    def __init__(self, data):
+        self.data = bytearray(data)
+        self.position = 0
+
+    def varint(self):
+        value = shift = 0
+        while True:
+            if self.position >= len(self.data):
+                raise ValueError("Truncated session state")
+            byte = self.data[self.position]
+            self.position += 1
+            value |= (byte & 0x7f) << shift
+            if byte < 0x80:
+                return value
+            shift += 7
+
+    def text(self):
+        length = self.varint()
+        end = self.position + length
+        if end > len(self.data):
+            raise ValueError("Truncated session state")
+        text = bytes(self.data[self.position:end]).decode('utf-8')
+        self.position = end
+        return text
+
+
+class Session(object):
+    """
+    Typing state of one input context.
+
+    Attributes:
+        string: the converted current word (the preedit).
+        raw: the keys typed for the current word, to be used as
+            fallback_sequence.
+        rules, skip_non_vietnamese: see process_key().
+        max_syllable_length: see process_sequence(). Once the current
+            word has more keys, they are appended without conversion.
+        cache: an optional TransitionCache to look keystrokes up in. Its
+            rules, skip_non_vietnamese and max_syllable_length settings
+            are used instead of the arguments.
+        macros: an optional bogo.macros.MacroTable. A word typed as one
+            of its keys is replaced by the expansion when it ends.
+
+    Keys outside of the rules' accepted characters (space, punctuation...)
+    end the current word, just like in process_sequence(). Finished words
+    are kept until commit() is called, so that backspacing over a
+    separator makes the word before it editable again.
+    """
+
+    def __init__(self, rules=None, skip_non_vietnamese=True, cache=None,
+                 macros=None, max_syllable_length=core.MAX_SYLLABLE_LENGTH):
+        if cache is not None:
+            rules = cache.rules
+            skip_non_vietnamese = cache.skip_non_vietnamese
+            max_syllable_length = cache.max_syllable_length
+        if rules is None:
+            rules = core.get_telex_definition()
+        self.cache = cache
+        self.macros = macros
+        self.rules = rules
+        if max_syllable_length is not None and max_syllable_length < 1:
+            raise ValueError("max_syllable_length must be at least 1")
+        self.skip_non_vietnamese = skip_non_vietnamese
+        self.max_syllable_length = max_syllable_length
+        self.accepted_chars = core._accepted_chars(rules)
+        self._consonant_prefixes = core._consonant_prefixes(
+            skip_non_vietnamese)
+        self._final_profile = core._final_form_profile(skip_non_vietnamese)
+        self.reset()
+
+    @property
+    def text(self):
+        """Everything typed since the last commit()."""
+        return "".join([string + separator
+                        for string, _, separator in self._done]) + \
+            self.string
+
+    def _dead_end_key(self, key):
+        """
+        Append `key` without asking the engine if the current word can no
+        longer become Vietnamese (see core._is_dead_end()). Return whether
+        the key was handled.
+        """
+        if self._dead and key in core._ASCII_LETTERS:
+            self.string += key
+            self.raw = self.string
+            return True
+        self._dead = False
+        return False
+
+    def _overlong_key(self, key):
+        """
+        Append `key` as it is if the current word already has
+        max_syllable_length keys. The word then reads as the keys typed.
+        Return whether the key was handled.
+        """
+        limit = self.max_syllable_length
+        if limit is None or len(self._keys) < limit:
+            return False
+        keys = self._keys + key
+        if len(keys) > 2 * limit:
+            # Move the beginning of the word out of the way, as a finished
+            # word without separator, so that a key costs the same however
+            # long the word gets. backspace() joins it back.
+            self._done.append((keys[:limit], keys[:limit], ""))
+            keys = keys[limit:]
+        self.string = self.raw = self._keys = keys
+        self._macro_state = None
+        self._dead = False
+        return True
+
+    def _update(self, result):
+        self.string, self.raw, branch = result[:3]
+        self._dead = branch == core._Branch.FALLBACK and \
+            core._is_dead_end(self.raw, self._consonant_prefixes)
+
+    def _restart_keys(self, keys=""):
+        # The keys of the current word as process_sequence() would see
+        # them, and their macro trie state, None once they cannot be a
+        # macro key.
+        self._keys = keys
+        self._macro_state = None if self.macros is None else \
+            self.macros.walk(keys)
+
+    def _track_key(self, key):
+        self._keys += key
+        if self._macro_state is not None:
+            self._macro_state = self.macros.step(self._macro_state, key)
+
+    def _end_word(self, separator):
+        expansion = None
+        if self._macro_state is not None:
+            expansion = self.macros.expansion_at(self._macro_state,
+                                                 self._keys)
+        if expansion is not None:
+            self.string = self.raw = expansion
+        elif self._final_profile is not None and \
+                self.string != self._keys and \
+                not self._final_profile.is_valid_string(self.string):
+            # Back to the keys typed, like process_sequence().
+            self.string = self.raw = self._keys
+        self._done.append((self.string, self.raw, separator))
+        self.string = ""
+        self.raw = ""
+        self._dead = False
+        self._restart_keys()
+
+    def _process_word(self, raw):
+        # Convert `raw` as process_sequence() converts a word, but without
+        # the final form check since the word is not finished yet.
+        if self.max_syllable_length is not None and \
+                len(raw) > self.max_syllable_length:
+            return raw
+        if self.cache is not None:
+            transition = self.cache._lookup
+        else:
+            def transition(string, key, fallback_sequence):
+                return core._process_key(string, key, fallback_sequence,
+                                         self.rules, self.skip_non_vietnamese)
+        return core._process_word(raw, transition, self._consonant_prefixes)
+
+    def process_key(self, key):
+        """Process a keystroke and return the new current word."""
+        if key not in self.accepted_chars:
+            self._end_word(key)
+            return self.string
+
+        if self._overlong_key(key):
+            return self.string
+        self._track_key(key)
+        if not self._dead_end_key(key):
+            if self.cache is not None:
+                self._update(self.cache._lookup(self.string, key, self.raw))
+            else:
+                self._update(core._process_key(
+                    self.string, key, self.raw, self.rules,
+                    self.skip_non_vietnamese))
+        return self.string
+
+    def process_key_delta(self, key):
+        """
+        Like process_key() but return a KeyDelta telling how to update
+        `text` instead: delete `backspaces` characters from its end, then
+        type `insert`.
+        """
+        if key not in self.accepted_chars:
+            word = self.string
+            self._end_word(key)
+            expansion = self._done[-1][0]
+            if expansion != word:
+                return core.KeyDelta(len(word), expansion + key, "", "")
+            return core.KeyDelta(0, key, "", "")
+
+        word = self.string
+        done = len(self._done)
+        if self._overlong_key(key):
+            # The word turns into the keys typed, unless it already was
+            # (the only case where part of it is moved to _done).
+            if len(self._done) == done and self.string != word + key:
+                return core.KeyDelta(len(word), self.string, self.string,
+                                     self.raw)
+            return core.KeyDelta(0, key, self.string, self.raw)
+        self._track_key(key)
+        if not self._dead_end_key(key):
+            if self.cache is not None:
+                # The cache keeps the first three items of the result, the
+                # components are those of the word before the key.
+                result = tuple(self.cache._lookup(self.string, key,
+                                                  self.raw)) + \
+                    (utils.separate(self.string), None)
+            else:
+                result = core._process_key(self.string, key, self.raw,
+                                           self.rules,
+                                           self.skip_non_vietnamese)
+            self._update(result)
+            return core._make_delta(result)
+        return core.KeyDelta(0, key, self.string, self.raw)
+
+    def backspace(self):
+        """
+        Delete the last character and return the new current word. If the
+        current word is empty, the separator before it is deleted and the
+        previous word becomes the current word again.
+        """
+        if self.string:
+            self.raw = core.handle_backspace(self.string, self.raw,
+                                             self.rules)
+            self.string = self._process_word(self.raw)
+        elif self._done:
+            self.string, self.raw, _ = self._done.pop()
+        if self.max_syllable_length is not None and self._done and \
+                not self._done[-1][2] and \
+                len(self.raw) <= self.max_syllable_length:
+            # Join back the beginning of an overlong word, see
+            # _overlong_key().
+            self.raw = self._done.pop()[1] + self.raw
+            self.string = self._process_word(self.raw)
+        self._dead = False
+        self._restart_keys(self.raw)
+        return self.string
+
+    def commit(self):
+        """
+        Return all text typed since the last commit and reset. The
+        current word ends, so a macro key is expanded.
+        """
+        if self.string:
+            self._end_word("")
+        text = self.text
+        self.reset()
+        return text
+
+    def dump_state(self):
+        """
+        Return the typing state as a short byte string for load_state().
+        The configuration (rules, cache, macros...) is not included: the
+        session loading it must be set up the same way.
+        """
+        out = bytearray([_STATE_MAGIC, _STATE_VERSION])
+        flags = _STATE_DEAD if self._dead else 0
+        if self.string != self.raw:
+            flags |= _STATE_STRING
+        if self._keys != self.raw:
+            flags |= _STATE_KEYS
+        if self.macros is not None and self._macro_state is None:
+            flags |= _STATE_NO_MACRO
+        _write_varint(out, flags)
+        _write_text(out, self.raw)
+        if flags & _STATE_STRING:
+            _write_text(out, self.string)
+        if flags & _STATE_KEYS:
+            _write_text(out, self._keys)
+
+        _write_varint(out, len(self._done))
+        for string, raw, separator in self._done:
+            if string != raw:
+                out.append(_STATE_STRING)
+                _write_text(out, raw)
+                _write_text(out, string)
+            else:
+                out.append(0)
+                _write_text(out, raw)
+            _write_text(out, separator)
+        return bytes(out)
+
+    def load_state(self, data):
+        """
+        Replace the typing state with one returned by dump_state(),
+        possibly by another process. Raise ValueError if `data` is not a
+        session state of a supported version.
+        """
+        reader = _StateReader(data)
+        if len(reader.data) < 2 or reader.data[0] != _STATE_MAGIC:
+            raise ValueError("Not a bogo session state")
+        if reader.data[1] != _STATE_VERSION:
+            raise ValueError("Unsupported session state version %d" %
+                             reader.data[1])
+        reader.position = 2
+
+        flags = reader.varint()
+        raw = reader.text()
+        string = reader.text() if flags & _STATE_STRING else raw
+        keys = reader.text() if flags & _STATE_KEYS else raw
+        done = []
+        for _ in range(reader.varint()):
+            word_flags = reader.varint()
+            word_raw = reader.text()
+            word = reader.text() if word_flags & _STATE_STRING else word_raw
+            done.append((word, word_raw, reader.text()))
+        if reader.position != len(reader.data):
+            raise ValueError("Trailing data after session state")
+
+        self.string = string
+        self.raw = raw
+        self._done = done
+        self._dead = bool(flags & _STATE_DEAD)
+        self._restart_keys(keys)
+        if flags & _STATE_NO_MACRO:
+            self._macro_state = None
+
+    def reset(self):
+        """Drop all state without committing."""
+        self.string = ""
+        self.raw = ""
+        self._done = []
+        self._dead = False
+        self._restart_keys()
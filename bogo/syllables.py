@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of ibus-bogo project.
+#
+# Copyright (C) 2012 Long T. Dam <longdt90@gmail.com>
+# Copyright (C) 2012-2013 Trung Ngo <ndtrung4419@gmail.com>
+# Copyright (C) 2013 Duong H. Nguyen <cmpitg@gmail.com>
+#
+# ibus-bogo is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ibus-bogo is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ibus-bogo.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+"""
+Splitting Vietnamese text into syllables.
+
+iter_syllables() finds every word of the text that has the shape of a
+Vietnamese syllable with a single regular expression and yields it
+already split into components, like utils.separate() does, together
+with its tone and marks:
+
+>>> for syllable in iter_syllables('Tiếng Việt, ok?'):
+...     print(syllable.start, syllable.end, syllable.components,
+...           syllable.tone)
+0 5 ('T', 'iế', 'ng') 4
+6 10 ('V', 'iệ', 't') 1
+
+'ok' cannot be split that way ('k' is not a last consonant) and is
+skipped, as is any other such word. Whether a syllable is valid
+Vietnamese is left to bogo.validation.
+"""
+
+from __future__ import unicode_literals
+import collections
+import re
+from bogo import accent, mark, utils
+from bogo.validation import CONSONANTS, TERMINAL_CONSONANTS, VOWELS
+Accent = accent.Accent
+
+
+class Syllable(collections.namedtuple(
+        'Syllable', ['start', 'end', 'first_consonant', 'vowel',
+                     'last_consonant', 'tone', 'marks'])):
+    """
+    A syllable found by iter_syllables().
+
+    Attributes:
+        start, end: its span in the text.
+        first_consonant, vowel, last_consonant: the components, as
+            written in the text.
+        tone: an Accent value.
+        marks: the Mark of each character of `vowel`.
+    """
+    __slots__ = ()
+
+    @property
+    def components(self):
+        return (self.first_consonant, self.vowel, self.last_consonant)
+
+
+def _alternatives(strings):
+    # Longest first so that 'ngh' is tried before 'ng' and 'n'.
+    return "|".join(sorted(strings, key=lambda s: (-len(s), s)) + [""])
+
+
+def _build_nuclei():
+    # Every lowercase vowel nucleus with at most one tone mark, mapped to
+    # its (tone, marks).
+    nuclei = {}
+    for vowel in VOWELS:
+        marks = tuple(mark.get_mark_char(char) for char in vowel)
+        nuclei[vowel] = (Accent.NONE, marks)
+        for index in range(len(vowel)):
+            for tone in (Accent.GRAVE, Accent.ACUTE, Accent.HOOK,
+                         Accent.TIDLE, Accent.DOT):
+                toned = vowel[:index] + \
+                    accent.add_accent_char(vowel[index], tone) + \
+                    vowel[index + 1:]
+                nuclei[toned] = (tone, marks)
+    return nuclei
+
+
+_NUCLEI = _build_nuclei()
+
+_VOWEL_CHARS = utils.VOWELS + utils.VOWELS.upper()
+
+_PATTERN = re.compile(
+    "(?<!\\w)(%s)([%s]{1,3})(%s)(?!\\w)" %
+    (_alternatives(CONSONANTS), _VOWEL_CHARS,
+     _alternatives(TERMINAL_CONSONANTS)),
+    re.IGNORECASE | re.UNICODE)
+
+
+def iter_syllables(text):
+    """
+    Yield a Syllable for every word of `text` that can be split into a
+    first consonant (possibly empty), a known vowel nucleus and a last
+    consonant (possibly empty).
+    """
+    nuclei = _NUCLEI
+    for match in _PATTERN.finditer(text):
+        first, vowel, last = match.groups()
+        try:
+            tone, marks = nuclei[vowel.lower()]
+        except KeyError:
+            continue
+        yield Syllable(match.start(), match.end(), first, vowel, last,
+                       tone, marks)
+
+
+def syllables_many(texts):
+    """Return the list of syllables of each string in `texts`."""
+    return [list(iter_syllables(text)) for text in texts]
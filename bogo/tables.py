@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of ibus-bogo project.
+#
+# Copyright (C) 2012 Long T. Dam <longdt90@gmail.com>
+# Copyright (C) 2012-2013 Trung Ngo <ndtrung4419@gmail.com>
+# Copyright (C) 2013 Duong H. Nguyen <cmpitg@gmail.com>
+#
+# ibus-bogo is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ibus-bogo is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ibus-bogo.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+"""
+Engine tables in one flat, read-only buffer.
+
+pack_tables() serializes the rules and an optional foreign word
+BloomFilter into bytes that can be written to a file or copied into a
+multiprocessing.shared_memory block once. Each worker process then
+opens the buffer with EngineTables and uses the filter's bits in place,
+without unpickling or copying them:
+
+>>> data = pack_tables(foreign_words=BloomFilter.from_words(words))
+>>> shm = shared_memory.SharedMemory(create=True, size=len(data))
+>>> shm.buf[:len(data)] = data
+
+and in the workers:
+
+>>> shm = shared_memory.SharedMemory(name)
+>>> tables = EngineTables(shm.buf)
+>>> tables.process_sequence('bias nafy')
+'bias này'
+
+The layout is a header (magic, number of sections), a directory of
+(name, offset, length) entries and the sections, each starting on an
+8-byte boundary. All numbers are little-endian.
+"""
+
+from __future__ import unicode_literals
+import json
+import mmap
+import struct
+from bogo import core
+from bogo.wordfilter import BloomFilter, _memoryview
+
+
+_MAGIC = b'BOGOTAB1'
+_HEADER = struct.Struct('<8sI')
+_ENTRY = struct.Struct('<16sQQ')
+_ALIGNMENT = 8
+
+RULES = 'rules'
+FOREIGN_WORDS = 'foreign_words'
+
+
+def _pad(length):
+    return -length % _ALIGNMENT
+
+
+def pack_tables(rules=None, foreign_words=None):
+    """
+    Return the tables as bytes.
+
+    Args:
+        rules (optional): see docstring for process_key().
+        foreign_words (optional): a BloomFilter, or an iterable of words
+            to build one from.
+    """
+    if rules is None:
+        rules = core.get_telex_definition()
+    sections = [(RULES, json.dumps(rules, sort_keys=True).encode('utf-8'))]
+    if foreign_words is not None:
+        if not isinstance(foreign_words, BloomFilter):
+            foreign_words = BloomFilter.from_words(foreign_words)
+        sections.append((FOREIGN_WORDS, foreign_words.to_bytes()))
+
+    offset = _HEADER.size + _ENTRY.size * len(sections)
+    offset += _pad(offset)
+    directory = [_HEADER.pack(_MAGIC, len(sections))]
+    payload = []
+    for name, data in sections:
+        directory.append(_ENTRY.pack(name.encode('ascii'), offset,
+                                     len(data)))
+        payload.append(data + b'\0' * _pad(len(data)))
+        offset += len(data) + _pad(len(data))
+
+    head = b''.join(directory)
+    return head + b'\0' * _pad(len(head)) + b''.join(payload)
+
+
+def write_tables(path, rules=None, foreign_words=None):
+    """Write pack_tables()'s result to `path`."""
+    with open(path, 'wb') as f:
+        f.write(pack_tables(rules, foreign_words))
+
+
+class EngineTables(object):
+    """
+    Read-only view of tables made by pack_tables().
+
+    Attributes:
+        rules: the rules dictionary.
+        foreign_words: a BloomFilter over the buffer, or None.
+
+    Call close() (or use a with block) before closing the underlying
+    buffer: shared memory cannot be released while views into it exist.
+    """
+
+    def __init__(self, buffer):
+        self._view = _memoryview(buffer)
+        self._views = [self._view]
+        self._mmap = None
+        self._sections = self._read_directory()
+
+        self.rules = json.loads(
+            self.section(RULES).tobytes().decode('utf-8'))
+        self.foreign_words = None
+        if FOREIGN_WORDS in self._sections:
+            self.foreign_words = BloomFilter.from_buffer(
+                self.section(FOREIGN_WORDS))
+            self._views.append(self.foreign_words._bits)
+        self._compiled_rules = core._compile_rules(self.rules)
+
+    @classmethod
+    def open(cls, path):
+        """
+        Map the tables file at `path` read-only. Python 2 cannot use a
+        memory map in place and reads the file instead.
+        """
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        tables = cls(mapped)
+        tables._mmap = mapped
+        return tables
+
+    def _read_directory(self):
+        view = self._view
+        if len(view) < _HEADER.size:
+            raise ValueError("Not bogo engine tables")
+        magic, count = _HEADER.unpack_from(view)
+        if magic != _MAGIC:
+            raise ValueError("Not bogo engine tables")
+        if len(view) < _HEADER.size + count * _ENTRY.size:
+            raise ValueError("Truncated engine tables")
+
+        sections = {}
+        for index in range(count):
+            name, offset, length = _ENTRY.unpack_from(
+                view, _HEADER.size + index * _ENTRY.size)
+            if offset + length > len(view):
+                raise ValueError("Truncated engine tables")
+            sections[name.rstrip(b'\0').decode('ascii')] = (offset, length)
+        return sections
+
+    @property
+    def section_names(self):
+        return sorted(self._sections)
+
+    def section(self, name):
+        """Return a memoryview of the section called `name`."""
+        offset, length = self._sections[name]
+        view = self._view[offset:offset + length]
+        self._views.append(view)
+        return view
+
+    def process_sequence(self, sequence, skip_non_vietnamese=True,
+                         macros=None,
+                         max_syllable_length=core.MAX_SYLLABLE_LENGTH):
+        """process_sequence() with these tables' rules and foreign words."""
+        rules = self.rules
+
+        def transition(string, key, fallback_sequence):
+            return core._process_key(string, key, fallback_sequence, rules,
+                                     skip_non_vietnamese)
+
+        return core._process_sequence(sequence, self._compiled_rules,
+                                      transition, self.foreign_words,
+                                      skip_non_vietnamese, macros,
+                                      max_syllable_length)
+
+    def close(self):
+        """Release all views into the buffer."""
+        self.foreign_words = None
+        for view in reversed(self._views):
+            # Python 2's memoryview cannot be released early.
+            if hasattr(view, 'release'):
+                view.release()
+        self._views = []
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
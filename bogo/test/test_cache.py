@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+from nose.tools import eq_, ok_, raises
+
+import bogo
+from bogo.cache import TransitionCache
+from bogo.session import Session
+
+
+class TestTransitionCache():
+    def test_same_results(self):
+        cache = TransitionCache()
+        for sequence in ['con meof ddieen', 'thuowr.', 'system', 'aaa',
+                         'nguwowif', 'tuyeenr']:
+            eq_(cache.process_sequence(sequence),
+                bogo.process_sequence(sequence))
+
+    def test_hits(self):
+        cache = TransitionCache()
+        cache.process_sequence('thuw')
+        eq_((cache.hits, cache.misses), (0, 4))
+        cache.process_sequence('thuwo')
+        eq_((cache.hits, cache.misses), (4, 5))
+        eq_(cache.hit_rate, 4 / 9.0)
+
+    def test_lru_eviction(self):
+        cache = TransitionCache(maxsize=2)
+        cache.process_key('', 'a')
+        cache.process_key('', 'b')
+        cache.process_key('', 'a')
+        cache.process_key('', 'c')
+        eq_(cache.evictions, 1)
+        eq_(len(cache), 2)
+
+        # 'a' was used last, so 'b' got evicted.
+        cache.process_key('', 'a')
+        eq_(cache.hits, 2)
+        cache.process_key('', 'b')
+        eq_(cache.misses, 4)
+
+    def test_custom_rules(self):
+        cache = TransitionCache(rules=bogo.get_vni_definition())
+        eq_(cache.process_sequence('meo2 meo2'), 'mèo mèo')
+        eq_(cache.info().hits, 4)
+
+    def test_clear(self):
+        cache = TransitionCache()
+        cache.process_sequence('aa')
+        cache.clear()
+        eq_(cache.info(), (0, 0, 0, 4096, 0))
+
+    @raises(ValueError)
+    def test_bad_size(self):
+        TransitionCache(maxsize=0)
+
+    def test_shared_by_sessions(self):
+        cache = TransitionCache(skip_non_vietnamese=False)
+        a, b = Session(cache=cache), Session(cache=cache)
+        for key in 'case':
+            a.process_key(key)
+        for key in 'case':
+            b.process_key(key)
+        eq_(b.text, 'cáe')
+        ok_(cache.hits >= 4)
+
+    def test_session_delta(self):
+        cache = TransitionCache()
+        text = ''
+        for _ in range(2):
+            s = Session(cache=cache)
+            for key in 'tieengs vieetj ':
+                delta = s.process_key_delta(key)
+                text = text[:len(text) - delta.backspaces] + delta.insert
+        eq_(text, 'tiếng việt tiếng việt ')
+        eq_(cache.misses, len('tieengsvieetj'))
+        eq_(cache.hits, len('tieengsvieetj'))
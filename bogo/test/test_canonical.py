@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+from nose.tools import eq_, ok_
+import codecs
+import collections
+import os
+
+from bogo.core import process_sequence, get_vni_definition
+from bogo.canonical import canonicalize_keys
+
+
+def _sequences():
+    path = os.path.join(os.path.dirname(__file__), 'DauCu.sequences')
+    with codecs.open(path, encoding='utf-8') as f:
+        return [line.rstrip('\n').split(':', 1) for line in f]
+
+
+def test_sequences_preserved():
+    # Every way of typing every word of the corpus converts exactly like
+    # its canonical form, which is itself canonical.
+    canonical = collections.defaultdict(set)
+    for keys, expected in _sequences():
+        result = canonicalize_keys(keys)
+        eq_(process_sequence(result), expected)
+        eq_(canonicalize_keys(result), result)
+        canonical[expected].add(result)
+
+    eq_(canonical['ngoặt'], set(['ngoawtj']))
+    ok_(sum(map(len, canonical.values())) < len(_sequences()) / 4)
+
+
+def test_sequences_as_text():
+    text = " ".join(keys for keys, _ in _sequences())
+    for skip in (True, False):
+        eq_(process_sequence(canonicalize_keys(text, skip_non_vietnamese=skip),
+                             skip_non_vietnamese=skip),
+            process_sequence(text, skip_non_vietnamese=skip))
+
+
+def test_orders():
+    for keys in ('tuyeenr', 'tuyeern', 'tuyener', 'tuyenre'):
+        eq_(canonicalize_keys(keys), 'tuyeenr')
+    eq_(canonicalize_keys('nguoiwf'), 'nguwowif')
+    eq_(canonicalize_keys('Ddeemf'), 'DDeemf')
+    eq_(canonicalize_keys('DDEEMF'), 'DDEEMf')
+
+
+def test_separators():
+    eq_(canonicalize_keys('con meof, tuyener.ddeem'),
+        'con meof, tuyeenr.ddeem')
+    eq_(canonicalize_keys(''), '')
+    eq_(canonicalize_keys('...'), '...')
+
+
+def test_unchanged():
+    # Words that do not convert, and words whose keys cannot be spelled
+    # out again, are kept as typed.
+    for keys in ('system', 'ass', 'aaa', 'booongs', 'thuow'):
+        eq_(canonicalize_keys(keys), keys)
+
+
+def test_vni():
+    vni = get_vni_definition()
+    eq_(canonicalize_keys('tuyen63', vni), 'tuye6n3')
+    eq_(canonicalize_keys('d9au61', vni), 'd9a6u1')
+    eq_(process_sequence('nguoi72', vni),
+        process_sequence(canonicalize_keys('nguoi72', vni), vni))
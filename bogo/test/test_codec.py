@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+from nose.tools import eq_, ok_, raises
+from nose.plugins.skip import SkipTest
+from array import array
+import codecs
+import os
+import struct
+import threading
+
+from bogo import codec
+
+
+def _read_dictionary(name):
+    path = os.path.join(os.path.dirname(__file__), 'sequences', name)
+    with codecs.open(path, encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+class TestCodec():
+    def test_fits_in_16_bits(self):
+        codec._load()
+        ok_(len(codec._SYLLABLES) <= 1 << 16)
+        for word in ('nghiêng', 'đường', 'a', 'v'):
+            ok_(codec.encode(word) <= codec.SYLLABLE_MASK)
+
+    def test_case(self):
+        lower = codec.encode('việt')
+        eq_(codec.encode('Việt'), lower | codec.CAPITALIZED << 16)
+        eq_(codec.encode('VIỆT'), lower | codec.UPPER << 16)
+        eq_(codec.decode(codec.encode('VIỆT')), 'VIỆT')
+        eq_(codec.decode(codec.encode('Đ')), 'Đ')
+
+    def test_tone_placements(self):
+        ok_(codec.encode('hòa') != codec.encode('hoà'))
+        eq_(codec.decode(codec.encode('hoà')), 'hoà')
+        eq_(codec.decode(codec.encode('thủy')), 'thủy')
+
+    def test_round_trip_dictionaries(self):
+        for name in ('vi.dic', 'vi-DauCu.dic'):
+            words = _read_dictionary(name)
+            for word in words + [w.upper() for w in words] + \
+                    [w.capitalize() for w in words]:
+                eq_(codec.decode(codec.encode(word)), word)
+
+            codes = codec.encode_many(words)
+            eq_(codes.typecode, codec.CODE_TYPECODE)
+            eq_(codes.itemsize, 4)
+            eq_(codec.decode_many(codes), words)
+
+    def test_many_without_case(self):
+        codes = codec.encode_many(['Con', 'MÈO', 'gì'], keep_case=False)
+        eq_(codes.typecode, 'H')
+        eq_(codec.decode_many(codes), ['con', 'mèo', 'gì'])
+        eq_(codec.decode_many(array('H')), [])
+
+    def test_numpy(self):
+        try:
+            import numpy
+        except ImportError:
+            raise SkipTest("numpy is not installed")
+        codes = codec.encode_many(['tiếng', 'việt'], keep_case=False)
+        view = numpy.frombuffer(codes, dtype=numpy.uint16)
+        eq_(codec.decode_many(view), ['tiếng', 'việt'])
+        codes = codec.encode_many(['Tiếng', 'VIỆT'])
+        view = numpy.frombuffer(codes, dtype=numpy.uint32)
+        eq_(codec.decode_many(view), ['Tiếng', 'VIỆT'])
+
+    def test_buffer(self):
+        words = ['Tiếng', 'VIỆT', 'con']
+        codes = struct.unpack_from('=%dI' % len(words),
+                                   codec.encode_many(words))
+        eq_(codec.decode_many(codes), words)
+
+    def test_load_from_threads(self):
+        codec._SYLLABLES = []
+        codec._CODES = {}
+        errors = []
+
+        def encode():
+            try:
+                codec.encode('nghiêng')
+            except ValueError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=encode) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        eq_(errors, [])
+
+    @raises(ValueError)
+    def test_not_a_syllable(self):
+        codec.encode('system')
+
+    @raises(ValueError)
+    def test_mixed_case(self):
+        codec.encode('vIệt')
+
+    @raises(ValueError)
+    def test_bad_code(self):
+        codec.decode(3 << 16)
+
+    @raises(ValueError)
+    def test_many_not_a_syllable(self):
+        codec.encode_many(['con', 'cats'], keep_case=False)
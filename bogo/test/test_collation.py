@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+from nose.tools import eq_, ok_
+import codecs
+import os
+
+from bogo.collation import ALPHABET, sort_key, sort_keys, sorted_vi
+
+
+class TestCollation():
+    def test_alphabet(self):
+        eq_(ALPHABET, 'aăâbcdđeêfghijklmnoôơpqrstuưvwxyz')
+        eq_(sorted_vi(reversed(ALPHABET)), list(ALPHABET))
+
+    def test_tones(self):
+        eq_(sorted_vi(['mạ', 'má', 'mã', 'mả', 'mà', 'ma']),
+            ['ma', 'mà', 'mả', 'mã', 'má', 'mạ'])
+
+    def test_letters_before_tones(self):
+        eq_(sorted_vi(['ai', 'ác', 'ăn', 'ạch', 'an']),
+            ['ác', 'ạch', 'ai', 'an', 'ăn'])
+        eq_(sorted_vi(['đa', 'dạ', 'dz']), ['dạ', 'dz', 'đa'])
+
+    def test_case(self):
+        eq_(sorted_vi(['Ăn', 'ăn', 'an', 'An', 'ÁN']),
+            ['an', 'An', 'ÁN', 'ăn', 'Ăn'])
+        ok_(sort_key('Việt') > sort_key('việt'))
+
+    def test_prefix(self):
+        eq_(sorted_vi(['Nguyễn Văn', 'Nguyễn', 'Nguyễn A']),
+            ['Nguyễn', 'Nguyễn A', 'Nguyễn Văn'])
+
+    def test_other_characters(self):
+        eq_(sorted_vi(['b', 'a', '2', ' ', '-', 'ç']),
+            [' ', '-', '2', 'a', 'b', 'ç'])
+
+    def test_sort_keys(self):
+        path = os.path.join(os.path.dirname(__file__), 'sequences',
+                            'vi.dic')
+        with codecs.open(path, encoding='utf-8') as f:
+            words = [line.strip() for line in f if line.strip()]
+        words += [word.upper() for word in words[::7]]
+        eq_(sort_keys(words), [sort_key(word) for word in words])
+        eq_(sort_keys([]), [])
+
+    def test_sort_keys_with_nul(self):
+        eq_(sort_keys(['a\0b', 'c']), [sort_key('a\0b'), sort_key('c')])
+
+    def test_sorted_vi_key_and_reverse(self):
+        people = [('Đức', 1), ('Dũng', 2), ('An', 3)]
+        eq_(sorted_vi(people, key=lambda person: person[0]),
+            [('An', 3), ('Dũng', 2), ('Đức', 1)])
+        eq_(sorted_vi(['a', 'ă', 'â'], reverse=True), ['â', 'ă', 'a'])
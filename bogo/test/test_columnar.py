@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+from nose.tools import eq_, ok_
+from nose.plugins.skip import SkipTest
+
+import bogo
+from bogo.columnar import convert_column
+
+
+def _require(name):
+    try:
+        return __import__(name)
+    except ImportError:
+        raise SkipTest("%s is not installed" % name)
+
+
+class TestConvertColumn():
+    def test_list(self):
+        eq_(convert_column(['meof', 'ddieen', 'meof']),
+            ['mèo', 'điên', 'mèo'])
+
+    def test_iterable(self):
+        eq_(convert_column(value for value in ('aa', 'aa')), ['â', 'â'])
+
+    def test_missing_values(self):
+        nan = float('nan')
+        result = convert_column([None, 'aa', 3, None])
+        eq_(result, [None, 'â', 3, None])
+        ok_(convert_column([nan])[0] is nan)
+
+    def test_options(self):
+        eq_(convert_column(['meo2', 'nose'], rules=bogo.get_vni_definition(),
+                           foreign_words={'nose'}), ['mèo', 'nose'])
+
+    def test_distinct_values_only(self):
+        with bogo.profiling() as stats:
+            convert_column(['meof'] * 100 + ['aa'] * 50)
+        eq_(stats.keystrokes, 6)
+
+    def test_numpy(self):
+        numpy = _require('numpy')
+        values = numpy.array([['meof', 'aa'], ['aa', None]], dtype=object)
+        result = convert_column(values)
+        eq_(result.shape, (2, 2))
+        eq_(result.tolist(), [['mèo', 'â'], ['â', None]])
+
+    def test_pandas(self):
+        pandas = _require('pandas')
+        series = pandas.Series(['meof', None, 'meof'], index=[3, 2, 1],
+                               name='raw')
+        result = convert_column(series)
+        eq_(result.dtype, series.dtype)
+        eq_(result.isna().tolist(), [False, True, False])
+        eq_(result.dropna().tolist(), ['mèo', 'mèo'])
+        eq_(result.index.tolist(), [3, 2, 1])
+        eq_(result.name, 'raw')
+
+    def test_pandas_missing_values(self):
+        pandas = _require('pandas')
+        nan = float('nan')
+        series = pandas.Series(['meof', nan, None, 'meof'], dtype=object)
+        result = convert_column(series).tolist()
+        eq_(result[0], 'mèo')
+        ok_(result[1] != result[1])
+        ok_(result[2] is None)
+
+    def test_pandas_categorical(self):
+        pandas = _require('pandas')
+        series = pandas.Series(['meof', 'ddi', None, 'meof'],
+                               dtype='category')
+        result = convert_column(series)
+        eq_(str(result.dtype), 'category')
+        eq_(result.isna().tolist(), [False, False, True, False])
+        eq_(result.dropna().tolist(), ['mèo', 'đi', 'mèo'])
+
+        # Two categories converting to the same string are merged.
+        series = pandas.Series(pandas.Categorical(
+            ['aa', 'â', 'ddi'], ordered=True))
+        result = convert_column(series)
+        eq_(result.tolist(), ['â', 'â', 'đi'])
+        ok_(result.cat.ordered)
+        eq_(result.cat.categories.tolist(), ['â', 'đi'])
+
+    def test_arrow(self):
+        pyarrow = _require('pyarrow')
+        array = pyarrow.array(['meof', None, 'aa', 'meof'])
+        eq_(convert_column(array).to_pylist(), ['mèo', None, 'â', 'mèo'])
+
+        chunked = pyarrow.chunked_array([['aa'], ['meof', 'aa']])
+        result = convert_column(chunked)
+        ok_(isinstance(result, pyarrow.ChunkedArray))
+        eq_(result.to_pylist(), ['â', 'mèo', 'â'])
+
+        encoded = array.dictionary_encode()
+        result = convert_column(encoded)
+        eq_(result.type, encoded.type)
+        eq_(result.to_pylist(), ['mèo', None, 'â', 'mèo'])
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+from nose.tools import eq_, ok_
+import codecs
+import os
+import random
+
+from bogo.detection import score_text, VIETNAMESE, UNACCENTED, OTHER
+from bogo.restoration import fold
+
+
+VIETNAMESE_TEXT = "Tiếng Việt là ngôn ngữ của người Việt và là ngôn ngữ " \
+    "chính thức tại Việt Nam."
+ENGLISH_TEXT = "Python is a programming language that lets you work " \
+    "quickly and integrate systems more effectively."
+FRENCH_TEXT = "Le français est une langue indo-européenne de la famille " \
+    "des langues romanes."
+
+
+def _dictionary_text(words):
+    path = os.path.join(os.path.dirname(__file__), 'sequences', 'vi.dic')
+    with codecs.open(path, encoding='utf-8') as f:
+        dictionary = [line.strip() for line in f if line.strip()]
+    rng = random.Random(0)
+    return " ".join(rng.choice(dictionary) for _ in range(words))
+
+
+class TestScoreText():
+    def test_vietnamese(self):
+        score = score_text(VIETNAMESE_TEXT)
+        eq_(score.language, VIETNAMESE)
+        eq_(score.syllables, 1.0)
+        ok_(score.confidence > 0.9)
+        ok_(score.accents > 0.1)
+
+    def test_unaccented(self):
+        score = score_text(fold(VIETNAMESE_TEXT))
+        eq_(score.language, UNACCENTED)
+        eq_(score.accents, 0.0)
+        ok_(score.confidence > 0.9)
+
+    def test_other(self):
+        for text in (ENGLISH_TEXT, FRENCH_TEXT):
+            score = score_text(text)
+            eq_(score.language, OTHER)
+            ok_(score.confidence > 0.5)
+        eq_(score_text(FRENCH_TEXT).accents, 0.0)
+
+    def test_empty(self):
+        eq_(score_text(''), (OTHER, 0.0, 0.0, 0.0, 0))
+        eq_(score_text('123 -- 456').words, 0)
+
+    def test_sample(self):
+        text = _dictionary_text(50000)
+        score = score_text(text, sample=500)
+        eq_(score.language, VIETNAMESE)
+        ok_(400 <= score.words <= 500)
+        eq_(score_text(text, exact=True).words, len(text.split()))
+
+    def test_sample_covers_whole_text(self):
+        text = ENGLISH_TEXT * 1000 + " " + VIETNAMESE_TEXT * 1000
+        score = score_text(text, sample=200)
+        ok_(0.4 < score.syllables < 0.7)
+
+    def test_short_text_is_exact(self):
+        eq_(score_text(VIETNAMESE_TEXT, sample=10).words, 17)
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+from nose.tools import eq_, raises
+import random
+
+import bogo
+from bogo.editing import EditBuffer
+
+
+class TestEditBuffer():
+    def test_initial(self):
+        buf = EditBuffer('con meof ddieen')
+        eq_(buf.text, 'con mèo điên')
+        eq_(buf.raw, 'con meof ddieen')
+
+    def test_insert_mid_word(self):
+        buf = EditBuffer('con meo ddieen')
+        eq_(buf.edit(7, 7, 'f'), 'con mèo điên')
+        eq_(buf.edit(5, 5, 'e'), 'con mềo điên')
+        eq_(buf.raw, 'con meeof ddieen')
+
+    def test_delete_mid_word(self):
+        buf = EditBuffer('tieengs vieetj')
+        eq_(buf.edit(3, 4), 'tiéng việt')
+        eq_(buf.raw, 'tiengs vieetj')
+        eq_(buf.text, bogo.process_sequence('tiengs vieetj'))
+
+    def test_delete_separator_merges_words(self):
+        buf = EditBuffer('ba n')
+        eq_(buf.edit(2, 3), 'ban')
+        eq_(buf.edit(2, 2, ' '), 'ba n')
+
+    def test_insert_at_ends(self):
+        buf = EditBuffer('meo')
+        eq_(buf.edit(3, 3, 'f'), 'mèo')
+        eq_(buf.edit(0, 0, 'con '), 'con mèo')
+
+    def test_empty(self):
+        buf = EditBuffer()
+        eq_(buf.text, '')
+        eq_(buf.edit(0, 0, 'aa'), 'â')
+
+    def test_selection_and_word_delete_in_one_recompute(self):
+        buf = EditBuffer('mootj hai ba boosn nawm saus')
+        with bogo.profiling() as stats:
+            text = buf.edit_many([(6, 10, ''), (13, 19, '')])
+        eq_(text, 'một ba năm sáu')
+        # Only the words touching the deleted ranges are converted again.
+        eq_(stats.keystrokes, len('ba') + len('nawm'))
+
+    def test_distant_edits(self):
+        buf = EditBuffer('aa bb cc mm ee')
+        with bogo.profiling() as stats:
+            text = buf.edit_many([(1, 1, 's'), (13, 13, 'e')])
+        eq_(text, 'ấ bb cc mm ee')
+        eq_(buf.raw, 'asa bb cc mm eee')
+        eq_(stats.keystrokes, len('asa') + len('eee'))
+
+    def test_only_affected_word_reconverted(self):
+        buf = EditBuffer('con meof ddieen ddi hocj')
+        with bogo.profiling() as stats:
+            buf.edit(12, 13)
+        eq_(buf.text, 'con mèo đien đi học')
+        eq_(stats.keystrokes, len('ddien'))
+
+    def test_random_edits(self):
+        rng = random.Random(42)
+        keys = 'aeoudwsfrxj tnghc.'
+        buf = EditBuffer('')
+        for _ in range(300):
+            raw = buf.raw
+            start = rng.randint(0, len(raw))
+            end = rng.randint(start, min(len(raw), start + 3))
+            insert = ''.join(rng.choice(keys)
+                             for _ in range(rng.randint(0, 3)))
+            buf.edit(start, end, insert)
+            eq_(buf.raw, raw[:start] + insert + raw[end:])
+            eq_(buf.text, bogo.process_sequence(buf.raw))
+
+    def test_inserts_into_empty_buffer(self):
+        buf = EditBuffer('')
+        eq_(buf.edit_many([(0, 0, 'a'), (0, 0, 'a')]), 'â')
+        eq_(buf.raw, 'aa')
+
+    def test_same_position_inserts_keep_order(self):
+        buf = EditBuffer('meo')
+        eq_(buf.edit_many([(3, 3, 'f'), (3, 3, 'x')]), 'mẽo')
+        eq_(buf.raw, 'meofx')
+
+    def test_adjacent_edits(self):
+        buf = EditBuffer('con meo')
+        buf.edit_many([(3, 3, 'x'), (4, 4, 'y')])
+        eq_(buf.raw, 'conx ymeo')
+        eq_(buf.text, bogo.process_sequence(buf.raw))
+
+    def test_random_edit_many(self):
+        rng = random.Random(7)
+        keys = 'aeoudwsfrxj tnghc.'
+        buf = EditBuffer('')
+        for _ in range(200):
+            raw = buf.raw
+            edits = []
+            for _ in range(rng.randint(1, 3)):
+                start = rng.randint(0, len(raw))
+                insert = ''.join(rng.choice(keys)
+                                 for _ in range(rng.randint(1, 2)))
+                edits.append((start, start, insert))
+            buf.edit_many(edits)
+            for start, end, insert in reversed(sorted(edits,
+                                                      key=lambda e: e[0])):
+                raw = raw[:start] + insert + raw[end:]
+            eq_(buf.raw, raw)
+            eq_(buf.text, bogo.process_sequence(buf.raw))
+
+    @raises(ValueError)
+    def test_out_of_bounds(self):
+        EditBuffer('abc').edit(2, 5)
+
+    @raises(ValueError)
+    def test_overlapping(self):
+        EditBuffer('abcdef').edit_many([(0, 3, ''), (2, 4, '')])
@@ -1,13 +1,15 @@
 # -*- coding: utf-8 -*-
 
 from __future__ import unicode_literals
-from nose.tools import eq_
+from nose.tools import eq_, ok_
 from nose.plugins.attrib import attr
 from functools import partial
 import codecs
+import random
 
 import bogo
-from bogo.core import _Action, _get_action, process_sequence, handle_backspace
+from bogo.core import _Action, _get_action, process_sequence, \
+    handle_backspace, process_key, process_key_delta
 from bogo.mark import Mark
 import os
 
@@ -106,6 +108,9 @@ class TestProcessSeq():
         # BUG #77
         eq_(process_sequence("ddiemer"), "điểm")
 
+        # w after a vowel-less word used to crash _can_undo()
+        eq_(process_sequence("qucw"), "qucw")
+
         # BUG #78
         eq_(process_sequence("tuoufw"), "tườu")
 
@@ -196,6 +201,40 @@ class TestProcessSeq():
         eq_(process_sequence('mèos'), 'méo')
 
 
+class TestProcessKeyDelta():
+    def apply(self, string, delta):
+        return string[:len(string) - delta.backspaces] + delta.insert
+
+    def test_examples(self):
+        eq_(process_key_delta('', 'a')[:2], (0, 'a'))
+        eq_(process_key_delta('tuyen', 'e', 'tuyen')[:2], (2, 'ên'))
+        eq_(process_key_delta('mèo', 's', 'meof')[:2], (2, 'éo'))
+        eq_(process_key_delta('thuo', 'w', 'thuo')[:2], (1, 'ơ'))
+        eq_(process_key_delta('ba', 'n', 'ba')[:2], (0, 'n'))
+
+    def test_fallback(self):
+        eq_(process_key_delta('sýt', 'e', 'syst')[:2], (2, 'yste'))
+
+    def test_same_as_process_key(self):
+        for sequence in ['nguwowif', 'tuyeenr', 'system', 'aaa', 'Doongd',
+                         'quowr', 'huww', 'khoefo', 'DDuowngd']:
+            string, raw = '', ''
+            for key in sequence:
+                delta = process_key_delta(string, key, raw)
+                eq_(delta[2:], process_key(string, key, raw))
+                new = self.apply(string, delta)
+                eq_(new, delta.string)
+
+                # Minimal: nothing before the first changed character is
+                # deleted.
+                common = 0
+                while common < min(len(string), len(new)) and \
+                        string[common] == new[common]:
+                    common += 1
+                eq_(delta.backspaces, len(string) - common)
+                string, raw = delta.string, delta.fallback_sequence
+
+
 class TestHandleBackspace():
 
     def test_delete_non_im_key(self):
@@ -225,4 +264,164 @@ class TestHandleBackspace():
         # eq_(handle_backspace('uyể', 'uryee'), 'uy')
 
     def test_single_im_key_two_vowels(self):
-        eq_(handle_backspace('bươ', 'buow'), 'bu')
\ No newline at end of file
+        eq_(handle_backspace('bươ', 'buow'), 'bu')
+
+
+class TestEarlyAbort():
+    def reference(self, sequence, rules=None):
+        # process_sequence() without any shortcut.
+        rules = rules or bogo.get_telex_definition()
+        accepted = bogo.core._accepted_chars(rules)
+        parts, result, raw = [], '', ''
+        for key in sequence:
+            if key not in accepted:
+                parts += [result, key]
+                result, raw = '', ''
+            else:
+                result, raw = process_key(result, key, raw, rules)
+        return ''.join(parts) + result
+
+    def test_dead_end(self):
+        from bogo.core import _is_dead_end
+        ok_(_is_dead_end('syste'))
+        ok_(_is_dead_end('stra'))
+        ok_(_is_dead_end('javascr'))
+        ok_(not _is_dead_end('ae'))
+        ok_(not _is_dead_end('ngha'))
+        ok_(not _is_dead_end('bcd'))
+        ok_(not _is_dead_end('ươa'))
+
+    def test_skips_engine(self):
+        with bogo.profiling() as stats:
+            eq_(process_sequence('javascript'), 'javascript')
+        eq_(stats.keystrokes, 2)
+
+    def test_resumes_on_non_letter(self):
+        vni = bogo.get_vni_definition()
+        for sequence in ['stra6', 'stra61', 'javas6cript1', 'bana8 a1']:
+            eq_(process_sequence(sequence, vni),
+                self.reference(sequence, vni))
+
+    def test_same_as_reference(self):
+        words = ['system', 'javascript', 'Microsoft', 'VMWare', 'strong',
+                 'tuyeenr', 'nguwowif', 'ddieen', 'awww', 'gi[f', 'xyz[',
+                 'tieengs vieetj laf mootj ngoon nguwx', 'khoong ddc',
+                 'banana ]]', 'event-driven', 'ĐƯỜNG']
+        for word in words:
+            eq_(process_sequence(word), self.reference(word))
+
+    def test_same_as_reference_random(self):
+        rng = random.Random(1)
+        keys = 'aeoiuydwsfrxjtnghcbq[]AWD'
+        for _ in range(2000):
+            word = ''.join(rng.choice(keys)
+                           for _ in range(rng.randint(1, 10)))
+            eq_(process_sequence(word), self.reference(word))
+
+
+class TestPassthrough():
+    def test_compiled_rules(self):
+        from bogo.core import _compile_rules
+        compiled = _compile_rules(bogo.get_telex_definition())
+        ok_('t' in compiled.passthrough_chars)
+        ok_('T' in compiled.passthrough_chars)
+        ok_('s' not in compiled.passthrough_chars)
+        ok_('W' not in compiled.passthrough_chars)
+        eq_(compiled.word_pattern.split('con meo.'),
+            ['', 'con', ' ', 'meo', '.'])
+
+    def test_skips_engine(self):
+        with bogo.profiling() as stats:
+            eq_(process_sequence('chunk lint thu'), 'chunk lint thu')
+        eq_(stats.keystrokes, 0)
+
+    def test_vni(self):
+        vni = bogo.get_vni_definition()
+        with bogo.profiling() as stats:
+            eq_(process_sequence('system meo2', vni), 'system mèo')
+        eq_(stats.keystrokes, 4)
+
+    def test_same_as_reference_random(self):
+        reference = TestEarlyAbort().reference
+        rng = random.Random(2)
+        keys = 'thnglcuiTHNaeowsfd ,'
+        for _ in range(2000):
+            sequence = ''.join(rng.choice(keys)
+                               for _ in range(rng.randint(1, 16)))
+            eq_(process_sequence(sequence), reference(sequence))
+
+
+class TestProcessInto():
+    def convert(self, sequence, **kwargs):
+        parts = []
+        bogo.process_into(sequence, parts.append, **kwargs)
+        return ''.join(parts)
+
+    def test_string(self):
+        eq_(self.convert('con meof ddieen.'), 'con mèo điên.')
+        eq_(self.convert(''), '')
+
+    def test_words_across_chunks(self):
+        eq_(self.convert(['con me', 'of dd', 'ie', 'en', ' ', 'xyz']),
+            'con mèo điên xyz')
+
+    def test_file(self):
+        import io
+        output = io.StringIO()
+        bogo.process_into(io.StringIO('tieengs vieetj\nlaf '), output.write,
+                          chunk_size=3)
+        eq_(output.getvalue(), 'tiếng việt\nlà ')
+
+    def test_options(self):
+        eq_(self.convert('meo2 nose', rules=bogo.get_vni_definition(),
+                         foreign_words={'nose'}), 'mèo nose')
+
+    def test_same_as_process_sequence_random(self):
+        rng = random.Random(3)
+        keys = 'aeoiuwdsfrxjtngh ,.'
+        for _ in range(500):
+            sequence = ''.join(rng.choice(keys)
+                               for _ in range(rng.randint(0, 40)))
+            chunks = []
+            while sequence[len(''.join(chunks)):]:
+                start = len(''.join(chunks))
+                chunks.append(sequence[start:start + rng.randint(1, 5)])
+            eq_(self.convert(chunks), process_sequence(sequence))
+
+
+class TestMaxSyllableLength():
+    def test_overlong_words_pass_through(self):
+        for word in ('a' * 100, 'w' * 100, 'uo' * 50, 'aws' * 20):
+            eq_(process_sequence(word), word)
+            eq_(process_key_no_skip(word), word)
+        eq_(process_sequence('meof ' + 'a' * 40 + ' ddi'),
+            'mèo ' + 'a' * 40 + ' đi')
+
+    def test_limit(self):
+        eq_(process_sequence('tieengs', max_syllable_length=7), 'tiếng')
+        eq_(process_sequence('tieengs', max_syllable_length=6), 'tieengs')
+        eq_(process_sequence('aaaaaa' * 10, max_syllable_length=None),
+            process_sequence('aaaaaa' * 10, max_syllable_length=1000))
+        eq_(bogo.core.MAX_SYLLABLE_LENGTH, 32)
+
+    def test_process_into(self):
+        parts = []
+        bogo.process_into(['meo', 'f aa', 'aaa', 'aaa', 'aa ddi'],
+                          parts.append, max_syllable_length=4)
+        eq_(''.join(parts), 'mèo aaaaaaaaaa đi')
+
+    def test_process_into_random(self):
+        rng = random.Random(7)
+        for _ in range(500):
+            limit = rng.randint(1, 8)
+            sequence = ''.join(rng.choice('aeowdsfn .')
+                               for _ in range(rng.randint(0, 60)))
+            chunks = []
+            while sequence[len(''.join(chunks)):]:
+                start = len(''.join(chunks))
+                chunks.append(sequence[start:start + rng.randint(1, 5)])
+            parts = []
+            bogo.process_into(chunks, parts.append,
+                              max_syllable_length=limit)
+            eq_(''.join(parts),
+                process_sequence(sequence, max_syllable_length=limit))
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+from nose.tools import eq_, ok_
+
+import bogo
+from bogo import core, utils
+from bogo.instrumentation import profiling, STAGES
+
+
+class TestProfiling():
+    def test_counts(self):
+        with profiling() as stats:
+            eq_(bogo.process_sequence('meof'), 'mèo')
+
+        eq_(stats.keystrokes, 4)
+        eq_(stats.calls['_transform'], 4)
+        ok_(stats.calls['separate'] >= 4)
+        ok_(stats.total_ns['process_key'] > 0)
+        ok_(stats.per_keystroke_ns() > 0)
+
+    def test_toplevel_process_key_is_counted(self):
+        with profiling() as stats:
+            bogo.process_key('a', 'a', 'a')
+
+        eq_(stats.keystrokes, 1)
+
+    def test_recursion_counted_once(self):
+        rules = {'z': '_', 'a': 'a^'}
+        with profiling() as stats:
+            core.process_key('â', 'z', 'aa', rules)
+
+        eq_(stats.calls['_get_transformation_list'], 1)
+
+    def test_probes_removed(self):
+        originals = [core._process_key, core._transform, utils.separate,
+                     core.is_valid_combination]
+
+        with profiling():
+            ok_(core._transform is not originals[1])
+
+        eq_([core._process_key, core._transform, utils.separate,
+             core.is_valid_combination], originals)
+
+    def test_probes_removed_on_error(self):
+        original = core._transform
+        try:
+            with profiling():
+                raise ValueError
+        except ValueError:
+            pass
+        ok_(core._transform is original)
+
+    def test_report(self):
+        with profiling() as stats:
+            bogo.process_sequence('ddieen')
+
+        report = stats.report()
+        for stage in STAGES:
+            ok_(stage in report)
+
+    def test_empty(self):
+        with profiling() as stats:
+            pass
+
+        eq_(stats.per_keystroke_ns(), 0)
+        eq_(stats.mean_ns('separate'), 0)
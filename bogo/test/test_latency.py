@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+from nose.tools import eq_, ok_, raises
+
+import bogo
+from bogo import core
+from bogo.latency import LatencyHistogram, LatencyTracker, latency_tracking
+
+
+class TestLatencyHistogram():
+    def test_exact_small_values(self):
+        h = LatencyHistogram()
+        for value in range(1, 11):
+            h.record(value)
+
+        eq_(h.count, 10)
+        eq_(h.p50, 5)
+        eq_(h.p90, 9)
+        eq_(h.max, 10)
+        eq_(h.min, 1)
+
+    def test_relative_error(self):
+        h = LatencyHistogram(significant_bits=6)
+        for value in [1000, 54321, 987654, 20 * 10 ** 6]:
+            h.record(value)
+            reported = h.percentile(100) if value == h.max else None
+            if reported is not None:
+                eq_(reported, value)
+
+        for percent, value in [(25, 1000), (50, 54321), (75, 987654)]:
+            reported = h.percentile(percent)
+            ok_(value <= reported <= value * (1 + 1.0 / 32))
+
+    def test_clamped(self):
+        h = LatencyHistogram(max_bits=20)
+        h.record(10 ** 9)
+        eq_(h.max, 10 ** 9)
+        eq_(h.p50, 10 ** 9)
+
+    def test_fixed_memory(self):
+        h = LatencyHistogram()
+        size = len(h._counts)
+        for value in range(0, 10 ** 7, 9973):
+            h.record(value)
+        eq_(len(h._counts), size)
+
+    def test_empty(self):
+        h = LatencyHistogram()
+        eq_(h.p99, 0)
+        eq_(h.summary()['max'], 0)
+
+    def test_merge(self):
+        a, b = LatencyHistogram(), LatencyHistogram()
+        a.record(10)
+        b.record(1000)
+        a.merge(b)
+        eq_(a.count, 2)
+        eq_((a.min, a.max), (10, 1000))
+
+    @raises(ValueError)
+    def test_merge_different_shapes(self):
+        LatencyHistogram().merge(LatencyHistogram(significant_bits=4))
+
+
+class TestLatencyTracking():
+    def test_branches(self):
+        with latency_tracking() as tracker:
+            bogo.process_sequence('aa')
+            bogo.process_sequence('as')
+            bogo.process_sequence('aaa')
+            bogo.process_sequence('ass')
+            bogo.process_sequence('syste')
+            bogo.process_sequence('a11', rules=bogo.get_vni_definition())
+
+        eq_(tracker.histogram.count, 18)
+        eq_(tracker.by_branch['mark'].count, 2)
+        eq_(tracker.by_branch['accent'].count, 4)
+        eq_(tracker.by_branch['undo'].count, 1)
+        eq_(tracker.by_branch['fallback'].count, 3)
+        ok_('append' in tracker.report())
+
+    def test_slowest(self):
+        tracker = LatencyTracker(keep_slowest=3)
+        for latency in [5, 1, 9, 7, 3]:
+            tracker.record(latency, 'append')
+
+        eq_([s.latency_ns for s in tracker.slowest], [9, 7, 5])
+
+    def test_shared_tracker(self):
+        tracker = LatencyTracker()
+        with latency_tracking(tracker):
+            bogo.process_key('', 'a')
+        with latency_tracking(tracker):
+            bogo.process_key('', 'b')
+
+        eq_(tracker.histogram.count, 2)
+
+    def test_unhooked(self):
+        original = core._process_key
+        with latency_tracking():
+            ok_(core._process_key is not original)
+        ok_(core._process_key is original)
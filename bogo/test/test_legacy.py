@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+from nose.tools import eq_, raises
+import codecs
+import os
+import shutil
+import tempfile
+
+from bogo import legacy
+
+
+def _read_dictionary(name):
+    path = os.path.join(os.path.dirname(__file__), 'sequences', name)
+    with codecs.open(path, encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+TEXT = "Người Việt ở Đà Nẵng. Sô. add dđ ĐẤT NƯỚC? a\\' \\\\."
+
+
+class TestLegacy():
+    def test_tcvn3(self):
+        eq_(legacy.decode(b'Vi\xd6t Nam c\xb8c \xa7\xa5n', 'tcvn3'),
+            'Việt Nam các ĐƠn')
+        eq_(legacy.encode('Việt Nam', 'tcvn3'), b'Vi\xd6t Nam')
+
+    def test_vni(self):
+        data = 'Tieáng Vieät ngöôøi Ñaø Naüng THÖÔØNG'.encode('latin-1')
+        eq_(legacy.decode(data, 'vni'),
+            'Tiếng Việt người Đà Nẵng THƯỜNG')
+        eq_(legacy.encode('Tiếng Việt người Đà Nẵng THƯỜNG', 'vni'), data)
+
+    def test_viqr(self):
+        eq_(legacy.decode("Tie^'ng Vie^.t ddi DDa` So^\\. a\\dd", 'viqr'),
+            'Tiếng Việt đi Đà Sô. add')
+        eq_(legacy.decode(b"Vie^.t", 'viqr'), 'Việt')
+        eq_(legacy.encode('Việt Nam đó.', 'viqr'),
+            b"Vie^.t Nam ddo'\\.")
+
+    def test_round_trip_dictionaries(self):
+        words = " ".join(_read_dictionary('vi.dic') +
+                         _read_dictionary('vi-DauCu.dic'))
+        for encoding in legacy.ENCODINGS:
+            eq_(legacy.decode(legacy.encode(words, encoding), encoding),
+                words)
+        for encoding in ('vni', 'viqr'):
+            eq_(legacy.decode(legacy.encode(words.upper(), encoding),
+                              encoding),
+                words.upper())
+
+    def test_round_trip_escapes(self):
+        eq_(legacy.decode(legacy.encode(TEXT, 'viqr'), 'viqr'), TEXT)
+        eq_(legacy.decode(legacy.encode(TEXT, 'vni'), 'vni'), TEXT)
+
+    def test_decomposed_input(self):
+        eq_(legacy.encode('Việt', 'vni'),
+            legacy.encode('Việt', 'vni'))
+
+    @raises(UnicodeEncodeError)
+    def test_tcvn3_has_no_toned_capitals(self):
+        legacy.encode('VIỆT', 'tcvn3')
+
+    def test_errors(self):
+        eq_(legacy.encode('VIỆT', 'tcvn3', 'replace'), b'VI?T')
+        eq_(legacy.decode(b'\xc0', 'tcvn3', 'replace'), '�')
+
+    @raises(ValueError)
+    def test_unknown_encoding(self):
+        legacy.decode(b'', 'viscii')
+
+    def test_chunks(self):
+        for encoding in legacy.ENCODINGS:
+            text = TEXT if encoding != 'tcvn3' else TEXT.lower()
+            data = legacy.encode(text, encoding)
+            for size in (1, 2, 3, 7):
+                chunks = [data[i:i + size]
+                          for i in range(0, len(data), size)]
+                eq_("".join(legacy.iter_decode(chunks, encoding)), text)
+                chunks = [text[i:i + size]
+                          for i in range(0, len(text), size)]
+                eq_(b"".join(legacy.iter_encode(chunks, encoding)), data)
+
+    def test_decomposed_chunks(self):
+        chunks = ['Viẹ', '̂t']
+        eq_(b"".join(legacy.iter_encode(chunks, 'vni')),
+            legacy.encode('Việt', 'vni'))
+
+
+class TestLegacyFiles():
+    def setup(self):
+        self.directory = tempfile.mkdtemp()
+
+    def teardown(self):
+        shutil.rmtree(self.directory)
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def test_files(self):
+        text = (TEXT + "\r\n") * 100
+        with open(self._path('in.txt'), 'wb') as f:
+            f.write(text.encode('utf-8'))
+        for encoding in ('vni', 'viqr'):
+            legacy.encode_file(self._path('in.txt'), self._path('legacy'),
+                               encoding, chunk_size=100)
+            with open(self._path('legacy'), 'rb') as f:
+                eq_(f.read(), legacy.encode(text, encoding))
+            legacy.decode_file(self._path('legacy'), self._path('out.txt'),
+                               encoding, chunk_size=100)
+            with open(self._path('out.txt'), 'rb') as f:
+                eq_(f.read().decode('utf-8'), text)
+
+    def test_empty_file(self):
+        open(self._path('empty'), 'wb').close()
+        legacy.decode_file(self._path('empty'), self._path('out.txt'), 'vni')
+        eq_(os.path.getsize(self._path('out.txt')), 0)
+
+    def test_main(self):
+        with open(self._path('in.txt'), 'wb') as f:
+            f.write(b"Vie^.t")
+        eq_(legacy.main(['viqr', self._path('in.txt'),
+                         self._path('out.txt')]), 0)
+        with open(self._path('out.txt'), 'rb') as f:
+            eq_(f.read().decode('utf-8'), 'Việt')
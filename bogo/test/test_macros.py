@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+from nose.tools import eq_, ok_, raises
+import io
+import os
+import shutil
+import tempfile
+
+from bogo.core import process_sequence, process_into, get_vni_definition
+from bogo.cache import TransitionCache
+from bogo.macros import MacroTable
+from bogo.session import Session
+
+
+MACROS = MacroTable({'ko': 'không', 'vn': 'Việt Nam', 'kg': 'không gian'})
+
+
+class TestMacroTable():
+    def test_expand(self):
+        eq_(MACROS.expand('ko'), 'không')
+        eq_(MACROS.expand('Ko'), 'Không')
+        eq_(MACROS.expand('KO'), 'KHÔNG')
+        eq_(MACROS.expand('vn'), 'Việt Nam')
+        eq_(MACROS.expand('k'), None)
+        eq_(len(MACROS), 3)
+        ok_('VN' in MACROS)
+
+    def test_trie(self):
+        state = MACROS.step(MacroTable.ROOT, 'k')
+        ok_(state is not None)
+        eq_(MACROS.expansion_at(state, 'k'), None)
+        eq_(MACROS.expansion_at(MACROS.step(state, 'o'), 'ko'), 'không')
+        eq_(MACROS.expansion_at(MACROS.step(state, 'G'), 'kG'),
+            'không gian')
+        eq_(MACROS.step(state, 'x'), None)
+        eq_(MACROS.walk('kox'), None)
+        eq_(MACROS.walk(''), MacroTable.ROOT)
+
+    def test_loads(self):
+        table = MacroTable.loads("# comment\n\nko : không\n"
+                                 "  vn:Việt Nam  \nhh : a:b\n")
+        eq_(table.expand('vn'), 'Việt Nam')
+        eq_(table.expand('hh'), 'a:b')
+        eq_(MacroTable.loads(table.dumps()).dumps(), table.dumps())
+
+    @raises(ValueError)
+    def test_loads_bad_line(self):
+        MacroTable.loads("ko : không\nvn\n")
+
+    @raises(ValueError)
+    def test_empty_key(self):
+        MacroTable({'': 'x'})
+
+    def test_file(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'macros.txt')
+            MACROS.save(path)
+            eq_(MacroTable.load(path).dumps(), MACROS.dumps())
+        finally:
+            shutil.rmtree(directory)
+
+
+class TestMacroExpansion():
+    def test_process_sequence(self):
+        eq_(process_sequence('ko phari vn, Ko!', macros=MACROS),
+            'không phải Việt Nam, Không!')
+        eq_(process_sequence('koo kos', macros=MACROS), 'kô kó')
+
+    def test_vni(self):
+        eq_(process_sequence('ko pha3i', rules=get_vni_definition(),
+                             macros=MACROS),
+            'không phải')
+
+    def test_cache_and_into(self):
+        eq_(TransitionCache().process_sequence('vn ko', macros=MACROS),
+            'Việt Nam không')
+        out = io.StringIO()
+        process_into(['v', 'n k', 'o'], out.write, macros=MACROS)
+        eq_(out.getvalue(), 'Việt Nam không')
+
+    def test_session(self):
+        session = Session(macros=MACROS)
+        for key in 'ko phari vn.':
+            session.process_key(key)
+        eq_(session.text, 'không phải Việt Nam.')
+
+    def test_session_commit(self):
+        session = Session(macros=MACROS)
+        for key in 'di vn':
+            session.process_key(key)
+        eq_(session.text, 'di vn')
+        eq_(session.commit(), 'di Việt Nam')
+
+    def test_session_prefix_is_not_expanded(self):
+        session = Session(macros=MACROS)
+        for key in 'k kof ':
+            session.process_key(key)
+        eq_(session.text, 'k kò ')
+
+    def test_session_backspace(self):
+        session = Session(macros=MACROS)
+        for key in 'kx':
+            session.process_key(key)
+        session.backspace()
+        for key in 'o ':
+            session.process_key(key)
+        eq_(session.text, 'không ')
+
+    def test_session_delta(self):
+        session = Session(macros=MACROS)
+        text = ""
+        for key in 'ko vn ':
+            delta = session.process_key_delta(key)
+            text = text[:len(text) - delta.backspaces] + delta.insert
+        eq_(text, 'không Việt Nam ')
+        eq_(session.text, text)
+
+    def test_shared_table(self):
+        first, second = Session(macros=MACROS), Session(macros=MACROS)
+        first.process_key('k')
+        for key in 'vn ':
+            second.process_key(key)
+        for key in 'o ':
+            first.process_key(key)
+        eq_(first.text, 'không ')
+        eq_(second.text, 'Việt Nam ')
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+from nose.tools import eq_, ok_, raises
+import codecs
+import os
+
+from bogo.normalization import normalize_tone_placement, \
+    normalize_tone_placement_many
+
+
+def _read_dictionary(name):
+    path = os.path.join(os.path.dirname(__file__), 'sequences', name)
+    with codecs.open(path, encoding='utf-8') as f:
+        return set(line.strip() for line in f if line.strip())
+
+
+class TestNormalizeTonePlacement():
+    def test_new(self):
+        eq_(normalize_tone_placement('hòa hòe thủy', 'new'), 'hoà hoè thuỷ')
+
+    def test_old(self):
+        eq_(normalize_tone_placement('hoà hoè thuỷ', 'old'), 'hòa hòe thủy')
+
+    def test_default_is_new(self):
+        eq_(normalize_tone_placement('hòa'), 'hoà')
+
+    def test_case(self):
+        eq_(normalize_tone_placement('HÒA Hòa hÒA THỦY', 'new'),
+            'HOÀ Hoà hOÀ THUỶ')
+
+    def test_untouched(self):
+        text = 'hoàng thuyền quý quỳ ngoài khuya hoa thuy Hoà?'
+        eq_(normalize_tone_placement(text, 'new'), text)
+
+    def test_punctuation(self):
+        eq_(normalize_tone_placement('(hòa), thủy.\n', 'new'),
+            '(hoà), thuỷ.\n')
+
+    def test_dictionaries(self):
+        # vi.dic uses the new style and vi-DauCu.dic the old one.
+        new = _read_dictionary('vi.dic')
+        old = _read_dictionary('vi-DauCu.dic')
+        eq_(set(normalize_tone_placement(w, 'new') for w in new), new)
+        eq_(set(normalize_tone_placement(w, 'old') for w in old), old)
+
+        changed = [w for w in new if normalize_tone_placement(w, 'old') != w]
+        eq_(len(changed), 69)
+        for word in changed:
+            old_style = normalize_tone_placement(word, 'old')
+            ok_(old_style in old, old_style)
+            eq_(normalize_tone_placement(old_style, 'new'), word)
+
+    def test_many(self):
+        eq_(normalize_tone_placement_many(['hòa', 'thủy', 'hòa'], 'new'),
+            ['hoà', 'thuỷ', 'hoà'])
+        eq_(normalize_tone_placement_many(iter(['hoà']), 'old'), ['hòa'])
+
+    @raises(ValueError)
+    def test_bad_style(self):
+        normalize_tone_placement('hòa', 'newest')
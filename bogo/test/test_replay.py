@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+from nose.tools import eq_, ok_, raises
+
+from bogo.replay import Event, SessionRecorder, dumps, loads, replay
+
+
+def fake_clock(times):
+    times = iter(times)
+    return lambda: next(times)
+
+
+class TestFormat():
+    def test_round_trip(self):
+        events = [Event('k', 0, 'a'), Event('k', 1200, '\t'),
+                  Event('b', 300, ''), Event('k', 5, '\\'),
+                  Event('c', 10, 'a\nb')]
+        eq_(loads(dumps(events)), events)
+
+    def test_round_trip_line_breaks(self):
+        # Keys str.splitlines() would break a line on.
+        events = [Event('k', 0, key)
+                  for key in ('\r', '\x0b', '\x0c', '\x1c', '\x85',
+                              '\u2028', '\u2029')]
+        events.append(Event('c', 1, 'a\r\nb'))
+        eq_(loads(dumps(events)), events)
+
+    def test_crlf_file(self):
+        eq_(loads("k\t0\ta\r\nb\t1\r\n"),
+            [Event('k', 0, 'a'), Event('b', 1, '')])
+
+    def test_comments(self):
+        eq_(loads("# recorded by hand\nk\t0\ta\n\nb\t1\n"),
+            [Event('k', 0, 'a'), Event('b', 1, '')])
+
+    @raises(ValueError)
+    def test_bad_event(self):
+        loads("x\t0\ta\n")
+
+    @raises(ValueError)
+    def test_empty_key(self):
+        loads("k\t0\n")
+
+
+class TestRecorder():
+    def test_records_delays(self):
+        recorder = SessionRecorder(clock=fake_clock([1.0, 1.25, 1.5, 2.0]))
+        recorder.process_key('a')
+        recorder.process_key('a')
+        recorder.backspace()
+        eq_(recorder.commit(), '')
+
+        eq_(recorder.events, [Event('k', 0, 'a'), Event('k', 250000, 'a'),
+                              Event('b', 250000, ''), Event('c', 500000, '')])
+
+
+class TestReplay():
+    def test_matching(self):
+        recorder = SessionRecorder()
+        for key in 'con meo ':
+            recorder.process_key(key)
+        recorder.backspace()
+        recorder.process_key('f')
+        recorder.process_key(' ')
+        recorder.commit()
+        eq_(recorder.events[-1].arg, 'con mèo ')
+
+        result = replay(loads(dumps(recorder.events)))
+        ok_(result.ok)
+        eq_(result.commits, 1)
+        eq_(result.histogram.count, 11)
+        ok_(result.total_ns > 0)
+
+    def test_mismatch(self):
+        events = [Event('k', 0, 'a'), Event('k', 0, 's'),
+                  Event('c', 0, 'as')]
+        result = replay(events)
+        ok_(not result.ok)
+        eq_(result.mismatches[0].actual, 'á')
+        ok_('mismatched' in result.report())
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+from nose.tools import eq_, ok_
+
+from bogo.restoration import AccentRestorer, fold
+
+
+CORPUS = [
+    "Tiếng Việt là ngôn ngữ của người Việt.",
+    "Người Việt nói tiếng Việt, viết chữ Quốc ngữ.",
+    "Tôi là người Việt Nam. Tôi viết thư cho mẹ.",
+    "Mẹ tôi đi chợ mua cá.",
+]
+
+
+def _trained():
+    restorer = AccentRestorer()
+    restorer.train(CORPUS)
+    return restorer
+
+
+class TestAccentRestorer():
+    def test_fold(self):
+        eq_(fold('Tiếng Việt ĐƯỜNG'), 'Tieng Viet DUONG')
+
+    def test_candidates(self):
+        restorer = AccentRestorer()
+        candidates = restorer.candidates('viet')
+        ok_('việt' in candidates)
+        ok_('viết' in candidates)
+        ok_(all(fold(c) == 'viet' for c in candidates))
+        eq_(restorer.candidates('xyz'), [])
+
+    def test_candidates_most_frequent_first(self):
+        eq_(_trained().candidates('viet')[0], 'việt')
+
+    def test_restore(self):
+        restorer = _trained()
+        eq_(restorer.restore('Tieng Viet la ngon ngu cua nguoi Viet.'),
+            'Tiếng Việt là ngôn ngữ của người Việt.')
+        eq_(restorer.restore('toi viet thu'), 'tôi viết thư')
+
+    def test_context(self):
+        restorer = _trained()
+        eq_(restorer.restore('nguoi Viet'), 'người Việt')
+        eq_(restorer.restore('toi viet'), 'tôi viết')
+
+    def test_case(self):
+        restorer = _trained()
+        eq_(restorer.restore('NGUOI Viet noi'), 'NGƯỜI Việt nói')
+
+    def test_keeps_other_words(self):
+        restorer = _trained()
+        eq_(restorer.restore('hello nguoi Việt 2014 me!'),
+            'hello người Việt 2014 mẹ!')
+        eq_(restorer.restore(''), '')
+
+    def test_restore_many(self):
+        restorer = _trained()
+        eq_(restorer.restore_many(['me toi', 'di cho']),
+            ['mẹ tôi', 'đi chợ'])
+
+    def test_vocabulary(self):
+        restorer = AccentRestorer(vocabulary=['mèo', 'con'])
+        eq_(restorer.restore('con meo meo'), 'con mèo mèo')
+        eq_(restorer.restore('cho'), 'cho')
+
+    def test_train_extends_vocabulary(self):
+        restorer = AccentRestorer(vocabulary=[])
+        restorer.train('gió')
+        eq_(restorer.restore('gio'), 'gió')
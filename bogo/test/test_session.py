@@ -0,0 +1,277 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+from nose.tools import eq_, ok_, raises
+import os
+import random
+
+import bogo
+from bogo.macros import MacroTable
+from bogo.session import Session
+from bogo.validation import DictionaryProfile
+
+
+def type_keys(session, keys):
+    for key in keys:
+        session.process_key(key)
+
+
+class TestSession():
+    def test_process_key(self):
+        s = Session()
+        eq_(s.process_key('m'), 'm')
+        eq_(s.process_key('e'), 'me')
+        eq_(s.process_key('o'), 'meo')
+        eq_(s.process_key('f'), 'mèo')
+        eq_(s.raw, 'meof')
+
+    def test_same_as_process_sequence(self):
+        for sequence in ['con meof ddieen', 'aans.tuongwj', 'system is ok']:
+            s = Session()
+            type_keys(s, sequence)
+            eq_(s.text, bogo.process_sequence(sequence))
+
+    def test_separator_ends_word(self):
+        s = Session()
+        type_keys(s, 'meof ')
+        eq_(s.string, '')
+        eq_(s.raw, '')
+        eq_(s.text, 'mèo ')
+
+    def test_backspace(self):
+        s = Session()
+        type_keys(s, 'thuwowng')
+        eq_(s.backspace(), 'thươn')
+        eq_(s.raw, 'thuwown')
+
+    def test_backspace_into_finished_words(self):
+        s = Session()
+        type_keys(s, 'a b')
+        s.backspace()
+        eq_(s.text, 'a ')
+        eq_(s.backspace(), 'a')
+        eq_(s.text, 'a')
+        s.process_key('s')
+        eq_(s.text, 'á')
+        s.backspace()
+        eq_(s.text, '')
+
+    def test_commit(self):
+        s = Session()
+        type_keys(s, 'meof ddi')
+        eq_(s.commit(), 'mèo đi')
+        eq_(s.text, '')
+        eq_(s.raw, '')
+
+    def test_process_key_delta(self):
+        s = Session()
+        text = ''
+        for key in 'tieengs vieetj':
+            delta = s.process_key_delta(key)
+            text = text[:len(text) - delta.backspaces] + delta.insert
+            eq_(text, s.text)
+        eq_(text, 'tiếng việt')
+
+    def test_dead_end_words_skip_engine(self):
+        s = Session()
+        with bogo.profiling() as stats:
+            type_keys(s, 'javascript')
+        eq_(s.text, 'javascript')
+        eq_(stats.keystrokes, 2)
+
+        type_keys(s, ' tieengs')
+        eq_(s.text, 'javascript tiếng')
+
+    def test_dead_end_then_vni_digit(self):
+        vni = bogo.get_vni_definition()
+        s = Session(rules=vni)
+        type_keys(s, 'stra6')
+        eq_(s.text, bogo.process_sequence('stra6', vni))
+
+    def test_same_as_process_sequence_random(self):
+        rng = random.Random(3)
+        for _ in range(300):
+            sequence = ''.join(rng.choice('aeoiuydwsfrxjtnghcbq [')
+                               for _ in range(rng.randint(1, 20)))
+            s = Session()
+            type_keys(s, sequence)
+            eq_(s.text, bogo.process_sequence(sequence))
+
+            s = Session()
+            text = ''
+            for key in sequence:
+                delta = s.process_key_delta(key)
+                text = text[:len(text) - delta.backspaces] + delta.insert
+            eq_(text, s.text)
+
+    def test_vni(self):
+        s = Session(rules=bogo.get_vni_definition())
+        type_keys(s, 'meo2')
+        eq_(s.text, 'mèo')
+
+
+class TestSessionState():
+    def test_round_trip(self):
+        s = Session()
+        type_keys(s, 'con meof ddiee')
+        data = s.dump_state()
+        ok_(len(data) < 48)
+
+        other = Session()
+        other.load_state(data)
+        eq_(other.text, 'con mèo điê')
+        eq_(other.raw, 'ddiee')
+        eq_(other.dump_state(), data)
+        type_keys(other, 'nr')
+        eq_(other.commit(), 'con mèo điển')
+
+    def test_backspace_after_load(self):
+        s = Session()
+        type_keys(s, 'meof ')
+        other = Session()
+        other.load_state(s.dump_state())
+        eq_(other.backspace(), 'mèo')
+        eq_(other.raw, 'meof')
+        s.backspace()
+        eq_(other.process_key('s'), s.process_key('s'))
+
+    def test_empty(self):
+        data = Session().dump_state()
+        eq_(len(data), 5)
+        s = Session()
+        type_keys(s, 'abc')
+        s.load_state(data)
+        eq_(s.text, '')
+
+    def test_move_at_every_key_random(self):
+        # Moving the state to a fresh session after any key, like a user
+        # routed to another server mid-word, changes nothing.
+        rng = random.Random(5)
+        macros = MacroTable({'ko': 'không', 'dd': 'được'})
+        for _ in range(100):
+            sequence = ''.join(rng.choice('aeoiuydwsfrxjkntg <')
+                               for _ in range(rng.randint(1, 20)))
+            s = Session(macros=macros)
+            moved = Session(macros=macros)
+            for key in sequence:
+                if key == '<':
+                    s.backspace()
+                else:
+                    s.process_key(key)
+                other = Session(macros=macros)
+                other.load_state(moved.dump_state())
+                moved = other
+                if key == '<':
+                    moved.backspace()
+                else:
+                    moved.process_key(key)
+            eq_(moved.commit(), s.commit())
+
+    @raises(ValueError)
+    def test_bad_magic(self):
+        Session().load_state(b'\x00\x01\x00\x00\x00')
+
+    @raises(ValueError)
+    def test_unsupported_version(self):
+        Session().load_state(b'\xb6\x63\x00\x00\x00')
+
+    @raises(ValueError)
+    def test_truncated(self):
+        s = Session()
+        type_keys(s, 'con meof')
+        Session().load_state(s.dump_state()[:-1])
+
+    @raises(ValueError)
+    def test_trailing_data(self):
+        Session().load_state(Session().dump_state() + b'\x00')
+
+
+class TestSessionMaxSyllableLength():
+    def test_overlong_word(self):
+        s = Session()
+        type_keys(s, 'a' * 100)
+        eq_(s.text, 'a' * 100)
+        ok_(len(s.string) <= 64)
+        type_keys(s, ' meof')
+        eq_(s.commit(), 'a' * 100 + ' mèo')
+
+    def test_delta(self):
+        s = Session(max_syllable_length=4)
+        text = ''
+        for key in 'dduowngf' + 'aw' * 10:
+            delta = s.process_key_delta(key)
+            text = text[:len(text) - delta.backspaces] + delta.insert
+            eq_(text, s.text)
+        eq_(text, 'dduowngf' + 'aw' * 10)
+
+    def test_backspace(self):
+        s = Session(max_syllable_length=7)
+        type_keys(s, 'tieengsxyzxyz')
+        eq_(s.text, 'tieengsxyzxyz')
+        for _ in range(6):
+            s.backspace()
+        eq_(s.text, 'tiếng')
+
+        s = Session(max_syllable_length=2)
+        type_keys(s, 'ddaaf')
+        eq_(s.text, 'ddaaf')
+        for _ in range(3):
+            s.backspace()
+        eq_(s.text, 'đ')
+
+    def test_cache(self):
+        cache = bogo.TransitionCache(max_syllable_length=3)
+        s = Session(cache=cache)
+        eq_(s.max_syllable_length, 3)
+        type_keys(s, 'meof dda')
+        eq_(s.text, 'meof đa')
+        eq_(cache.process_sequence('meof dda'), 'meof đa')
+
+    def test_same_as_process_sequence_random(self):
+        rng = random.Random(11)
+        for _ in range(300):
+            limit = rng.randint(1, 8)
+            sequence = ''.join(rng.choice('aeowdsfn ')
+                               for _ in range(rng.randint(1, 60)))
+            s = Session(max_syllable_length=limit)
+            type_keys(s, sequence)
+            eq_(s.text, bogo.process_sequence(sequence,
+                                              max_syllable_length=limit))
+
+            other = Session(max_syllable_length=limit)
+            other.load_state(s.dump_state())
+            eq_(other.commit(), s.commit())
+
+    @raises(ValueError)
+    def test_bad_limit(self):
+        Session(max_syllable_length=0)
+
+
+class TestSessionDictionaryProfile():
+    def setup(self):
+        self.profile = DictionaryProfile.load(
+            os.path.join(os.path.dirname(__file__), 'sequences', 'vi.dic'))
+
+    def test_rejected_word_reads_as_typed(self):
+        s = Session(skip_non_vietnamese=self.profile)
+        type_keys(s, 'Wws ')
+        eq_(s.text, bogo.process_sequence('Wws ',
+                                          skip_non_vietnamese=self.profile))
+        eq_(s.text, 'Wws ')
+
+    def test_backspace(self):
+        s = Session(skip_non_vietnamese=self.profile)
+        type_keys(s, 'vieetj')
+        eq_(s.backspace(), 'việ')
+        eq_(s.process_key('t'), 'việt')
+        eq_(s.commit(), 'việt')
+
+    def test_same_as_process_sequence_random(self):
+        rng = random.Random(5)
+        for _ in range(300):
+            sequence = ''.join(rng.choice('aeoiuydwsfrxjtnghcbqAW [')
+                               for _ in range(rng.randint(1, 20)))
+            s = Session(skip_non_vietnamese=self.profile)
+            type_keys(s, sequence)
+            eq_(s.commit(), bogo.process_sequence(
+                sequence, skip_non_vietnamese=self.profile))
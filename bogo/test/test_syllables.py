@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+from nose.tools import eq_
+import codecs
+import os
+
+from bogo import accent, mark, utils
+from bogo.syllables import iter_syllables, syllables_many
+Accent = accent.Accent
+Mark = mark.Mark
+
+
+class TestIterSyllables():
+    def test_spans(self):
+        text = 'Tiếng Việt, ok?'
+        syllables = list(iter_syllables(text))
+        eq_([text[s.start:s.end] for s in syllables], ['Tiếng', 'Việt'])
+
+    def test_components(self):
+        syllable = next(iter_syllables('đường'))
+        eq_(syllable.components, ('đ', 'ườ', 'ng'))
+        eq_(syllable.tone, Accent.GRAVE)
+        eq_(syllable.marks, (Mark.HORN, Mark.HORN))
+
+    def test_case(self):
+        syllable = next(iter_syllables('NGHIÊNG'))
+        eq_(syllable.components, ('NGH', 'IÊ', 'NG'))
+        eq_(syllable.tone, Accent.NONE)
+
+    def test_gi_qu(self):
+        eq_([s.components for s in iter_syllables('gì giá gin quốc')],
+            [('g', 'ì', ''), ('gi', 'á', ''), ('g', 'i', 'n'),
+             ('qu', 'ố', 'c')])
+
+    def test_skipped(self):
+        eq_(list(iter_syllables('ok system aaaa 123 x')), [])
+
+    def test_same_as_separate(self):
+        for name in ('vi.dic', 'vi-DauCu.dic'):
+            path = os.path.join(os.path.dirname(__file__), 'sequences', name)
+            with codecs.open(path, encoding='utf-8') as f:
+                words = [line.strip() for line in f if len(line.strip()) > 1]
+            for word in words:
+                syllables = list(iter_syllables(word))
+                eq_(len(syllables), 1, word)
+                eq_(list(syllables[0].components), utils.separate(word))
+                eq_(syllables[0].tone, accent.get_accent_string(word))
+
+    def test_many(self):
+        result = syllables_many(['con mèo', '', 'ok'])
+        eq_([[s.vowel for s in syllables] for syllables in result],
+            [['o', 'èo'], [], []])
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+from nose.tools import eq_, ok_, raises
+from nose.plugins.skip import SkipTest
+import os
+import shutil
+import tempfile
+
+import bogo
+from bogo.macros import MacroTable
+from bogo.tables import EngineTables, pack_tables, write_tables
+from bogo.wordfilter import BloomFilter, _HEADER
+
+
+class TestEngineTables():
+    def test_default(self):
+        tables = EngineTables(pack_tables())
+        eq_(tables.section_names, ['rules'])
+        eq_(tables.rules, bogo.get_telex_definition())
+        ok_(tables.foreign_words is None)
+        eq_(tables.process_sequence('con meof'), 'con mèo')
+
+    def test_vni_and_foreign_words(self):
+        data = pack_tables(bogo.get_vni_definition(),
+                           BloomFilter.from_words(['nose']))
+        tables = EngineTables(data)
+        eq_(tables.process_sequence('nose meo2'), 'nose mèo')
+        eq_(tables.process_sequence('nose1', skip_non_vietnamese=False),
+            'nosé')
+
+    def test_alignment(self):
+        data = pack_tables(foreign_words=['bias'])
+        tables = EngineTables(data)
+        for name in tables.section_names:
+            eq_(tables._sections[name][0] % 8, 0)
+
+    def test_filter_is_not_copied(self):
+        buffer = bytearray(pack_tables(foreign_words=['bias']))
+        tables = EngineTables(buffer)
+        ok_('bias' in tables.foreign_words)
+        offset = tables._sections['foreign_words'][0]
+        for index in range(offset + _HEADER.size, len(buffer)):
+            buffer[index] = 0
+        ok_('bias' not in tables.foreign_words)
+        tables.close()
+
+    def test_file(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'tables.bin')
+            write_tables(path, foreign_words=['bias'])
+            with EngineTables.open(path) as tables:
+                eq_(tables.process_sequence('bias nafy'), 'bias này')
+        finally:
+            shutil.rmtree(directory)
+
+    def test_macros_and_max_syllable_length(self):
+        tables = EngineTables(pack_tables(foreign_words=['bias']))
+        macros = MacroTable({'ko': 'không'})
+        eq_(tables.process_sequence('ko bias nafy', macros=macros),
+            'không bias này')
+        eq_(tables.process_sequence('nafy', max_syllable_length=3), 'nafy')
+        eq_(tables.process_sequence('nafy', max_syllable_length=None), 'này')
+
+    @raises(TypeError)
+    def test_read_only(self):
+        tables = EngineTables(pack_tables(foreign_words=['bias']))
+        tables.foreign_words.add('nose')
+
+    def test_shared_memory(self):
+        try:
+            from multiprocessing import shared_memory
+        except ImportError:
+            raise SkipTest("multiprocessing.shared_memory is not available")
+        data = pack_tables(foreign_words=['bias'])
+        shm = shared_memory.SharedMemory(create=True, size=len(data))
+        try:
+            shm.buf[:len(data)] = data
+            with EngineTables(shm.buf) as tables:
+                eq_(tables.process_sequence('bias nafy'), 'bias này')
+            shm.close()
+        finally:
+            shm.unlink()
+
+    @raises(ValueError)
+    def test_bad_magic(self):
+        EngineTables(b'\0' * 64)
+
+    @raises(ValueError)
+    def test_truncated(self):
+        EngineTables(pack_tables()[:30])
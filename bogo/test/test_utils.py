@@ -47,3 +47,27 @@ def test_separate():
     eq_(separate('xẻng'), ['x', 'ẻ', 'ng'])
     eq_(separate('xoáy'), ['x', 'oáy', ''])
     eq_(separate('quây'), ['qu', 'ây', ''])
+
+
+def test_separate_long():
+    # No recursion, so no limit on the length.
+    eq_(separate('a' * 10000), ['', 'a' * 10000, ''])
+    eq_(separate('b' * 5000 + 'a' * 5000 + 'c'), ['b' * 5000, 'a' * 5000, 'c'])
+
+
+def test_apply_case():
+    eq_(apply_case('viet', 'việt'), 'việt')
+    eq_(apply_case('Viet', 'việt'), 'Việt')
+    eq_(apply_case('VIET', 'việt'), 'VIỆT')
+    eq_(apply_case('V', 'việt'), 'Việt')
+
+
+def test_char_table():
+    table = char_table(lambda char: char.upper(), 'aB')
+    eq_(table, {ord('a'): 'A'})
+    eq_('abc'.translate(table), 'Abc')
+
+
+def test_dense_table():
+    table = dense_table({ord('a'): 'b', ord('c'): None})
+    eq_('abcd'.translate(table), 'bbd')
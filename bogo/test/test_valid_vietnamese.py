@@ -1,10 +1,14 @@
 # -*- coding: utf-8 -*-
 
 from __future__ import unicode_literals
-from bogo.validation import is_valid_string
-from nose.tools import ok_
+from bogo.validation import is_valid_string, is_valid_sound_tuple, \
+    get_profile, PROFILES, DEFAULT_PROFILE, DictionaryProfile
+import bogo
+import random
+from nose.tools import eq_, ok_, raises
 import os
 import codecs
+from bogo import accent, utils, validation
 
 
 def test_from_dict():
@@ -64,30 +68,54 @@ def test_ch_ending():
     assert is_valid_string("hoảch", final_form=True) is False
 
 
-# def test_ng_ending():
-#     assert is_valid_string("thing", final_form=True) is False
-#     assert is_valid_string("thinh", final_form=True) is True
+def test_ng_ending():
+    strict = get_profile('strict').is_valid_string
+    assert strict("thing", final_form=True) is False
+    assert strict("thinh", final_form=True) is True
 
-#     assert is_valid_string("thương", final_form=True) is True
-#     assert is_valid_string("thơng", final_form=True) is False
+    assert strict("thương", final_form=True) is True
+    assert strict("thơng", final_form=True) is False
 
+    # Not enforced by default.
+    assert is_valid_string("thing", final_form=True)
 
-# def test_nh_ending():
-#     assert is_valid_string("nhanh")
-#     assert is_valid_string("lênh")
-#     assert is_valid_string("huỳnh")
-#     assert is_valid_string("tỉnh")
-#     assert is_valid_string("hoành")
-#     assert is_valid_string("xuềnh")
-#     assert is_valid_string("quỳnh")
 
-#     assert is_valid_string("ỳnh") is False
-#     assert is_valid_string("nhănh") is False
-#     assert is_valid_string("nhânh") is False
-#     assert is_valid_string("nhenh") is False
-#     assert is_valid_string("nhơnh") is False
-#     assert is_valid_string("nhunh") is False
-#     assert is_valid_string("nhưnh") is False
+def test_nh_ending():
+    strict = get_profile('strict').is_valid_string
+    assert strict("nhanh")
+    assert strict("lênh")
+    assert strict("huỳnh")
+    assert strict("tỉnh")
+    assert strict("hoành")
+    assert strict("xuềnh")
+    assert strict("quỳnh")
+
+    assert strict("ỳnh") is False
+    assert strict("nhănh") is False
+    assert strict("nhânh") is False
+    assert strict("nhenh") is False
+    assert strict("nhơnh") is False
+    assert strict("nhunh") is False
+    assert strict("nhưnh") is False
+
+
+def test_first_consonant_spelling():
+    strict = get_profile('strict').is_valid_string
+    assert strict("kể") and strict("kỳ") and strict("cá")
+    assert strict("ghế") and strict("gà") and strict("nghĩ")
+    assert strict("ké", final_form=False)
+
+    assert strict("ka") is False
+    assert strict("cê") is False
+    assert strict("ghà") is False
+    assert strict("ngê") is False
+    assert strict("ngi") is False
+    assert strict("ngì") is False
+    assert strict("ngy") is False
+    assert strict("nghì") and strict("nguy") and strict("ngà")
+    assert strict("ka", final_form=False) is False
+
+    assert is_valid_string("ka")
 
 
 def test_non_final():
@@ -122,3 +150,122 @@ def test_single_consonant():
 def test_non_terminal_vowels():
     assert is_valid_string("bang")
     assert is_valid_string("baing") is False
+
+
+def test_abbreviation_profiles():
+    for name in ('strict', 'lenient'):
+        profile = get_profile(name)
+        assert profile.is_valid_string("đm") is False
+        assert profile.is_valid_string("ng", final_form=False)
+        assert profile.is_valid_string("bcd", final_form=False) is False
+    assert get_profile('abbreviations').is_valid_string("đm")
+
+
+def test_names_profile():
+    names = get_profile('names')
+    assert names.is_valid_string("đắk")
+    assert names.is_valid_string("krông")
+    assert names.is_valid_string("đàk") is False
+    assert is_valid_string("đắk") is False
+    eq_(bogo.process_sequence('ddawsk lawsk', skip_non_vietnamese=names),
+        'đắk lắk')
+    eq_(bogo.process_sequence('ddawsk lawsk'), 'ddawsk lawsk')
+
+
+def test_default_profile_matches_function_chain():
+    ok_(PROFILES['abbreviations'] is DEFAULT_PROFILE)
+    rng = random.Random(0)
+    consonants = sorted(set(['', 'x', 'bc', 'K', 'NG', 'Gh']) |
+                        validation.CONSONANTS |
+                        validation.TERMINAL_CONSONANTS)
+    vowels = sorted(validation.VOWELS)
+    chars = utils.VOWELS + utils.VOWELS.upper() + 'đb'
+    for _ in range(20000):
+        if rng.random() < 0.5:
+            vowel = ''.join(rng.choice(chars)
+                            for _ in range(rng.randint(0, 3)))
+        else:
+            vowel = rng.choice(vowels)
+            i = rng.randint(0, len(vowel) - 1)
+            vowel = vowel[:i] + \
+                accent.add_accent_char(vowel[i], rng.randint(0, 5)) + \
+                vowel[i + 1:]
+        sound_tuple = (rng.choice(consonants), vowel, rng.choice(consonants))
+        for final_form in (True, False):
+            eq_(DEFAULT_PROFILE.is_valid_combination(sound_tuple, final_form),
+                is_valid_sound_tuple(sound_tuple, final_form))
+
+
+def test_profile_in_engine():
+    strict = get_profile('strict')
+    eq_(bogo.process_sequence('kas cas', skip_non_vietnamese=strict),
+        'kas cá')
+    eq_(bogo.process_sequence('kas cas'), 'ká cá')
+    eq_(bogo.process_key('', 'd', '', None, strict), ('d', 'd'))
+
+
+@raises(ValueError)
+def test_unknown_profile():
+    get_profile('nope')
+
+
+def _dictionary_profile(name):
+    return DictionaryProfile.load(
+        os.path.join(os.path.dirname(__file__), 'sequences', name))
+
+
+def test_dictionary_profile():
+    profile = DictionaryProfile(['thước', 'Việt', 'nguyễn'])
+    eq_(len(profile), 3)
+    ok_(profile.is_valid_string('việt'))
+    ok_(profile.is_valid_string('VIỆT'))
+    ok_(profile.is_valid_string('viết') is False)
+    ok_(profile.is_valid_string('thưoc') is False)
+    for partial in ('th', 'thu', 'thuơ', 'thươc', 'ng', 'nguy', 'Vie'):
+        ok_(profile.is_valid_string(partial, final_form=False), partial)
+    for partial in ('b', 'thi', 'thươn', 'viên', 'nga'):
+        ok_(profile.is_valid_string(partial, final_form=False) is False,
+            partial)
+
+
+def test_dictionary_profile_in_engine():
+    profile = DictionaryProfile(['thước', 'việt', 'kẻ'])
+    eq_(bogo.process_sequence('thuwowcs thuwoc', skip_non_vietnamese=profile),
+        'thước thuwoc')
+    eq_(bogo.process_sequence('thuwoc'), 'thưoc')
+    eq_(bogo.process_sequence('Vieejt nam kee', skip_non_vietnamese=profile),
+        'Việt nam kee')
+
+    session = bogo.Session(skip_non_vietnamese=profile)
+    for key in 'thuwoc vieejt ':
+        session.process_key(key)
+    eq_(session.text, 'thuwoc việt ')
+
+
+def test_dictionary_profile_tone_placement():
+    # The engine places tones the old way (hòa), dictionaries may use
+    # either.
+    profile = DictionaryProfile(['hoà', 'thuỷ', 'khỏe'])
+    ok_(profile.is_valid_string('hòa'))
+    ok_(profile.is_valid_string('hoà'))
+    ok_(profile.is_valid_string('khoẻ'))
+    eq_(bogo.process_sequence('hoaf thuyr khoer', skip_non_vietnamese=profile),
+        'hòa thủy khỏe')
+
+
+def _check_sequences(profile):
+    path = os.path.join(os.path.dirname(__file__), 'DauCu.sequences')
+    with codecs.open(path, encoding='utf-8') as f:
+        for line in f:
+            keys, expected = line.rstrip('\n').split(':', 1)
+            eq_(bogo.process_sequence(keys, skip_non_vietnamese=profile),
+                expected)
+
+
+def test_dictionary_profile_sequences():
+    _check_sequences(_dictionary_profile('vi-DauCu.dic'))
+
+
+def test_dictionary_profile_sequences_vi_dic():
+    # vi.dic spells the tones of oa, oe and uy the new way.
+    _check_sequences(_dictionary_profile('vi.dic'))
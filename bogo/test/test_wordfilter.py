@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+from nose.tools import eq_, ok_, raises
+import io
+import os
+import random
+import shutil
+import sys
+import tempfile
+
+import bogo
+from bogo.cache import TransitionCache
+from bogo.wordfilter import BloomFilter, main
+
+
+class TestBloomFilter():
+    def test_no_false_negatives(self):
+        words = ['word%d' % i for i in range(1000)]
+        bloom = BloomFilter.from_words(words)
+        for word in words:
+            ok_(word in bloom)
+
+    def test_case_insensitive(self):
+        bloom = BloomFilter.from_words(['Bias'])
+        ok_('bias' in bloom)
+        ok_('BIAS' in bloom)
+
+    def test_fp_rate(self):
+        words = ['word%d' % i for i in range(2000)]
+        bloom = BloomFilter.from_words(words, fp_rate=0.01)
+        rng = random.Random(0)
+        tries = 10000
+        hits = sum('other%d' % rng.randint(0, 10 ** 9) in bloom
+                   for _ in range(tries))
+        ok_(hits < tries * 0.02)
+
+    def test_size(self):
+        bloom = BloomFilter.from_words(['word%d' % i for i in range(1000)],
+                                       fp_rate=0.01)
+        # About 9.6 bits per word for 1%.
+        ok_(1150 < bloom.nbytes < 1250)
+
+    def test_round_trip(self):
+        bloom = BloomFilter.from_words(['bias', 'nose'])
+        copy = BloomFilter.from_bytes(bloom.to_bytes())
+        eq_((copy.size_bits, copy.num_hashes),
+            (bloom.size_bits, bloom.num_hashes))
+        ok_('nose' in copy)
+
+    @raises(ValueError)
+    def test_bad_bytes(self):
+        BloomFilter.from_bytes(b'not a filter at all')
+
+    @raises(ValueError)
+    def test_bad_fp_rate(self):
+        BloomFilter.from_words(['a'], fp_rate=0)
+
+    def test_builder(self):
+        directory = tempfile.mkdtemp()
+        stdout, sys.stdout = sys.stdout, io.StringIO()
+        try:
+            wordlist = os.path.join(directory, 'words.txt')
+            output = os.path.join(directory, 'words.bloom')
+            with open(wordlist, 'w') as f:
+                f.write('# comment\nbias\n\nnose\n')
+            eq_(main([wordlist, output, '--fp-rate', '0.01']), 0)
+            ok_(sys.stdout.getvalue().startswith('2 words'))
+            bloom = BloomFilter.load(output)
+            ok_('bias' in bloom and 'nose' in bloom)
+        finally:
+            sys.stdout = stdout
+            shutil.rmtree(directory)
+
+
+class TestForeignWords():
+    def test_process_sequence(self):
+        words = BloomFilter.from_words(['bias', 'nose'])
+        eq_(bogo.process_sequence('bias nose nafy'), 'bía nóe này')
+        eq_(bogo.process_sequence('Bias nose nafy', foreign_words=words),
+            'Bias nose này')
+
+    def test_set(self):
+        eq_(bogo.process_sequence('bias meof', foreign_words={'bias'}),
+            'bias mèo')
+
+    def test_skips_engine(self):
+        with bogo.profiling() as stats:
+            bogo.process_sequence('nose', foreign_words={'nose'})
+        eq_(stats.keystrokes, 0)
+
+    def test_cache(self):
+        cache = TransitionCache()
+        eq_(cache.process_sequence('nose nose', foreign_words={'nose'}),
+            'nose nose')
+        eq_(cache.info().misses, 0)
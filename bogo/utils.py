@@ -103,15 +103,17 @@ def separate(string):
     >>> separate('ohmyfkinggod')
     ['ohmyfkingg','o','d']
     """
-    def atomic_separate(string, last_chars, last_is_vowel):
-        if string == "" or (last_is_vowel != is_vowel(string[-1])):
-            return (string, last_chars)
-        else:
-            return atomic_separate(string[:-1],
-                                   string[-1] + last_chars, last_is_vowel)
-
-    head, last_consonant = atomic_separate(string, "", False)
-    first_consonant, vowel = atomic_separate(head, "", True)
+    def atomic_separate(string, last_is_vowel):
+        # Split off the longest tail of vowels, or of non-vowels. A loop
+        # rather than recursion so that long strings cannot overflow the
+        # stack.
+        index = len(string)
+        while index and is_vowel(string[index - 1]) == last_is_vowel:
+            index -= 1
+        return string[:index], string[index:]
+
+    head, last_consonant = atomic_separate(string, False)
+    first_consonant, vowel = atomic_separate(head, True)
 
     if last_consonant and not (vowel + first_consonant):
         comps = [last_consonant, '', '']  # ['', '', b] -> ['b', '', '']
@@ -129,3 +131,38 @@ def separate(string):
         comps[1] = comps[1][1:]
 
     return comps
+
+
+def apply_case(model, word):
+    """
+    Return `word` in the case of `model`: lowercase, UPPERCASE (if
+    longer than one letter) or Capitalized.
+    """
+    if model.islower():
+        return word
+    if model.isupper() and len(model) > 1:
+        return word.upper()
+    if model[:1].isupper():
+        return word[:1].upper() + word[1:]
+    return word
+
+
+def char_table(func, chars):
+    """
+    Return a str.translate() table doing what `func` does to each of
+    `chars`.
+    """
+    return dict((ord(char), func(char)) for char in chars
+                if func(char) != char)
+
+
+def dense_table(table):
+    """
+    Return the str.translate() table `table`, a dict, as a list, which
+    translate() looks up faster. Code points past its end raise
+    IndexError and are left alone.
+    """
+    dense = list(range(max(table) + 1))
+    for code, value in table.items():
+        dense[code] = value
+    return dense
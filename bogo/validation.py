@@ -26,8 +26,10 @@ or not (i.e. can be pronounced by a Vietnamese speaker).
 """
 
 from __future__ import unicode_literals
+import codecs
 import collections
 from bogo import accent, mark, utils
+from bogo.normalization import normalize_tone_placement, OLD
 Accent = accent.Accent
 
 
@@ -78,7 +80,7 @@ def is_valid_string(string, final_form=True):
 
 
 def is_valid_combination(comp, final_form=True):
-    return is_valid_sound_tuple(comp, final_form)
+    return DEFAULT_PROFILE.is_valid_combination(comp, final_form)
 
 
 def is_valid_sound_tuple(sound_tuple, final_form=True):
@@ -161,33 +163,53 @@ def has_valid_vowel(sound_tuple):
         return not (sound_tuple.last_consonant == 'c' and
                     vowel_wo_accent in ('i', 'ơ'))
 
-    def has_valid_ng_ending():
-        # 'ng' can't go after i, ơ
-        return not (sound_tuple.last_consonant == 'ng' and
-                    vowel_wo_accent in ('i', 'ơ'))
-
-    def has_valid_nh_ending():
-        # 'nh' can only go after a, ê, uy, i, oa, quy
-        has_y_but_is_not_quynh = vowel_wo_accent == 'y' and \
-            sound_tuple.first_consonant != 'qu'
-
-        has_invalid_vowel = not vowel_wo_accent in \
-            ('a', 'ê', 'i', 'uy', 'oa', 'uê', 'y')
-
-        return not \
-            (sound_tuple.last_consonant == 'nh' and
-                (has_invalid_vowel or has_y_but_is_not_quynh))
-
     # The ng and nh rules are not really phonetic but spelling rules.
     # Including them may hinder typing freedom and may prevent typing
-    # unique local names.
-    # FIXME: Config key, anyone?
+    # unique local names, so they are only used by the 'strict'
+    # validation profile.
     return \
         has_valid_vowel_form() and \
         has_valid_ch_ending() and \
         has_valid_c_ending()
-        # has_valid_ng_ending() and \
-        # has_valid_nh_ending()
+
+
+def has_valid_ng_ending(sound_tuple):
+    # 'ng' can't go after i, ơ
+    vowel_wo_accent = accent.remove_accent_string(sound_tuple.vowel)
+    return not (sound_tuple.last_consonant == 'ng' and
+                vowel_wo_accent in ('i', 'ơ'))
+
+
+def has_valid_nh_ending(sound_tuple):
+    # 'nh' can only go after a, ê, uy, i, oa, quy
+    vowel_wo_accent = accent.remove_accent_string(sound_tuple.vowel)
+    has_y_but_is_not_quynh = vowel_wo_accent == 'y' and \
+        sound_tuple.first_consonant != 'qu'
+
+    has_invalid_vowel = not vowel_wo_accent in \
+        ('a', 'ê', 'i', 'uy', 'oa', 'uê', 'y')
+
+    return not \
+        (sound_tuple.last_consonant == 'nh' and
+            (has_invalid_vowel or has_y_but_is_not_quynh))
+
+
+def has_valid_first_consonant_spelling(sound_tuple):
+    # k, gh and ngh go before i, e, ê (and y for k), c, g and ng
+    # before the other vowels.
+    first_vowel = mark.strip(sound_tuple.vowel[:1])
+    consonant = sound_tuple.first_consonant
+    if consonant == 'k':
+        return first_vowel in ('i', 'e', 'y')
+    if consonant == 'c':
+        return first_vowel not in ('i', 'e', 'y')
+    if consonant in ('gh', 'ngh'):
+        return first_vowel in ('i', 'e')
+    if consonant == 'ng':
+        return first_vowel not in ('i', 'e', 'y')
+    if consonant == 'g':
+        return first_vowel != 'e'
+    return True
 
 
 def has_valid_accent(sound_tuple):
@@ -196,3 +218,225 @@ def has_valid_accent(sound_tuple):
     # These consonants can only go with ACUTE, DOT accents
     return not (sound_tuple.last_consonant in ('c', 'p', 't', 'ch') and
                 not akzent in (Accent.ACUTE, Accent.DOT))
+
+
+_ACCENT_FREE = utils.char_table(accent.remove_accent_char, utils.VOWELS)
+_STRIPPED = utils.char_table(mark.strip, utils.VOWELS + 'đ')
+_ACCENTS = dict((char, accent.get_accent_char(char))
+                for char in utils.VOWELS
+                if accent.get_accent_char(char) != Accent.NONE)
+
+_STOP_CONSONANTS = set(['c', 'p', 't', 'ch', 'k'])
+
+
+class ValidationProfile(object):
+    """
+    A set of validation rules compiled into lookup tables, so that
+    checking a word costs a few set lookups whichever rules are used.
+
+    Args:
+        name: the profile's name.
+        spelling_rules: also enforce spelling conventions: k/c, gh/g and
+            ngh/ng before front vowels, and which vowels can go before
+            'ng' and 'nh' at the end of a word.
+        abbreviations: accept words without any vowel.
+        extra_consonants, extra_terminal_consonants: consonants accepted
+            on top of CONSONANTS and TERMINAL_CONSONANTS, e.g. for
+            ethnic minority place names (Đắk Lắk, Krông Pắk).
+
+    A profile can be passed as process_key()'s and process_sequence()'s
+    `skip_non_vietnamese` argument to validate with it instead of the
+    default profile.
+    """
+
+    # Whether process_sequence() and sessions also check finished words
+    # with is_valid_string() and leave them unconverted if they fail.
+    check_final_form = False
+
+    def __init__(self, name, spelling_rules=False, abbreviations=True,
+                 extra_consonants=(), extra_terminal_consonants=()):
+        self.name = name
+        self.spelling_rules = spelling_rules
+        self.abbreviations = abbreviations
+
+        consonants = CONSONANTS | set(extra_consonants) | set([''])
+        terminal_consonants = TERMINAL_CONSONANTS | \
+            set(extra_terminal_consonants) | set([''])
+
+        self.consonant_prefixes = frozenset(
+            consonant[:i] for consonant in consonants
+            for i in range(len(consonant) + 1))
+        self._terminal_consonants = frozenset(terminal_consonants)
+        self._stop_consonants = frozenset(
+            _STOP_CONSONANTS & terminal_consonants)
+
+        # (first consonant, vowel without marks, has last consonant)
+        # combinations that may still become a valid word.
+        partial = set()
+        for first in consonants:
+            for vowel in STRIPPED_VOWELS:
+                sound_tuple = SoundTuple(first, vowel, '')
+                if spelling_rules and \
+                        not has_valid_first_consonant_spelling(sound_tuple):
+                    continue
+                partial.add((first, vowel, False))
+                if vowel not in STRIPPED_TERMINAL_VOWELS:
+                    partial.add((first, vowel, True))
+        self._partial = frozenset(partial)
+
+        # (first consonant, vowel without accent, last consonant)
+        # combinations of complete words, the accent is checked apart.
+        syllables = set()
+        for first in consonants:
+            for vowel in VOWELS:
+                for last in terminal_consonants:
+                    sound_tuple = SoundTuple(first, vowel, last)
+                    if not has_valid_vowel(sound_tuple):
+                        continue
+                    if spelling_rules and not (
+                            has_valid_first_consonant_spelling(sound_tuple) and
+                            has_valid_ng_ending(sound_tuple) and
+                            has_valid_nh_ending(sound_tuple)):
+                        continue
+                    syllables.add((first, vowel, last))
+        self._syllables = frozenset(syllables)
+
+    def __repr__(self):
+        return "ValidationProfile(%r)" % self.name
+
+    def is_valid_string(self, string, final_form=True):
+        return self.is_valid_combination(utils.separate(string), final_form)
+
+    def is_valid_combination(self, comp, final_form=True):
+        """Same as is_valid_combination() with this profile's rules."""
+        first, vowel, last = comp
+        first = first.lower()
+        vowel = vowel.lower()
+        last = last.lower()
+
+        if not vowel:
+            return self.abbreviations or \
+                (not final_form and not last and
+                 first in self.consonant_prefixes)
+
+        if not final_form:
+            return last in self._terminal_consonants and \
+                (first, vowel.translate(_STRIPPED), last != '') in \
+                self._partial
+
+        if (first, vowel.translate(_ACCENT_FREE), last) not in \
+                self._syllables:
+            return False
+        if last in self._stop_consonants:
+            return _last_accent(vowel) in (Accent.ACUTE, Accent.DOT)
+        return True
+
+
+def _last_accent(vowel):
+    for char in reversed(vowel):
+        if char in _ACCENTS:
+            return _ACCENTS[char]
+    return Accent.NONE
+
+
+class DictionaryProfile(ValidationProfile):
+    """
+    A validation profile accepting the words of a dictionary only, e.g.
+    to keep 'thưoc' or syllables that exist in no word from being typed.
+
+    Args:
+        words: the accepted syllables, in any case.
+        name (optional): the profile's name.
+
+    While a word is typed, its first consonant, its vowel without marks
+    and tones and its last consonant so far are looked up in a set of
+    those of the dictionary's words and their prefixes. A finished word
+    must be in the dictionary, or process_sequence() and sessions leave
+    it as it was typed. Words are compared with their tone in the old
+    position, which the engine uses, so a dictionary may spell them
+    either way (hòa or hoà).
+
+    >>> profile = DictionaryProfile.load('vi.dic')
+    >>> bogo.process_sequence('thuwowcs thuwoc', skip_non_vietnamese=profile)
+    'thước thuwoc'
+    """
+
+    check_final_form = True
+
+    def __init__(self, words, name='dictionary'):
+        self.name = name
+        self.spelling_rules = False
+        self.abbreviations = False
+
+        self._words = frozenset(normalize_tone_placement(word.lower(), OLD)
+                                for word in words)
+        firsts = set()
+        prefixes = set()
+        for word in self._words:
+            first, vowel, last = utils.separate(word)
+            firsts.add(first)
+            vowel = vowel.translate(_STRIPPED)
+            for i in range(1, len(vowel) + 1):
+                prefixes.add((first, vowel[:i], ''))
+            for i in range(1, len(last) + 1):
+                prefixes.add((first, vowel, last[:i]))
+
+        self.consonant_prefixes = frozenset(
+            first[:i] for first in firsts for i in range(len(first) + 1))
+        self._prefixes = frozenset(prefixes)
+
+    def __repr__(self):
+        return "DictionaryProfile(%r, %d words)" % (self.name,
+                                                     len(self._words))
+
+    def __len__(self):
+        return len(self._words)
+
+    @classmethod
+    def load(cls, path, name=None):
+        """Read a word list, one word per line."""
+        with codecs.open(path, 'r', 'utf-8') as f:
+            words = [line.strip() for line in f
+                     if line.strip() and not line.startswith('#')]
+        return cls(words, name or path)
+
+    def is_valid_string(self, string, final_form=True):
+        if final_form:
+            return normalize_tone_placement(string.lower(), OLD) in \
+                self._words
+        return self.is_valid_combination(utils.separate(string), False)
+
+    def is_valid_combination(self, comp, final_form=True):
+        first, vowel, last = comp
+        if final_form:
+            return self.is_valid_string(first + vowel + last)
+        first = first.lower()
+        if not vowel:
+            return not last and first in self.consonant_prefixes
+        return (first, vowel.lower().translate(_STRIPPED), last.lower()) in \
+            self._prefixes
+
+
+PROFILES = dict((profile.name, profile) for profile in [
+    # Dictionary spelling only.
+    ValidationProfile('strict', spelling_rules=True, abbreviations=False),
+    # Anything that can be pronounced.
+    ValidationProfile('lenient', abbreviations=False),
+    # Pronounceable words and vowel-less abbreviations (the default).
+    ValidationProfile('abbreviations'),
+    # Same, plus consonants found in local names.
+    ValidationProfile('names',
+                      extra_consonants=['bl', 'f', 'j', 'kl', 'kr', 'pl',
+                                        'w', 'z'],
+                      extra_terminal_consonants=['k']),
+])
+
+DEFAULT_PROFILE = PROFILES['abbreviations']
+
+
+def get_profile(name):
+    """Return the validation profile called `name`."""
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError("Unknown validation profile: %r" % name)
@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of ibus-bogo project.
+#
+# Copyright (C) 2012 Long T. Dam <longdt90@gmail.com>
+# Copyright (C) 2012-2013 Trung Ngo <ndtrung4419@gmail.com>
+# Copyright (C) 2013 Duong H. Nguyen <cmpitg@gmail.com>
+#
+# ibus-bogo is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ibus-bogo is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ibus-bogo.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+"""
+Foreign word filters for process_sequence().
+
+Many English words are also valid Telex input ('bias' -> 'bía', 'nose'
+-> 'nóe'...), so phonotactic validation alone cannot leave them alone.
+A word filter is any object supporting `word in filter` for lowercased
+raw words; process_sequence() copies matching words through without
+running the engine on them:
+
+>>> words = BloomFilter.from_words(['bias', 'nose'])
+>>> bogo.process_sequence('bias nafy', foreign_words=words)
+'bias này'
+
+A plain set works too. BloomFilter is the compact option for large word
+lists, at the price of a configurable rate of false positives (words
+wrongly taken as foreign). Build one from a word list, one word per
+line, with:
+
+    python -m bogo.wordfilter [--fp-rate 0.001] words.txt words.bloom
+
+and load it with BloomFilter.load('words.bloom').
+"""
+
+from __future__ import unicode_literals, print_function
+import codecs
+import hashlib
+import math
+import struct
+import sys
+
+
+_MAGIC = b'BOGOBLM1'
+_HEADER = struct.Struct('<8sQI')
+_HASH = struct.Struct('<QQ')
+
+
+def _memoryview(buffer):
+    try:
+        return memoryview(buffer)
+    except TypeError:
+        # Python 2's mmap only has the old buffer interface, so it cannot
+        # be used in place there.
+        return memoryview(buffer[:])
+
+
+class _Py2ByteView(object):
+    """
+    A Python 2 memoryview indexed by integers, like bytearray and
+    Python 3's memoryview are, instead of one-character strings.
+    """
+
+    def __init__(self, view):
+        self._view = view
+
+    def __len__(self):
+        return len(self._view)
+
+    def __getitem__(self, index):
+        return ord(self._view[index])
+
+    def __setitem__(self, index, value):
+        self._view[index] = chr(value)
+
+
+class BloomFilter(object):
+    """
+    A bloom filter of lowercased words.
+
+    Membership tests never give false negatives. `num_hashes` bit
+    positions are derived from the MD5 digest of the UTF-8 encoded word
+    by double hashing, so the filter reads the same on every platform and
+    Python version.
+    """
+
+    def __init__(self, size_bits, num_hashes, bits=None):
+        if size_bits < 1 or num_hashes < 1:
+            raise ValueError("size_bits and num_hashes must be positive")
+        if bits is None:
+            bits = bytearray((size_bits + 7) // 8)
+        elif len(bits) * 8 < size_bits:
+            raise ValueError("Bit array too short for %d bits" % size_bits)
+        self.size_bits = size_bits
+        self.num_hashes = num_hashes
+        self._bits = bits
+
+    @classmethod
+    def from_words(cls, words, fp_rate=0.01):
+        """
+        Build a filter holding `words`, sized so that a word not in it is
+        taken as foreign with probability `fp_rate`.
+        """
+        if not 0 < fp_rate < 1:
+            raise ValueError("fp_rate must be between 0 and 1")
+        words = set(word.lower() for word in words)
+        count = max(len(words), 1)
+        size_bits = max(64, int(math.ceil(
+            -count * math.log(fp_rate) / math.log(2) ** 2)))
+        num_hashes = max(1, int(round(size_bits / float(count) *
+                                      math.log(2))))
+        bloom = cls(size_bits, num_hashes)
+        for word in words:
+            bloom.add(word)
+        return bloom
+
+    def _positions(self, word):
+        digest = hashlib.md5(word.lower().encode('utf-8')).digest()
+        first, second = _HASH.unpack(digest)
+        second |= 1
+        size = self.size_bits
+        return [(first + i * second) % size for i in range(self.num_hashes)]
+
+    def add(self, word):
+        bits = self._bits
+        for position in self._positions(word):
+            bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, word):
+        bits = self._bits
+        for position in self._positions(word):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    @property
+    def nbytes(self):
+        """Memory taken by the bit array."""
+        return len(self._bits)
+
+    def to_bytes(self):
+        return _HEADER.pack(_MAGIC, self.size_bits, self.num_hashes) + \
+            bytes(bytearray(self._bits))
+
+    @classmethod
+    def from_bytes(cls, data):
+        size_bits, num_hashes = cls._parse_header(data)
+        return cls(size_bits, num_hashes, bytearray(data[_HEADER.size:]))
+
+    @classmethod
+    def from_buffer(cls, buffer):
+        """
+        Like from_bytes() but use the bits in `buffer` (an mmap, a shared
+        memory block...) in place instead of copying them. The filter is
+        read-only if the buffer is.
+        """
+        view = _memoryview(buffer)
+        size_bits, num_hashes = cls._parse_header(view)
+        bits = view[_HEADER.size:]
+        if sys.version_info[0] < 3:
+            bits = _Py2ByteView(bits)
+        return cls(size_bits, num_hashes, bits)
+
+    @staticmethod
+    def _parse_header(data):
+        if len(data) < _HEADER.size:
+            raise ValueError("Not a bogo bloom filter")
+        magic, size_bits, num_hashes = _HEADER.unpack_from(data)
+        if magic != _MAGIC:
+            raise ValueError("Not a bogo bloom filter")
+        return size_bits, num_hashes
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+
+def read_words(path):
+    """Read a word list, one word per line. Blank lines and lines
+    starting with # are ignored."""
+    with codecs.open(path, 'r', 'utf-8') as f:
+        return [line.strip() for line in f
+                if line.strip() and not line.startswith('#')]
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="python -m bogo.wordfilter",
+        description="Build a foreign word bloom filter from a word list.")
+    parser.add_argument('wordlist')
+    parser.add_argument('output')
+    parser.add_argument('--fp-rate', type=float, default=0.001,
+                        help="false positive rate (default: 0.001)")
+    args = parser.parse_args(argv)
+
+    words = read_words(args.wordlist)
+    bloom = BloomFilter.from_words(words, args.fp_rate)
+    bloom.save(args.output)
+    print("%d words, %d bytes (%.2f bits per word), %d hashes" %
+          (len(words), bloom.nbytes, bloom.size_bits / float(len(words) or 1),
+           bloom.num_hashes))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -47,7 +47,9 @@ More help available with:
 Some functions from bogo.core are exported to package toplevel:
 
 - `process_key()`
+- `process_key_delta()`
 - `process_sequence()`
+- `process_into()`
 - `get_telex_definition()`
 - `get_vni_definition()`
 